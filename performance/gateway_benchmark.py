@@ -0,0 +1,296 @@
+"""
+Gateway overhead benchmark with in-process stub upstreams.
+
+Runs the real gateway app (app.main) through httpx's ASGI transport against a
+stub upstream served by httpx.MockTransport, so there is no network, Docker or
+running service involved. For each scenario it reports:
+
+- throughput (requests/second) with CONCURRENCY requests in flight
+- p50/p95/p99 latency of sequential requests, and the latency the gateway adds
+  on top of calling the stub upstream directly
+
+Scenarios cover the pipeline stages cumulatively (proxy only, then
+authentication, RBAC, rate limiting, identity forwarding and gzip compression)
+and each payload size through the full pipeline. Results are written as JSON
+so later runs can be compared:
+
+    python performance/gateway_benchmark.py
+    python performance/gateway_benchmark.py --compare performance/results/baseline.json
+
+--compare exits non-zero when any scenario's p50 added latency or throughput
+regressed by more than --threshold (default 10%).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GATEWAY_DIR = os.path.join(ROOT, "services", "gateway_service")
+RESULTS_DIR = os.path.join(ROOT, "performance", "results")
+
+# Named after an element service, so RBAC guards it with the capability:* permissions
+BENCH_SERVICE = "capability"
+BENCH_BASE_PATH = "/bench"
+BENCH_UPSTREAM = "http://bench-upstream"
+
+# Payload sizes in bytes; roughly one element row up to a 1000-row wide list
+PAYLOAD_SIZES = [1024, 16 * 1024, 128 * 1024, 1024 * 1024]
+DEFAULT_PAYLOAD = 16 * 1024
+
+def build_payload(size: int) -> bytes:
+    """JSON array of element-like rows, padded to roughly size bytes"""
+    row = {"id": "00000000-0000-0000-0000-000000000000", "tenant_id": "bench-tenant",
+           "name": "Capability", "description": "x" * 120, "status": "active"}
+    row_bytes = len(json.dumps(row)) + 2
+    return json.dumps([row] * max(1, size // row_bytes)).encode()
+
+def percentile_summary(latencies_us: List[float]) -> Dict[str, float]:
+    quantiles = statistics.quantiles(latencies_us, n=100)
+    return {
+        "mean_us": round(statistics.fmean(latencies_us), 1),
+        "p50_us": round(quantiles[49], 1),
+        "p95_us": round(quantiles[94], 1),
+        "p99_us": round(quantiles[98], 1),
+    }
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class GatewayBench:
+    """Wires the gateway app to a stub upstream and times requests through it"""
+
+    def __init__(self, requests: int, warmup: int, concurrency: int):
+        self.requests = requests
+        self.warmup = warmup
+        self.concurrency = concurrency
+        self.payloads = {size: build_payload(size) for size in PAYLOAD_SIZES}
+
+    async def stub_upstream(self, request):
+        import httpx
+
+        size = int(request.url.path.rsplit("/", 1)[-1])
+        # Hand back an unread stream, as a real transport does; the gateway relays it raw
+        return httpx.Response(200, stream=httpx.ByteStream(self.payloads[size]), headers={"Content-Type": "application/json"})
+
+    def setup(self):
+        """Register the bench service and point its pooled clients at the stub"""
+        import httpx
+        import jwt
+        from app import middleware as gateway_middleware
+        from app.circuit_breaker import ServiceCircuit
+        from app.client_pool import client_pool
+        from app.load_balancer import LoadBalancer, parse_instances
+        from app.path_router import PrefixRouter
+        from app.rbac import rbac_validator
+        from app.health_monitor import health_monitor
+        from app.service_registry import service_registry, ServiceConfig, ServiceHealth, ServiceStatus
+
+        # Health probes would hit real catalog hosts; the stub is healthy by definition
+        health_monitor.start = lambda: None
+
+        config = ServiceConfig(
+            service_name=BENCH_SERVICE, base_path=BENCH_BASE_PATH, internal_url=BENCH_UPSTREAM,
+            healthcheck_endpoint="/health", timeout_ms=5000, tenant_scope="tenant", cacheable=False,
+            retry_policy={"max_retries": 0}, rbac_required=True, rate_limit={"requests_per_minute": 10 ** 9},
+            instances=parse_instances({"internal_url": BENCH_UPSTREAM})
+        )
+        service_registry.services[BENCH_SERVICE] = config
+        service_registry.health_status[BENCH_SERVICE] = ServiceHealth(status=ServiceStatus.HEALTHY, last_check=datetime.utcnow())
+        service_registry.circuits[BENCH_SERVICE] = ServiceCircuit(BENCH_SERVICE, service_registry.passive_circuit_settings)
+        service_registry.balancers[BENCH_SERVICE] = LoadBalancer(BENCH_SERVICE, config.instances, config.load_balancer)
+        service_registry.router = PrefixRouter(service_registry.services)
+        rbac_validator.compile_decision_table(service_registry.services)
+
+        self.upstream = httpx.AsyncClient(transport=httpx.MockTransport(self.stub_upstream))
+        client_pool._clients[BENCH_SERVICE] = self.upstream
+
+        payload = {"user_id": "bench-user", "tenant_id": "bench-tenant", "role": "Admin", "exp": time.time() + 3600}
+        token = jwt.encode(payload, gateway_middleware.SECRET_KEY, algorithm=gateway_middleware.ALGORITHM)
+        self.auth_headers = {"Authorization": f"Bearer {token}"}
+
+    def pipeline(self, app):
+        """The app's GatewayPipelineMiddleware instance, so stages can be switched per scenario"""
+        from app.middleware import GatewayPipelineMiddleware
+
+        node = app.middleware_stack
+        while node is not None and not isinstance(node, GatewayPipelineMiddleware):
+            node = getattr(node, "app", None)
+        return node
+
+    async def time_sequential(self, send) -> List[float]:
+        latencies = []
+        for i in range(self.warmup + self.requests):
+            start = time.perf_counter()
+            await send()
+            if i >= self.warmup:
+                latencies.append((time.perf_counter() - start) * 1e6)
+        return latencies
+
+    async def time_concurrent(self, send) -> float:
+        """Requests per second with self.concurrency requests in flight"""
+        remaining = self.requests
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                await send()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        return self.requests / (time.perf_counter() - start)
+
+    async def direct_baseline(self, size: int) -> Dict[str, float]:
+        """Latency of calling the stub upstream without the gateway"""
+        async def send():
+            response = await self.upstream.get(f"{BENCH_UPSTREAM}{BENCH_BASE_PATH}/payload/{size}")
+            response.read()
+
+        return percentile_summary(await self.time_sequential(send))
+
+    async def scenario(self, client, size: int, accept_encoding: str, baseline: Dict[str, float]) -> Dict[str, Any]:
+        headers = dict(self.auth_headers)
+        headers["Accept-Encoding"] = accept_encoding
+        path = f"{BENCH_BASE_PATH}/payload/{size}"
+
+        async def send():
+            response = await client.get(path, headers=headers)
+            if response.status_code != 200:
+                raise RuntimeError(f"{path} returned {response.status_code}: {response.text}")
+
+        latency = percentile_summary(await self.time_sequential(send))
+        result = {
+            "payload_bytes": len(self.payloads[size]),
+            "throughput_rps": round(await self.time_concurrent(send), 1),
+            **latency,
+        }
+        for key in ("p50_us", "p95_us", "p99_us"):
+            result[f"added_{key}"] = round(latency[key] - baseline[key], 1)
+        return result
+
+    async def run(self) -> Dict[str, Any]:
+        import httpx
+
+        sys.path.insert(0, GATEWAY_DIR)
+        os.chdir(GATEWAY_DIR)
+        logging.disable(logging.WARNING)
+
+        from app.main import app
+        from app.log_sink import log_sink
+
+        self.setup()
+        log_sink.stream = open(os.devnull, "w")
+
+        results: Dict[str, Any] = {"stages": {}, "payloads": {}}
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway") as client:
+                # First request builds the middleware stack
+                await client.get("/health")
+                pipeline = self.pipeline(app)
+                all_stages = pipeline.stages
+                baselines = {size: await self.direct_baseline(size) for size in PAYLOAD_SIZES}
+                results["upstream_direct"] = {str(size): baselines[size] for size in PAYLOAD_SIZES}
+
+                # Cumulative stages, each measured with the default payload and no compression
+                for count in range(len(all_stages) + 1):
+                    pipeline.stages = all_stages[:count]
+                    name = "proxy_only" if count == 0 else f"+{all_stages[count - 1].__name__}"
+                    results["stages"][name] = await self.scenario(client, DEFAULT_PAYLOAD, "identity", baselines[DEFAULT_PAYLOAD])
+                results["stages"]["+compression"] = await self.scenario(client, DEFAULT_PAYLOAD, "gzip", baselines[DEFAULT_PAYLOAD])
+
+                # Payload sizes through the full pipeline, with and without compression
+                pipeline.stages = all_stages
+                for size in PAYLOAD_SIZES:
+                    results["payloads"][f"{size}_identity"] = await self.scenario(client, size, "identity", baselines[size])
+                    results["payloads"][f"{size}_gzip"] = await self.scenario(client, size, "gzip", baselines[size])
+
+        return results
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any], threshold: float) -> List[str]:
+    """Scenarios whose added p50 latency or throughput got worse than threshold allows"""
+    regressions = []
+    for group in ("stages", "payloads"):
+        for name, result in current["results"][group].items():
+            before = previous["results"].get(group, {}).get(name)
+            if before is None:
+                continue
+            # Added latency can be near zero, so judge it against the total p50 as well
+            latency_growth = (result["added_p50_us"] - before["added_p50_us"]) / max(before["p50_us"], 1.0)
+            throughput_drop = (before["throughput_rps"] - result["throughput_rps"]) / max(before["throughput_rps"], 1.0)
+            if latency_growth > threshold or throughput_drop > threshold:
+                regressions.append(
+                    f"{group}/{name}: added p50 {before['added_p50_us']:.0f} -> {result['added_p50_us']:.0f}us, "
+                    f"throughput {before['throughput_rps']:.0f} -> {result['throughput_rps']:.0f} req/s"
+                )
+    return regressions
+
+def print_table(title: str, results: Dict[str, Dict[str, Any]]):
+    print(f"\n{title}")
+    print(f"{'scenario':<28} {'bytes':>9} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'+p50':>8} {'+p95':>8} {'+p99':>8}  (microseconds)")
+    for name, result in results.items():
+        print(
+            f"{name:<28} {result['payload_bytes']:>9} {result['throughput_rps']:>9.0f} "
+            f"{result['p50_us']:>8.0f} {result['p95_us']:>8.0f} {result['p99_us']:>8.0f} "
+            f"{result['added_p50_us']:>8.0f} {result['added_p95_us']:>8.0f} {result['added_p99_us']:>8.0f}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Gateway overhead benchmark with in-process stub upstreams")
+    parser.add_argument("--requests", type=int, default=2000, help="timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=200, help="untimed requests before each scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight for the throughput run")
+    parser.add_argument("--output", help="results file (default: performance/results/gateway-<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed regression ratio for --compare")
+    args = parser.parse_args()
+    # The bench changes into the gateway directory, so resolve paths first
+    output = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+
+    bench = GatewayBench(args.requests, args.warmup, args.concurrency)
+    results = asyncio.run(bench.run())
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"requests": args.requests, "warmup": args.warmup, "concurrency": args.concurrency},
+        "results": results,
+    }
+
+    print_table("Pipeline stages (cumulative, 16 KiB payload)", results["stages"])
+    print_table("Payload sizes (full pipeline)", results["payloads"])
+
+    output = output or os.path.join(RESULTS_DIR, f"gateway-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            previous = json.load(f)
+        regressions = compare(report, previous, args.threshold)
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {baseline_path}")
+
+if __name__ == "__main__":
+    main()
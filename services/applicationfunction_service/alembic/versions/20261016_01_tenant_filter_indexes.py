@@ -0,0 +1,38 @@
+"""
+Tenant-scoped composite indexes for the list and get_*_by_* filters
+
+Revision ID: 20261016_01_tenant_filter_indexes
+Revises: 
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261016_01_tenant_filter_indexes'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index, table, columns), matching __table_args__ in app/models.py
+INDEXES = [
+    ("ix_application_function_tenant_function_type", "application_function", ["tenant_id", "function_type"]),
+    ("ix_application_function_tenant_status", "application_function", ["tenant_id", "status"]),
+    ("ix_application_function_tenant_business_criticality", "application_function", ["tenant_id", "business_criticality"]),
+    ("ix_application_function_tenant_supported_business_function_id", "application_function", ["tenant_id", "supported_business_function_id"]),
+    ("ix_application_function_tenant_current_availability", "application_function", ["tenant_id", "current_availability"]),
+    ("ix_function_link_linked_element", "function_link", ["linked_element_type", "linked_element_id"]),
+]
+
+def upgrade():
+    # Tables are created by the service at startup and may already hold data, so
+    # build concurrently without blocking writes; CONCURRENTLY cannot run in a
+    # transaction. Databases created after this revision already have the
+    # indexes from the models, hence IF NOT EXISTS.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
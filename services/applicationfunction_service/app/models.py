@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, JSON
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -9,6 +9,14 @@ Base = declarative_base()
 
 class ApplicationFunction(Base):
     __tablename__ = "application_function"
+    __table_args__ = (
+        # Tenant-scoped filters used by the list and get_*_by_* queries
+        Index("ix_application_function_tenant_function_type", "tenant_id", "function_type"),
+        Index("ix_application_function_tenant_status", "tenant_id", "status"),
+        Index("ix_application_function_tenant_business_criticality", "tenant_id", "business_criticality"),
+        Index("ix_application_function_tenant_supported_business_function_id", "tenant_id", "supported_business_function_id"),
+        Index("ix_application_function_tenant_current_availability", "tenant_id", "current_availability"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False)
@@ -78,6 +86,10 @@ class ApplicationFunction(Base):
 
 class FunctionLink(Base):
     __tablename__ = "function_link"
+    __table_args__ = (
+        # Link lookups by element, used by get_*_by_element
+        Index("ix_function_link_linked_element", "linked_element_type", "linked_element_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     application_function_id = Column(UUID(as_uuid=True), ForeignKey("application_function.id"), nullable=False)
@@ -0,0 +1,39 @@
+"""
+Tenant-scoped composite indexes for the list and get_*_by_* filters
+
+Revision ID: 20261016_01_tenant_filter_indexes
+Revises: 
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261016_01_tenant_filter_indexes'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index, table, columns), matching __table_args__ in app/models.py
+INDEXES = [
+    ("ix_artifact_tenant_artifact_type", "artifact", ["tenant_id", "artifact_type"]),
+    ("ix_artifact_tenant_lifecycle_state", "artifact", ["tenant_id", "lifecycle_state"]),
+    ("ix_artifact_tenant_deployment_target_node_id", "artifact", ["tenant_id", "deployment_target_node_id"]),
+    ("ix_artifact_tenant_associated_component_id", "artifact", ["tenant_id", "associated_component_id"]),
+    ("ix_artifact_tenant_last_modified", "artifact", ["tenant_id", "last_modified"]),
+    ("ix_artifact_tenant_data_classification", "artifact", ["tenant_id", "data_classification"]),
+    ("ix_artifact_link_linked_element", "artifact_link", ["linked_element_type", "linked_element_id"]),
+]
+
+def upgrade():
+    # Tables are created by the service at startup and may already hold data, so
+    # build concurrently without blocking writes; CONCURRENTLY cannot run in a
+    # transaction. Databases created after this revision already have the
+    # indexes from the models, hence IF NOT EXISTS.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, JSON
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -9,6 +9,15 @@ Base = declarative_base()
 
 class Artifact(Base):
     __tablename__ = "artifact"
+    __table_args__ = (
+        # Tenant-scoped filters used by the list and get_*_by_* queries
+        Index("ix_artifact_tenant_artifact_type", "tenant_id", "artifact_type"),
+        Index("ix_artifact_tenant_lifecycle_state", "tenant_id", "lifecycle_state"),
+        Index("ix_artifact_tenant_deployment_target_node_id", "tenant_id", "deployment_target_node_id"),
+        Index("ix_artifact_tenant_associated_component_id", "tenant_id", "associated_component_id"),
+        Index("ix_artifact_tenant_last_modified", "tenant_id", "last_modified"),
+        Index("ix_artifact_tenant_data_classification", "tenant_id", "data_classification"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False)
@@ -105,6 +114,10 @@ class Artifact(Base):
 
 class ArtifactLink(Base):
     __tablename__ = "artifact_link"
+    __table_args__ = (
+        # Link lookups by element, used by get_*_by_element
+        Index("ix_artifact_link_linked_element", "linked_element_type", "linked_element_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     artifact_id = Column(UUID(as_uuid=True), ForeignKey("artifact.id"), nullable=False)
@@ -0,0 +1,47 @@
+"""
+Tenant-scoped composite indexes for the list and get_*_by_* filters
+
+Revision ID: 20261016_01_tenant_filter_indexes
+Revises: 
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261016_01_tenant_filter_indexes'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index, table, columns), matching __table_args__ in app/models.py
+INDEXES = [
+    ("ix_business_function_tenant_competency_area", "business_function", ["tenant_id", "competency_area"]),
+    ("ix_business_function_tenant_organizational_unit", "business_function", ["tenant_id", "organizational_unit"]),
+    ("ix_business_function_tenant_criticality", "business_function", ["tenant_id", "criticality"]),
+    ("ix_business_function_tenant_frequency", "business_function", ["tenant_id", "frequency"]),
+    ("ix_business_function_tenant_status", "business_function", ["tenant_id", "status"]),
+    ("ix_business_function_tenant_owner_role_id", "business_function", ["tenant_id", "owner_role_id"]),
+    ("ix_business_function_tenant_business_process_id", "business_function", ["tenant_id", "business_process_id"]),
+    ("ix_business_function_tenant_supporting_capability_id", "business_function", ["tenant_id", "supporting_capability_id"]),
+    ("ix_business_function_tenant_complexity", "business_function", ["tenant_id", "complexity"]),
+    ("ix_business_function_tenant_maturity_level", "business_function", ["tenant_id", "maturity_level"]),
+    ("ix_business_function_tenant_operational_hours", "business_function", ["tenant_id", "operational_hours"]),
+    ("ix_business_function_tenant_strategic_importance", "business_function", ["tenant_id", "strategic_importance"]),
+    ("ix_business_function_tenant_business_value", "business_function", ["tenant_id", "business_value"]),
+    ("ix_business_function_tenant_risk_level", "business_function", ["tenant_id", "risk_level"]),
+    ("ix_function_link_linked_element", "function_link", ["linked_element_type", "linked_element_id"]),
+]
+
+def upgrade():
+    # Tables are created by the service at startup and may already hold data, so
+    # build concurrently without blocking writes; CONCURRENTLY cannot run in a
+    # transaction. Databases created after this revision already have the
+    # indexes from the models, hence IF NOT EXISTS.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
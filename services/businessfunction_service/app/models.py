@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -9,6 +9,23 @@ Base = declarative_base()
 
 class BusinessFunction(Base):
     __tablename__ = "business_function"
+    __table_args__ = (
+        # Tenant-scoped filters used by the list and get_*_by_* queries
+        Index("ix_business_function_tenant_competency_area", "tenant_id", "competency_area"),
+        Index("ix_business_function_tenant_organizational_unit", "tenant_id", "organizational_unit"),
+        Index("ix_business_function_tenant_criticality", "tenant_id", "criticality"),
+        Index("ix_business_function_tenant_frequency", "tenant_id", "frequency"),
+        Index("ix_business_function_tenant_status", "tenant_id", "status"),
+        Index("ix_business_function_tenant_owner_role_id", "tenant_id", "owner_role_id"),
+        Index("ix_business_function_tenant_business_process_id", "tenant_id", "business_process_id"),
+        Index("ix_business_function_tenant_supporting_capability_id", "tenant_id", "supporting_capability_id"),
+        Index("ix_business_function_tenant_complexity", "tenant_id", "complexity"),
+        Index("ix_business_function_tenant_maturity_level", "tenant_id", "maturity_level"),
+        Index("ix_business_function_tenant_operational_hours", "tenant_id", "operational_hours"),
+        Index("ix_business_function_tenant_strategic_importance", "tenant_id", "strategic_importance"),
+        Index("ix_business_function_tenant_business_value", "tenant_id", "business_value"),
+        Index("ix_business_function_tenant_risk_level", "tenant_id", "risk_level"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False)
@@ -79,6 +96,10 @@ class BusinessFunction(Base):
 
 class FunctionLink(Base):
     __tablename__ = "function_link"
+    __table_args__ = (
+        # Link lookups by element, used by get_*_by_element
+        Index("ix_function_link_linked_element", "linked_element_type", "linked_element_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     business_function_id = Column(UUID(as_uuid=True), ForeignKey("business_function.id"), nullable=False)
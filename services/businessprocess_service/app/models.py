@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -9,6 +9,14 @@ Base = declarative_base()
 
 class BusinessProcess(Base):
     __tablename__ = "business_process"
+    __table_args__ = (
+        # Tenant-scoped filters used by the list and get_*_by_* queries
+        Index("ix_business_process_tenant_role_id", "tenant_id", "role_id"),
+        Index("ix_business_process_tenant_business_function_id", "tenant_id", "business_function_id"),
+        Index("ix_business_process_tenant_goal_id", "tenant_id", "goal_id"),
+        Index("ix_business_process_tenant_status", "tenant_id", "status"),
+        Index("ix_business_process_tenant_criticality", "tenant_id", "criticality"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False)
@@ -0,0 +1,50 @@
+"""
+Tenant-scoped composite indexes for the list and get_*_by_* filters
+
+Revision ID: 20261016_01_tenant_filter_indexes
+Revises: 
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261016_01_tenant_filter_indexes'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index, table, columns), matching __table_args__ in app/models.py
+INDEXES = [
+    ("ix_business_role_tenant_organizational_unit", "business_role", ["tenant_id", "organizational_unit"]),
+    ("ix_business_role_tenant_role_type", "business_role", ["tenant_id", "role_type"]),
+    ("ix_business_role_tenant_strategic_importance", "business_role", ["tenant_id", "strategic_importance"]),
+    ("ix_business_role_tenant_authority_level", "business_role", ["tenant_id", "authority_level"]),
+    ("ix_business_role_tenant_status", "business_role", ["tenant_id", "status"]),
+    ("ix_business_role_tenant_stakeholder_id", "business_role", ["tenant_id", "stakeholder_id"]),
+    ("ix_business_role_tenant_supporting_capability_id", "business_role", ["tenant_id", "supporting_capability_id"]),
+    ("ix_business_role_tenant_business_function_id", "business_role", ["tenant_id", "business_function_id"]),
+    ("ix_business_role_tenant_business_process_id", "business_role", ["tenant_id", "business_process_id"]),
+    ("ix_business_role_tenant_criticality", "business_role", ["tenant_id", "criticality"]),
+    ("ix_business_role_tenant_role_classification", "business_role", ["tenant_id", "role_classification"]),
+    ("ix_business_role_tenant_workload_level", "business_role", ["tenant_id", "workload_level"]),
+    ("ix_business_role_tenant_availability_requirement", "business_role", ["tenant_id", "availability_requirement"]),
+    ("ix_business_role_tenant_risk_level", "business_role", ["tenant_id", "risk_level"]),
+    ("ix_business_role_tenant_business_value", "business_role", ["tenant_id", "business_value"]),
+    ("ix_business_role_tenant_decision_making_authority", "business_role", ["tenant_id", "decision_making_authority"]),
+    ("ix_business_role_tenant_approval_authority", "business_role", ["tenant_id", "approval_authority"]),
+    ("ix_role_link_linked_element", "role_link", ["linked_element_type", "linked_element_id"]),
+]
+
+def upgrade():
+    # Tables are created by the service at startup and may already hold data, so
+    # build concurrently without blocking writes; CONCURRENTLY cannot run in a
+    # transaction. Databases created after this revision already have the
+    # indexes from the models, hence IF NOT EXISTS.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -4,8 +4,12 @@ from .models import BusinessRole, RoleLink
 from .services import get_business_role, get_role_link
 from .database import SessionLocal
 from uuid import UUID
+import hashlib
 import jwt
 import os
+import threading
+import time
+from collections import OrderedDict
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -21,59 +25,73 @@ def get_db():
     finally:
         db.close()
 
-def get_current_tenant(request: Request) -> UUID:
-    """Extract tenant_id from JWT token"""
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-    
-    token = auth_header.split(" ", 1)[1]
+# Verified claims shared across requests, so a client's repeated calls skip the
+# signature check until the token expires. Keyed by token digest, so raw bearer
+# tokens are never held in memory. Bounded; least recently used go first.
+JWT_CLAIMS_CACHE_SIZE = int(os.getenv("JWT_CLAIMS_CACHE_SIZE", "1024"))
+_claims_cache: "OrderedDict[bytes, dict]" = OrderedDict()
+_claims_cache_lock = threading.Lock()
+
+def token_digest(token: str) -> bytes:
+    """Fixed-size cache key for a bearer token"""
+    return hashlib.sha256(token.encode()).digest()
+
+def decode_token(token: str) -> dict:
+    """Verify a JWT and return its claims, reusing earlier verifications of the same token"""
+    key = token_digest(token)
+    with _claims_cache_lock:
+        claims = _claims_cache.get(key)
+        if claims is not None:
+            if "exp" in claims and claims["exp"] <= time.time():
+                del _claims_cache[key]
+                raise HTTPException(status_code=401, detail="Token expired")
+            _claims_cache.move_to_end(key)
+            return claims
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        tenant_id = payload.get("tenant_id")
-        if not tenant_id:
-            raise HTTPException(status_code=401, detail="Missing tenant_id in token")
-        return UUID(tenant_id)
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    with _claims_cache_lock:
+        _claims_cache[key] = claims
+        if len(_claims_cache) > JWT_CLAIMS_CACHE_SIZE:
+            _claims_cache.popitem(last=False)
+    return claims
+
+def get_token_claims(request: Request) -> dict:
+    """Claims of the request's bearer token, decoded once per request and kept on request.state"""
+    claims = getattr(request.state, "token_claims", None)
+    if claims is None:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
+        claims = decode_token(auth_header.split(" ", 1)[1])
+        request.state.token_claims = claims
+    return claims
+
+def get_current_tenant(request: Request) -> UUID:
+    """Extract tenant_id from JWT token"""
+    tenant_id = get_token_claims(request).get("tenant_id")
+    if not tenant_id:
+        raise HTTPException(status_code=401, detail="Missing tenant_id in token")
+    return UUID(tenant_id)
+
 def get_current_user(request: Request) -> UUID:
     """Extract user_id from JWT token"""
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-    
-    token = auth_header.split(" ", 1)[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("user_id")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Missing user_id in token")
-        return UUID(user_id)
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
-    except jwt.JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    user_id = get_token_claims(request).get("user_id")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Missing user_id in token")
+    return UUID(user_id)
 
 def get_current_role(request: Request) -> str:
     """Extract role from JWT token"""
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-    
-    token = auth_header.split(" ", 1)[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        role = payload.get("role")
-        if not role:
-            raise HTTPException(status_code=401, detail="Missing role in token")
-        return role
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
-    except jwt.JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    role = get_token_claims(request).get("role")
+    if not role:
+        raise HTTPException(status_code=401, detail="Missing role in token")
+    return role
 
 def rbac_check(permission: str):
     """RBAC permission checker"""
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -9,6 +9,26 @@ Base = declarative_base()
 
 class BusinessRole(Base):
     __tablename__ = "business_role"
+    __table_args__ = (
+        # Tenant-scoped filters used by the list and get_*_by_* queries
+        Index("ix_business_role_tenant_organizational_unit", "tenant_id", "organizational_unit"),
+        Index("ix_business_role_tenant_role_type", "tenant_id", "role_type"),
+        Index("ix_business_role_tenant_strategic_importance", "tenant_id", "strategic_importance"),
+        Index("ix_business_role_tenant_authority_level", "tenant_id", "authority_level"),
+        Index("ix_business_role_tenant_status", "tenant_id", "status"),
+        Index("ix_business_role_tenant_stakeholder_id", "tenant_id", "stakeholder_id"),
+        Index("ix_business_role_tenant_supporting_capability_id", "tenant_id", "supporting_capability_id"),
+        Index("ix_business_role_tenant_business_function_id", "tenant_id", "business_function_id"),
+        Index("ix_business_role_tenant_business_process_id", "tenant_id", "business_process_id"),
+        Index("ix_business_role_tenant_criticality", "tenant_id", "criticality"),
+        Index("ix_business_role_tenant_role_classification", "tenant_id", "role_classification"),
+        Index("ix_business_role_tenant_workload_level", "tenant_id", "workload_level"),
+        Index("ix_business_role_tenant_availability_requirement", "tenant_id", "availability_requirement"),
+        Index("ix_business_role_tenant_risk_level", "tenant_id", "risk_level"),
+        Index("ix_business_role_tenant_business_value", "tenant_id", "business_value"),
+        Index("ix_business_role_tenant_decision_making_authority", "tenant_id", "decision_making_authority"),
+        Index("ix_business_role_tenant_approval_authority", "tenant_id", "approval_authority"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False)
@@ -91,6 +111,10 @@ class BusinessRole(Base):
 
 class RoleLink(Base):
     __tablename__ = "role_link"
+    __table_args__ = (
+        # Link lookups by element, used by get_*_by_element
+        Index("ix_role_link_linked_element", "linked_element_type", "linked_element_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     business_role_id = Column(UUID(as_uuid=True), ForeignKey("business_role.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -9,6 +9,14 @@ Base = declarative_base()
 
 class Constraint(Base):
     __tablename__ = "constraint"
+    __table_args__ = (
+        # Tenant-scoped filters used by the list and get_*_by_* queries
+        Index("ix_constraint_tenant_constraint_type", "tenant_id", "constraint_type"),
+        Index("ix_constraint_tenant_scope", "tenant_id", "scope"),
+        Index("ix_constraint_tenant_severity", "tenant_id", "severity"),
+        Index("ix_constraint_tenant_stakeholder_id", "tenant_id", "stakeholder_id"),
+        Index("ix_constraint_tenant_business_actor_id", "tenant_id", "business_actor_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False)
@@ -55,6 +63,10 @@ class Constraint(Base):
 
 class ConstraintLink(Base):
     __tablename__ = "constraint_link"
+    __table_args__ = (
+        # Link lookups by element, used by get_*_by_element
+        Index("ix_constraint_link_linked_element", "linked_element_type", "linked_element_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     constraint_id = Column(UUID(as_uuid=True), ForeignKey("constraint.id"), nullable=False)
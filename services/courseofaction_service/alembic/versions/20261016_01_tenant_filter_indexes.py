@@ -0,0 +1,38 @@
+"""
+Tenant-scoped composite indexes for the list and get_*_by_* filters
+
+Revision ID: 20261016_01_tenant_filter_indexes
+Revises: 
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261016_01_tenant_filter_indexes'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index, table, columns), matching __table_args__ in app/models.py
+INDEXES = [
+    ("ix_course_of_action_tenant_strategy_type", "course_of_action", ["tenant_id", "strategy_type"]),
+    ("ix_course_of_action_tenant_impacted_capability_id", "course_of_action", ["tenant_id", "impacted_capability_id"]),
+    ("ix_course_of_action_tenant_risk_level", "course_of_action", ["tenant_id", "risk_level"]),
+    ("ix_course_of_action_tenant_time_horizon", "course_of_action", ["tenant_id", "time_horizon"]),
+    ("ix_course_of_action_tenant_implementation_phase", "course_of_action", ["tenant_id", "implementation_phase"]),
+    ("ix_action_link_linked_element", "action_link", ["linked_element_type", "linked_element_id"]),
+]
+
+def upgrade():
+    # Tables are created by the service at startup and may already hold data, so
+    # build concurrently without blocking writes; CONCURRENTLY cannot run in a
+    # transaction. Databases created after this revision already have the
+    # indexes from the models, hence IF NOT EXISTS.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
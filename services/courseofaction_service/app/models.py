@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, JSON
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -9,6 +9,14 @@ Base = declarative_base()
 
 class CourseOfAction(Base):
     __tablename__ = "course_of_action"
+    __table_args__ = (
+        # Tenant-scoped filters used by the list and get_*_by_* queries
+        Index("ix_course_of_action_tenant_strategy_type", "tenant_id", "strategy_type"),
+        Index("ix_course_of_action_tenant_impacted_capability_id", "tenant_id", "impacted_capability_id"),
+        Index("ix_course_of_action_tenant_risk_level", "tenant_id", "risk_level"),
+        Index("ix_course_of_action_tenant_time_horizon", "tenant_id", "time_horizon"),
+        Index("ix_course_of_action_tenant_implementation_phase", "tenant_id", "implementation_phase"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False)
@@ -97,6 +105,10 @@ class CourseOfAction(Base):
 
 class ActionLink(Base):
     __tablename__ = "action_link"
+    __table_args__ = (
+        # Link lookups by element, used by get_*_by_element
+        Index("ix_action_link_linked_element", "linked_element_type", "linked_element_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     course_of_action_id = Column(UUID(as_uuid=True), ForeignKey("course_of_action.id"), nullable=False)
@@ -0,0 +1,38 @@
+"""
+Tenant-scoped composite indexes for the list and get_*_by_* filters
+
+Revision ID: 20261016_01_tenant_filter_indexes
+Revises: 
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261016_01_tenant_filter_indexes'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index, table, columns), matching __table_args__ in app/models.py
+INDEXES = [
+    ("ix_device_tenant_serial_number", "device", ["tenant_id", "serial_number"]),
+    ("ix_device_tenant_asset_tag", "device", ["tenant_id", "asset_tag"]),
+    ("ix_device_tenant_device_type", "device", ["tenant_id", "device_type"]),
+    ("ix_device_tenant_status", "device", ["tenant_id", "status"]),
+    ("ix_device_tenant_security_level", "device", ["tenant_id", "security_level"]),
+    ("ix_device_tenant_compliance_status", "device", ["tenant_id", "compliance_status"]),
+]
+
+def upgrade():
+    # Tables are created by the service at startup and may already hold data, so
+    # build concurrently without blocking writes; CONCURRENTLY cannot run in a
+    # transaction. Databases created after this revision already have the
+    # indexes from the models, hence IF NOT EXISTS.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
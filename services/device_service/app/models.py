@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, JSON
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -9,6 +9,15 @@ Base = declarative_base()
 
 class Device(Base):
     __tablename__ = "device"
+    __table_args__ = (
+        # Tenant-scoped filters used by the list and get_*_by_* queries
+        Index("ix_device_tenant_serial_number", "tenant_id", "serial_number"),
+        Index("ix_device_tenant_asset_tag", "tenant_id", "asset_tag"),
+        Index("ix_device_tenant_device_type", "tenant_id", "device_type"),
+        Index("ix_device_tenant_status", "tenant_id", "status"),
+        Index("ix_device_tenant_security_level", "tenant_id", "security_level"),
+        Index("ix_device_tenant_compliance_status", "tenant_id", "compliance_status"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -9,6 +9,13 @@ Base = declarative_base()
 
 class Driver(Base):
     __tablename__ = "driver"
+    __table_args__ = (
+        # Tenant-scoped filters used by the list and get_*_by_* queries
+        Index("ix_driver_tenant_urgency", "tenant_id", "urgency"),
+        Index("ix_driver_tenant_category", "tenant_id", "category"),
+        Index("ix_driver_tenant_stakeholder_id", "tenant_id", "stakeholder_id"),
+        Index("ix_driver_tenant_business_actor_id", "tenant_id", "business_actor_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False)
@@ -45,6 +52,10 @@ class Driver(Base):
 
 class DriverLink(Base):
     __tablename__ = "driver_link"
+    __table_args__ = (
+        # Link lookups by element, used by get_*_by_element
+        Index("ix_driver_link_linked_element", "linked_element_type", "linked_element_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     driver_id = Column(UUID(as_uuid=True), ForeignKey("driver.id"), nullable=False)
@@ -0,0 +1,208 @@
+import asyncio
+import base64
+import json
+import logging
+import os
+from typing import Dict, Any, List, Optional, Union, Awaitable, Callable, Tuple
+from urllib.parse import urlencode
+
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel, Field
+
+from app.observability import observability_manager
+from app.rate_limiter import rate_limiter
+from app.rbac import rbac_validator
+from app.service_registry import service_registry
+
+logger = logging.getLogger(__name__)
+
+BATCH_PATH = "/batch"
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "50"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "10"))
+
+# Parent headers that describe the batch envelope rather than each sub-request
+ENVELOPE_HEADERS = {"content-length", "content-type", "transfer-encoding", "host", "content-encoding", "accept-encoding"}
+
+class SubRequest(BaseModel):
+    id: Optional[str] = None
+    method: str = "GET"
+    path: str
+    query: Dict[str, str] = Field(default_factory=dict)
+    headers: Dict[str, str] = Field(default_factory=dict)
+    body: Optional[Union[Dict[str, Any], List[Any], str]] = None
+
+class BatchRequest(BaseModel):
+    requests: List[SubRequest]
+
+def build_sub_request(parent: Request, sub: SubRequest) -> Request:
+    """
+    Build a Starlette request for one sub-request.
+
+    The caller identity established by the pipeline is copied from the parent,
+    so sub-requests are never authenticated again.
+    """
+    headers = {
+        name: value for name, value in parent.headers.items()
+        if name not in ENVELOPE_HEADERS
+    }
+    headers.update({name.lower(): value for name, value in sub.headers.items()})
+
+    if isinstance(sub.body, (dict, list)):
+        body = json.dumps(sub.body).encode()
+        headers.setdefault("content-type", "application/json")
+    else:
+        body = (sub.body or "").encode()
+    if body:
+        headers["content-length"] = str(len(body))
+
+    parent_state = parent.state
+    state = {
+        "user_id": getattr(parent_state, "user_id", None),
+        "tenant_id": getattr(parent_state, "tenant_id", None),
+        "role": getattr(parent_state, "role", None),
+        "jwt_payload": getattr(parent_state, "jwt_payload", None),
+    }
+
+    path = "/" + sub.path.lstrip("/")
+    query = urlencode(sub.query)
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": sub.method.upper(),
+        "scheme": parent.url.scheme,
+        "server": parent.scope.get("server"),
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(name.encode(), value.encode()) for name, value in headers.items()],
+        "state": state,
+    }
+
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request(scope, receive)
+
+def encode_body(response: Response) -> Dict[str, Any]:
+    """Embed a response body as JSON, text, or base64 for binary content"""
+    body = response.body or b""
+    if not body:
+        return {"body": None}
+
+    content_type = response.headers.get("content-type", "")
+    if "json" in content_type:
+        try:
+            return {"body": json.loads(body)}
+        except ValueError:
+            pass
+    try:
+        return {"body": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_base64": base64.b64encode(body).decode()}
+
+class BatchExecutor:
+    """
+    Run the sub-requests of one /batch call concurrently.
+
+    Authentication happened once for the batch. RBAC is decided once per
+    (service, method) pair in the batch, and every sub-request goes through the
+    same rate limiting and proxy path as a direct request.
+    """
+
+    def __init__(self, max_concurrency: int = BATCH_MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+
+    async def admit(
+        self,
+        request: Request,
+        user_id: str,
+        authorize: Callable[[str, Any, str], bool]
+    ) -> Tuple[str, Any]:
+        """Route a sub-request and apply RBAC and rate limiting, raising its error response if refused"""
+        path = request.url.path
+        if path == BATCH_PATH:
+            raise HTTPException(status_code=400, detail="Batch requests cannot be nested")
+
+        service_info = service_registry.get_service_by_path(path)
+        request.state.service_info = service_info
+        if not service_info:
+            raise HTTPException(status_code=404, detail=f"No service found for path: {path}")
+
+        service_key, config = service_info
+        if not authorize(service_key, config, request.method):
+            raise HTTPException(
+                status_code=403,
+                detail=f"Insufficient permissions for {request.method} on {service_key}"
+            )
+
+        decision = await rate_limiter.check(service_key, user_id, config.rate_limit)
+        if not decision.allowed:
+            raise HTTPException(status_code=429, detail="Rate limit exceeded")
+        return service_key, config
+
+    async def run(
+        self,
+        parent: Request,
+        batch: BatchRequest,
+        forward: Callable[[Request, str, Any, Any], Awaitable[Response]]
+    ) -> List[Dict[str, Any]]:
+        state = parent.state
+        role = getattr(state, "role", "Viewer")
+        decisions: Dict[tuple, bool] = {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        parent_context = state.observability_context
+
+        def authorize(service_key: str, config: Any, method: str) -> bool:
+            if not config.rbac_required:
+                return True
+            decision_key = (service_key, method)
+            if decision_key not in decisions:
+                allowed = rbac_validator.is_allowed(role, service_key, method)
+                decisions[decision_key] = allowed
+                if rbac_validator.should_log_decision(allowed):
+                    observability_manager.log_rbac_decision(parent_context, service_key, method, allowed, role)
+            return decisions[decision_key]
+
+        async def run_one(index: int, sub: SubRequest) -> Dict[str, Any]:
+            result: Dict[str, Any] = {"id": sub.id if sub.id is not None else str(index)}
+            try:
+                request = build_sub_request(parent, sub)
+                service_key, config = await self.admit(request, state.user_id, authorize)
+
+                # Sub-requests share the batch's correlation id
+                context = observability_manager.create_request_context(
+                    method=request.method, path=request.url.path, user_id=state.user_id,
+                    tenant_id=state.tenant_id, service_target=service_key
+                )
+                context.correlation_id = parent_context.correlation_id
+                request.state.observability_context = context
+
+                async with semaphore:
+                    response = await forward(request, service_key, config, context)
+
+                result["status"] = response.status_code
+                result["headers"] = {
+                    name: value for name, value in response.headers.items()
+                    if name.lower() not in ("content-length", "transfer-encoding", "connection")
+                }
+                result.update(encode_body(response))
+            except HTTPException as e:
+                result["status"] = e.status_code
+                result["body"] = {"detail": e.detail}
+            except Exception as e:
+                logger.error(f"Batch sub-request {result['id']} failed: {e}")
+                result["status"] = 500
+                result["body"] = {"detail": "Internal gateway error"}
+            return result
+
+        return await asyncio.gather(*(run_one(index, sub) for index, sub in enumerate(batch.requests)))
+
+# Global batch executor instance
+batch_executor = BatchExecutor()
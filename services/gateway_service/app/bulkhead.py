@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, Any
+
+from fastapi import HTTPException
+
+from app.metrics import gateway_metrics
+
+logger = logging.getLogger(__name__)
+
+# Defaults, overridable in gateway_config.bulkhead and per service in the catalog
+DEFAULT_BULKHEAD_SETTINGS = {
+    "max_concurrent": 100,
+    "max_queue": 100,
+    "queue_timeout_ms": 1000,
+    "retry_after_seconds": 1,
+}
+
+class Bulkhead:
+    """
+    Concurrency limit with a bounded FIFO wait queue for one upstream service.
+
+    Up to max_concurrent requests run at once; up to max_queue more wait for a
+    slot for at most queue_timeout_ms. Anything beyond that is shed straight
+    away with 503 and Retry-After, so a slow service can only tie up its own
+    share of the gateway.
+    """
+
+    def __init__(self, service_key: str, settings: Dict[str, Any]):
+        self.service_key = service_key
+        self.settings = {**DEFAULT_BULKHEAD_SETTINGS, **(settings or {})}
+        self.max_concurrent = self.settings["max_concurrent"]
+        self.max_queue = self.settings["max_queue"]
+        self.queue_timeout = self.settings["queue_timeout_ms"] / 1000.0
+        self.active = 0
+        self._waiters: deque = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.shed_queue_full = 0
+        self.shed_queue_timeout = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _shed(self, reason: str) -> HTTPException:
+        if reason == "queue_full":
+            self.shed_queue_full += 1
+        else:
+            self.shed_queue_timeout += 1
+        gateway_metrics.bulkhead_shed(self.service_key, reason)
+        return HTTPException(
+            status_code=503,
+            detail=f"Service {self.service_key} is at capacity",
+            headers={"Retry-After": str(self.settings["retry_after_seconds"])}
+        )
+
+    async def acquire(self):
+        """Take a slot, waiting in the queue if needed; raises 503 when shed"""
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            gateway_metrics.bulkhead_state(self.service_key, self.active, self.queue_depth)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            raise self._shed("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        gateway_metrics.bulkhead_state(self.service_key, self.active, self.queue_depth)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait expired: keep it
+                self.admitted += 1
+                return
+            self._remove_waiter(waiter)
+            raise self._shed("queue_timeout")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._remove_waiter(waiter)
+            raise
+        self.admitted += 1
+
+    def _remove_waiter(self, waiter: asyncio.Future):
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        gateway_metrics.bulkhead_state(self.service_key, self.active, self.queue_depth)
+
+    def release(self):
+        """Free a slot, handing it straight to the longest-waiting request"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot passes over without active dropping, so no newcomer can jump the queue
+                waiter.set_result(None)
+                gateway_metrics.bulkhead_state(self.service_key, self.active, self.queue_depth)
+                return
+        self.active = max(0, self.active - 1)
+        gateway_metrics.bulkhead_state(self.service_key, self.active, self.queue_depth)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "admitted_total": self.admitted,
+            "queued_total": self.queued,
+            "shed_queue_full_total": self.shed_queue_full,
+            "shed_queue_timeout_total": self.shed_queue_timeout
+        }
+
+class Bulkheads:
+    """Per-service bulkheads, created lazily from each service's bulkhead settings"""
+
+    def __init__(self):
+        self._bulkheads: Dict[str, Bulkhead] = {}
+
+    def get(self, service_key: str, settings: Dict[str, Any]) -> Bulkhead:
+        bulkhead = self._bulkheads.get(service_key)
+        if bulkhead is None:
+            bulkhead = Bulkhead(service_key, settings)
+            self._bulkheads[service_key] = bulkhead
+        return bulkhead
+
+    def reset(self):
+        self._bulkheads.clear()
+
+    def prune(self, services: Dict[str, Any]):
+        """Drop bulkheads of removed or retuned services after a catalog reload"""
+        for service_key, bulkhead in list(self._bulkheads.items()):
+            config = services.get(service_key)
+            if config is None or {**DEFAULT_BULKHEAD_SETTINGS, **config.bulkhead} != bulkhead.settings:
+                # Requests holding the old bulkhead release into it; new ones get a fresh one
+                del self._bulkheads[service_key]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get bulkhead occupancy and shed counters per service for monitoring"""
+        return {service_key: bulkhead.get_metrics() for service_key, bulkhead in self._bulkheads.items()}
+
+# Global bulkhead registry
+bulkheads = Bulkheads()
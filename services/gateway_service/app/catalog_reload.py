@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import os
+from typing import Dict, List
+
+from app.bulkhead import bulkheads
+from app.client_pool import client_pool
+from app.hedging import request_hedger
+from app.rbac import rbac_validator
+from app.retry_policy import retry_budgets
+from app.service_registry import service_registry
+
+logger = logging.getLogger(__name__)
+
+# How often the catalog file is checked for changes; 0 turns the watcher off
+CATALOG_WATCH_INTERVAL_SECONDS = float(os.getenv("CATALOG_WATCH_INTERVAL_SECONDS", "5"))
+
+class CatalogReloader:
+    """
+    Reload service_catalog.json into a running gateway.
+
+    The file is read and new endpoints are probed in the background. The
+    registry, router, client pools, RBAC table and per-service limiters are then
+    switched over in one step with no await in between, so a request is routed
+    by either the old catalog or the new one.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self.reloads = 0
+        self.failures = 0
+
+    async def reload(self) -> Dict[str, List[str]]:
+        """Reload the catalog now; raises if the file cannot be read or parsed"""
+        async with self._lock:
+            try:
+                snapshot = await service_registry.prepare_catalog()
+            except Exception:
+                self.failures += 1
+                raise
+
+            summary = service_registry.apply_catalog(snapshot)
+            client_pool.reconfigure(snapshot.services)
+            rbac_validator.compile_decision_table(snapshot.services)
+            bulkheads.prune(snapshot.services)
+            retry_budgets.prune(snapshot.services)
+            request_hedger.prune(snapshot.services)
+
+            self.reloads += 1
+            logger.info(
+                f"Reloaded service catalog: added={summary['added']} removed={summary['removed']} "
+                f"changed={summary['changed']}"
+            )
+            return summary
+
+    async def watch(self, interval_seconds: float = CATALOG_WATCH_INTERVAL_SECONDS):
+        """Poll the catalog file and reload it whenever it changes"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            if not service_registry.catalog_changed_on_disk():
+                continue
+            try:
+                await self.reload()
+            except Exception as e:
+                # Keep serving the last good catalog; the next edit triggers another attempt
+                logger.error(f"Service catalog reload failed: {e}")
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {
+            "gateway_catalog_reloads_total": self.reloads,
+            "gateway_catalog_reload_failures_total": self.failures
+        }
+
+# Global catalog reloader instance
+catalog_reloader = CatalogReloader()
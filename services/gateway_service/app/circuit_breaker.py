@@ -0,0 +1,165 @@
+import logging
+import math
+import time
+from collections import deque
+from enum import Enum
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+# Defaults, overridable through gateway_config.passive_circuit_breaker in the catalog
+DEFAULT_CIRCUIT_SETTINGS = {
+    "window_seconds": 30,
+    "max_samples": 1000,
+    "min_requests": 20,
+    "error_rate_threshold": 0.5,
+    "open_seconds": 30,
+    "max_open_seconds": 300,
+    "half_open_successes": 3,
+    "probe_interval_seconds": 1.0,
+}
+
+# Latency percentiles are recomputed at most this often
+PERCENTILE_REFRESH_SECONDS = 1.0
+
+class ServiceCircuit:
+    """
+    Circuit breaker fed by real proxied outcomes for one service.
+
+    Keeps a rolling window of (timestamp, success, latency) samples. The circuit
+    opens when the error rate over the window crosses the threshold, lets one
+    probe through per probe interval while half-open, and closes after enough
+    consecutive probe successes. Each failed probe doubles the open period, up
+    to max_open_seconds.
+    """
+
+    def __init__(self, service_key: str, settings: Optional[Dict[str, Any]] = None):
+        self.service_key = service_key
+        self.settings = dict(DEFAULT_CIRCUIT_SETTINGS)
+        self.settings.update(settings or {})
+
+        self.state = CircuitState.CLOSED
+        self._samples: deque = deque()
+        self._failures = 0
+        self.opened_at = 0.0
+        self.open_seconds = float(self.settings["open_seconds"])
+        self.half_open_successes = 0
+        self._last_probe_at = 0.0
+        self.open_count = 0
+        # Last successful proxied call, lets active health probes be skipped
+        self.last_success_at = 0.0
+        self._percentile_cache: Optional[Dict[str, float]] = None
+        self._percentile_computed_at = 0.0
+
+    def _prune(self, now: float):
+        """Drop samples that fell out of the rolling window"""
+        horizon = now - self.settings["window_seconds"]
+        samples = self._samples
+        while samples and (samples[0][0] < horizon or len(samples) > self.settings["max_samples"]):
+            _, success, _ = samples.popleft()
+            if not success:
+                self._failures -= 1
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent to the service right now"""
+        if self.state == CircuitState.CLOSED:
+            return True
+
+        now = time.time()
+        if self.state == CircuitState.OPEN:
+            if now - self.opened_at < self.open_seconds:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self.half_open_successes = 0
+            self._last_probe_at = 0.0
+            logger.info(f"Circuit for {self.service_key} half-open, probing")
+
+        # Half-open: admit a single probe per interval
+        if now - self._last_probe_at >= self.settings["probe_interval_seconds"]:
+            self._last_probe_at = now
+            return True
+        return False
+
+    def record(self, success: bool, latency_ms: float):
+        """Record the outcome of a proxied call"""
+        now = time.time()
+        self._samples.append((now, success, latency_ms))
+        if success:
+            self.last_success_at = now
+        else:
+            self._failures += 1
+        self._prune(now)
+
+        if self.state == CircuitState.HALF_OPEN:
+            if success:
+                self.half_open_successes += 1
+                if self.half_open_successes >= self.settings["half_open_successes"]:
+                    self._close()
+            else:
+                # Failed probe: back off longer before the next one
+                self._open(now, min(self.open_seconds * 2, self.settings["max_open_seconds"]))
+            return
+
+        if self.state == CircuitState.CLOSED and len(self._samples) >= self.settings["min_requests"]:
+            if self.error_rate() >= self.settings["error_rate_threshold"]:
+                self._open(now, float(self.settings["open_seconds"]))
+
+    def _open(self, now: float, open_seconds: float):
+        self.state = CircuitState.OPEN
+        self.opened_at = now
+        self.open_seconds = open_seconds
+        self.open_count += 1
+        logger.warning(
+            f"Circuit for {self.service_key} opened for {open_seconds:.0f}s "
+            f"(error rate {self.error_rate():.2f} over {len(self._samples)} requests)"
+        )
+
+    def _close(self):
+        self.state = CircuitState.CLOSED
+        self.open_seconds = float(self.settings["open_seconds"])
+        self._samples.clear()
+        self._failures = 0
+        self._percentile_cache = None
+        logger.info(f"Circuit for {self.service_key} closed")
+
+    def error_rate(self) -> float:
+        """Share of failed calls in the rolling window"""
+        if not self._samples:
+            return 0.0
+        return self._failures / len(self._samples)
+
+    @property
+    def sample_count(self) -> int:
+        return len(self._samples)
+
+    def latency_percentiles(self) -> Dict[str, float]:
+        """p50/p95/p99 latency over the rolling window, refreshed at most once a second"""
+        now = time.time()
+        if self._percentile_cache is None or now - self._percentile_computed_at >= PERCENTILE_REFRESH_SECONDS:
+            self._percentile_computed_at = now
+            latencies = sorted(sample[2] for sample in self._samples)
+            if not latencies:
+                self._percentile_cache = {}
+            else:
+                def pick(q: float) -> float:
+                    return latencies[min(len(latencies) - 1, max(0, math.ceil(q * len(latencies)) - 1))]
+                self._percentile_cache = {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+        return self._percentile_cache
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current circuit state for health endpoints"""
+        self._prune(time.time())
+        snapshot = {
+            "state": self.state.value,
+            "window_requests": len(self._samples),
+            "error_rate": round(self.error_rate(), 4),
+            "open_count": self.open_count,
+            "open_seconds": self.open_seconds if self.state != CircuitState.CLOSED else 0
+        }
+        snapshot.update({name: round(value, 2) for name, value in self.latency_percentiles().items()})
+        return snapshot
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+from typing import Dict, Any, Tuple
+
+import httpx
+
+from app.service_registry import ServiceConfig
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 support needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Defaults applied when a catalog entry has no "connection_pool" section
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+class UpstreamClientPool:
+    """Long-lived httpx clients, one per upstream service, reused across proxied requests"""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._limits: Dict[str, httpx.Limits] = {}
+        self._http2: Dict[str, bool] = {}
+        # Settings each client was built with, to spot retuned services on reload
+        self._settings: Dict[str, Tuple[Any, int]] = {}
+        self._retiring: Dict[asyncio.Task, httpx.AsyncClient] = {}
+
+    def _build_client(self, service_key: str, config: ServiceConfig) -> httpx.AsyncClient:
+        """Create a pooled client using the service's connection_pool settings"""
+        pool_config = config.connection_pool or {}
+        limits = httpx.Limits(
+            max_connections=pool_config.get("max_connections", DEFAULT_MAX_CONNECTIONS),
+            max_keepalive_connections=pool_config.get("max_keepalive_connections", DEFAULT_MAX_KEEPALIVE_CONNECTIONS),
+            keepalive_expiry=pool_config.get("keepalive_expiry_seconds", DEFAULT_KEEPALIVE_EXPIRY_SECONDS)
+        )
+
+        http2 = bool(pool_config.get("http2", False))
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning(f"HTTP/2 requested for {service_key} but h2 is not installed, falling back to HTTP/1.1")
+            http2 = False
+
+        self._limits[service_key] = limits
+        self._http2[service_key] = http2
+        self._settings[service_key] = (pool_config, config.timeout_ms)
+
+        return httpx.AsyncClient(
+            limits=limits,
+            http2=http2,
+            timeout=config.timeout_ms / 1000.0
+        )
+
+    def start(self, services: Dict[str, ServiceConfig]):
+        """Create a client for every service in the registry"""
+        for service_key, config in services.items():
+            if service_key not in self._clients:
+                self._clients[service_key] = self._build_client(service_key, config)
+
+        logger.info(f"Started upstream client pools for {len(self._clients)} services")
+
+    def reconfigure(self, services: Dict[str, ServiceConfig]):
+        """
+        Apply a reloaded catalog.
+        
+        Services that were added get clients; removed or retuned services have
+        their clients replaced. Replaced clients are closed only after their
+        longest request timeout, so requests already using them can finish.
+        """
+        for client_key in list(self._clients):
+            # Hedge clients are keyed "<service_key>:hedge"
+            config = services.get(client_key.split(":", 1)[0])
+            if config is None or self._settings.get(client_key) != (config.connection_pool or {}, config.timeout_ms):
+                self._retire(client_key)
+        self.start(services)
+
+    def _retire(self, client_key: str):
+        client = self._clients.pop(client_key)
+        self._limits.pop(client_key, None)
+        self._http2.pop(client_key, None)
+        _, timeout_ms = self._settings.pop(client_key, (None, 0))
+
+        async def close_when_idle():
+            try:
+                await asyncio.sleep(timeout_ms / 1000.0 + 1.0)
+            finally:
+                await client.aclose()
+
+        task = asyncio.create_task(close_when_idle())
+        self._retiring[task] = client
+        task.add_done_callback(lambda done: self._retiring.pop(done, None))
+        logger.info(f"Retiring upstream client pool for {client_key}")
+
+    def get_client(self, service_key: str, config: ServiceConfig) -> httpx.AsyncClient:
+        """Get the pooled client for a service, creating it lazily if needed"""
+        client = self._clients.get(service_key)
+        if client is None or client.is_closed:
+            client = self._build_client(service_key, config)
+            self._clients[service_key] = client
+        return client
+
+    def get_hedge_client(self, service_key: str, config: ServiceConfig) -> httpx.AsyncClient:
+        """
+        Get a second pooled client for hedged requests.
+
+        Hedges use their own connections so a backup request is never queued
+        behind, or multiplexed onto, the connection the slow primary is using.
+        """
+        return self.get_client(f"{service_key}:hedge", config)
+
+    async def close(self):
+        """Close all pooled clients and their keep-alive connections"""
+        for service_key, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Failed to close client pool for {service_key}: {e}")
+
+        self._clients.clear()
+        self._settings.clear()
+        # Close retired clients now rather than waiting out their grace period
+        retiring = dict(self._retiring)
+        for task in retiring:
+            task.cancel()
+        await asyncio.gather(*retiring, return_exceptions=True)
+        for client in retiring.values():
+            await client.aclose()
+        logger.info("Closed upstream client pools")
+
+    def _pool_occupancy(self, client: httpx.AsyncClient) -> Dict[str, int]:
+        """Read connection counts from the client's underlying connection pool"""
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for connection in connections if connection.is_idle())
+
+        return {
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get pool occupancy metrics for every upstream"""
+        pools = {}
+        for service_key, client in self._clients.items():
+            limits = self._limits.get(service_key)
+            pool_metrics: Dict[str, Any] = {
+                "max_connections": limits.max_connections if limits else None,
+                "max_keepalive_connections": limits.max_keepalive_connections if limits else None,
+                "http2": self._http2.get(service_key, False),
+                "closed": client.is_closed
+            }
+            pool_metrics.update(self._pool_occupancy(client))
+            pools[service_key] = pool_metrics
+
+        return {
+            "gateway_upstream_pools_total": len(pools),
+            "gateway_upstream_open_connections": sum(p["open_connections"] for p in pools.values()),
+            "gateway_upstream_active_connections": sum(p["active_connections"] for p in pools.values()),
+            "pools": pools
+        }
+
+# Global upstream client pool instance
+client_pool = UpstreamClientPool()
@@ -0,0 +1,199 @@
+import asyncio
+import gzip
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Receive, Scope, Send, Message
+
+# Optional codecs (installed via requirements.txt); gzip is always available
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are sent as-is; compression would barely pay for its headers
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+# Bodies at least this large are compressed on the worker pool instead of the event loop
+COMPRESSION_THREAD_BYTES = int(os.getenv("COMPRESSION_THREAD_BYTES", "65536"))
+COMPRESSION_WORKERS = int(os.getenv("COMPRESSION_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Levels tuned for per-request compression speed rather than maximum ratio
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/xml", "application/javascript", "+json", "+xml")
+
+def available_encodings() -> List[str]:
+    """Supported encodings in server preference order"""
+    encodings = []
+    if ZSTD_AVAILABLE:
+        encodings.append("zstd")
+    if BROTLI_AVAILABLE:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+def negotiate_encoding(accept_encoding: str, supported: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header.
+
+    The client's q-values decide first; ties go to the server's preference
+    (zstd, then br, then gzip). "*" covers codings the client did not list,
+    and q=0 rules a coding out.
+    """
+    supported = supported if supported is not None else available_encodings()
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in supported:
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """Compress a body with one of the supported encodings"""
+    if encoding == "zstd":
+        # Compressor objects are not thread-safe, so each call gets its own
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+class ResponseCompressor:
+    """Compresses bodies inline when small and on a worker pool when large"""
+
+    def __init__(self, thread_threshold: int = COMPRESSION_THREAD_BYTES, max_workers: int = COMPRESSION_WORKERS):
+        self.thread_threshold = thread_threshold
+        # All three codecs release the GIL, so workers compress in parallel
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="compression")
+        self.compressed = 0
+        self.offloaded = 0
+        self.passed_through = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    async def compress(self, body: bytes, encoding: str) -> bytes:
+        if len(body) >= self.thread_threshold:
+            self.offloaded += 1
+            loop = asyncio.get_running_loop()
+            compressed = await loop.run_in_executor(self._executor, compress_body, body, encoding)
+        else:
+            compressed = compress_body(body, encoding)
+        self.compressed += 1
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        return compressed
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get compression counters for monitoring"""
+        return {
+            "gateway_responses_compressed_total": self.compressed,
+            "gateway_compression_offloaded_total": self.offloaded,
+            "gateway_compression_passthrough_total": self.passed_through,
+            "gateway_compression_bytes_in_total": self.bytes_in,
+            "gateway_compression_bytes_out_total": self.bytes_out,
+            "encodings": available_encodings()
+        }
+
+# Global response compressor instance
+response_compressor = ResponseCompressor()
+
+class CompressionMiddleware:
+    """
+    Pure-ASGI response compression with Accept-Encoding negotiation.
+
+    Only complete (single-message) bodies are compressed. Streamed responses,
+    and responses the upstream already encoded, are passed through untouched.
+    Services opt out with "compression": false in the catalog.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES, compressor: Optional[ResponseCompressor] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compressor = compressor or response_compressor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Hold the headers until the first body chunk shows whether to compress
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            if message.get("more_body", False) or not self._should_compress(scope, start, body):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await self.compressor.compress(body, encoding)
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_compress(self, scope: Scope, start: Message, body: bytes) -> bool:
+        headers = Headers(raw=start["headers"])
+        if "content-encoding" in headers:
+            # Already encoded upstream: relay as-is
+            self.compressor.passed_through += 1
+            return False
+        if len(body) < self.minimum_size or start["status"] in (204, 304):
+            return False
+        if "no-transform" in headers.get("cache-control", "").lower():
+            return False
+        content_type = headers.get("content-type", "").lower()
+        if not any(compressible in content_type for compressible in COMPRESSIBLE_TYPES):
+            return False
+
+        service_info = (scope.get("state") or {}).get("service_info")
+        if service_info:
+            _, config = service_info
+            return getattr(config, "compression", True)
+        return True
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, Any, List, Optional
+
+import httpx
+
+from app.circuit_breaker import CircuitState
+from app.metrics import gateway_metrics
+from app.service_registry import ServiceRegistry, ServiceStatus, HEALTH_CHECK_TIMEOUT_SECONDS, service_registry
+
+logger = logging.getLogger(__name__)
+
+# Defaults, overridable through gateway_config.health_probing in the catalog.
+# Healthy services start at gateway_config.health_check_interval_seconds.
+DEFAULT_HEALTH_PROBE_SETTINGS = {
+    "failing_interval_seconds": 10,
+    "max_interval_seconds": 300,
+    "jitter": 0.2,
+    "initial_spread_seconds": 2.0,
+}
+
+# Longest the scheduler sleeps, so services added by a catalog reload are picked up promptly
+MAX_TICK_SECONDS = 1.0
+
+class HealthMonitor:
+    """
+    Schedule active health probes per service.
+
+    Each service has its own jittered probe time, so probes do not all fire
+    together. Healthy services back off from the base interval up to
+    max_interval_seconds; unhealthy, unknown and circuit-open services are
+    probed every failing_interval_seconds. A probe is skipped while successful
+    proxied calls since the last one already show the service is healthy.
+    """
+
+    def __init__(self, registry: ServiceRegistry):
+        self.registry = registry
+        self._next_probe_at: Dict[str, float] = {}
+        self._last_probe_at: Dict[str, float] = {}
+        self._healthy_streak: Dict[str, int] = {}
+        self._probing: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.probes = 0
+        self.skipped = 0
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        return {
+            **DEFAULT_HEALTH_PROBE_SETTINGS,
+            "healthy_interval_seconds": self.registry.health_check_interval,
+            **self.registry.health_probe_settings
+        }
+
+    def start(self):
+        """Start probing from the app lifespan, over one pooled client"""
+        if self._task is not None:
+            return
+        self.registry.health_client = httpx.AsyncClient(
+            timeout=HEALTH_CHECK_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        )
+        self._task = asyncio.create_task(self._run())
+        logger.info("Started health monitoring")
+
+    async def stop(self):
+        tasks = [task for task in [self._task, *self._probing.values()] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._probing.clear()
+        if self.registry.health_client is not None:
+            await self.registry.health_client.aclose()
+            self.registry.health_client = None
+
+    def next_interval(self, service_key: str) -> float:
+        """Seconds until the service's next probe, with jitter applied"""
+        settings = self.settings
+        health = self.registry.health_status.get(service_key)
+        if health is not None and health.status == ServiceStatus.HEALTHY:
+            streak = self._healthy_streak.get(service_key, 0)
+            interval = min(settings["healthy_interval_seconds"] * 2 ** streak, settings["max_interval_seconds"])
+        else:
+            interval = settings["failing_interval_seconds"]
+        jitter = settings["jitter"]
+        return interval * random.uniform(1.0 - jitter, 1.0 + jitter)
+
+    def due_services(self, now: float) -> List[str]:
+        """Services whose probe is due; new services are scheduled and removed ones forgotten"""
+        due = []
+        for service_key in list(self.registry.services.keys()):
+            next_probe_at = self._next_probe_at.get(service_key)
+            if next_probe_at is None:
+                # First probe soon, spread out so a fresh start does not probe in lockstep
+                self._next_probe_at[service_key] = now + random.uniform(0.0, self.settings["initial_spread_seconds"])
+            elif next_probe_at <= now and service_key not in self._probing:
+                due.append(service_key)
+
+        for service_key in list(self._next_probe_at):
+            if service_key not in self.registry.services:
+                self._forget(service_key)
+        return due
+
+    def _forget(self, service_key: str):
+        self._next_probe_at.pop(service_key, None)
+        self._last_probe_at.pop(service_key, None)
+        self._healthy_streak.pop(service_key, None)
+
+    def traffic_proved_healthy(self, service_key: str) -> bool:
+        """Whether a proxied call succeeded since the last probe while the service was healthy"""
+        health = self.registry.health_status.get(service_key)
+        circuit = self.registry.circuits.get(service_key)
+        if health is None or health.status != ServiceStatus.HEALTHY:
+            return False
+        if circuit is None or circuit.state != CircuitState.CLOSED:
+            return False
+        return circuit.last_success_at > self._last_probe_at.get(service_key, 0.0)
+
+    async def probe(self, service_key: str):
+        """Probe one service now, unless recent traffic already proved it healthy"""
+        try:
+            if self.traffic_proved_healthy(service_key):
+                self.skipped += 1
+                gateway_metrics.health_probe(service_key, "skipped")
+                return
+
+            await self.registry.update_service_health(service_key)
+            self.probes += 1
+            health = self.registry.health_status.get(service_key)
+            if health is not None and health.status == ServiceStatus.HEALTHY:
+                self._healthy_streak[service_key] = self._healthy_streak.get(service_key, 0) + 1
+                gateway_metrics.health_probe(service_key, "healthy")
+            else:
+                self._healthy_streak[service_key] = 0
+                gateway_metrics.health_probe(service_key, "unhealthy")
+        except Exception as e:
+            logger.error(f"Health probe for {service_key} failed: {e}")
+        finally:
+            now = time.time()
+            self._last_probe_at[service_key] = now
+            if service_key in self.registry.services:
+                self._next_probe_at[service_key] = now + self.next_interval(service_key)
+
+    async def _run(self):
+        while True:
+            now = time.time()
+            for service_key in self.due_services(now):
+                # Rescheduled when the probe finishes
+                self._next_probe_at[service_key] = float("inf")
+                task = asyncio.create_task(self.probe(service_key))
+                self._probing[service_key] = task
+                task.add_done_callback(lambda _, key=service_key: self._probing.pop(key, None))
+
+            next_due = min(self._next_probe_at.values(), default=now + MAX_TICK_SECONDS)
+            await asyncio.sleep(min(max(next_due - now, 0.05), MAX_TICK_SECONDS))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "health_probes_total": self.probes,
+            "health_probes_skipped_total": self.skipped,
+            "next_probe_in_seconds": {
+                service_key: round(max(0.0, next_probe_at - now), 1)
+                for service_key, next_probe_at in self._next_probe_at.items()
+                if service_key not in self._probing
+            }
+        }
+
+# Global health monitor for the service registry
+health_monitor = HealthMonitor(service_registry)
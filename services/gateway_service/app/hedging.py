@@ -0,0 +1,131 @@
+import asyncio
+import logging
+from typing import Dict, Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Only reads can be sent twice
+HEDGEABLE_METHODS = frozenset(["GET", "HEAD"])
+
+# Defaults for a service's "hedging" catalog section
+DEFAULT_MAX_HEDGE_RATE = 0.1
+DEFAULT_MIN_DELAY_MS = 5.0
+
+class HedgeBudget:
+    """Token bucket keeping hedges under max_hedge_rate of a service's requests"""
+
+    def __init__(self, max_hedge_rate: float):
+        self.max_hedge_rate = max_hedge_rate
+        self.tokens = 1.0
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.suppressed = 0
+
+    def record_request(self):
+        self.requests += 1
+        self.tokens = min(1.0, self.tokens + self.max_hedge_rate)
+
+    def try_acquire(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            self.hedges += 1
+            return True
+        self.suppressed += 1
+        return False
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "requests_total": self.requests,
+            "hedges_total": self.hedges,
+            "hedge_wins_total": self.hedge_wins,
+            "hedges_suppressed_total": self.suppressed
+        }
+
+class RequestHedger:
+    """
+    Send a backup request when the primary is slower than the service's p95.
+
+    Whichever attempt answers first wins and the other is cancelled. A failed
+    attempt does not win while the other is still running.
+    """
+
+    def __init__(self):
+        self._budgets: Dict[str, HedgeBudget] = {}
+
+    def _budget(self, service_key: str, settings: Dict[str, Any]) -> HedgeBudget:
+        budget = self._budgets.get(service_key)
+        if budget is None:
+            budget = HedgeBudget(settings.get("max_hedge_rate", DEFAULT_MAX_HEDGE_RATE))
+            self._budgets[service_key] = budget
+        return budget
+
+    def hedge_delay(self, service_key: str, config: Any, method: str, latency_percentiles: Dict[str, float]) -> Optional[float]:
+        """
+        Seconds to wait before hedging a request, or None when it must not be hedged.
+
+        Services opt in with hedging.enabled; without enough latency history to
+        know the p95 the request is sent once.
+        """
+        settings = getattr(config, "hedging", None) or {}
+        if not settings.get("enabled") or method not in HEDGEABLE_METHODS:
+            return None
+
+        self._budget(service_key, settings).record_request()
+        p95_ms = latency_percentiles.get("p95_ms")
+        if p95_ms is None:
+            return None
+        return max(p95_ms, settings.get("min_delay_ms", DEFAULT_MIN_DELAY_MS)) / 1000.0
+
+    async def run(
+        self,
+        service_key: str,
+        primary: Callable[[], Awaitable[Any]],
+        hedge: Callable[[], Awaitable[Any]],
+        delay: float
+    ) -> Any:
+        """Run primary, adding hedge after delay if budget allows; return the first result"""
+        first = asyncio.ensure_future(primary())
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return first.result()
+
+            budget = self._budgets.get(service_key)
+            if budget is None or not budget.try_acquire():
+                return await first
+
+            second = asyncio.ensure_future(hedge())
+            tasks.add(second)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            budget.hedge_wins += 1
+                        return task.result()
+
+            # Both attempts failed: report the primary's error
+            return first.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def prune(self, services: Dict[str, Any]):
+        """Drop hedge budgets of removed or retuned services after a catalog reload"""
+        for service_key, budget in list(self._budgets.items()):
+            config = services.get(service_key)
+            settings = getattr(config, "hedging", None) or {}
+            if config is None or budget.max_hedge_rate != settings.get("max_hedge_rate", DEFAULT_MAX_HEDGE_RATE):
+                del self._budgets[service_key]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get hedging counters per service for monitoring"""
+        return {service_key: budget.get_metrics() for service_key, budget in self._budgets.items()}
+
+# Global request hedger instance
+request_hedger = RequestHedger()
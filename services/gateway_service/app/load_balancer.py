@@ -0,0 +1,187 @@
+import logging
+import math
+import random
+import time
+from typing import Dict, Any, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+LEAST_OUTSTANDING = "least_outstanding"
+PEAK_EWMA = "peak_ewma"
+
+class UpstreamInstance:
+    """One upstream replica of a service and its load/health bookkeeping"""
+
+    __slots__ = ("url", "outstanding", "ewma_ms", "last_sample_at", "healthy", "draining",
+                 "removed", "consecutive_failures", "ejected_until", "total_requests")
+
+    def __init__(self, url: str, draining: bool = False):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.ewma_ms = 0.0
+        self.last_sample_at = 0.0
+        self.healthy = True
+        self.draining = draining
+        self.removed = False
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.total_requests = 0
+
+    def is_available(self, now: float) -> bool:
+        return self.healthy and not self.draining and now >= self.ejected_until
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "draining": self.draining,
+            "ejected": time.time() < self.ejected_until,
+            "outstanding": self.outstanding,
+            "ewma_ms": round(self.ewma_ms, 2),
+            "total_requests": self.total_requests
+        }
+
+def parse_instances(service_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Normalize a catalog entry's instances.
+
+    "instances" may list URL strings or {"url": ..., "draining": bool} objects;
+    entries without it run a single instance at internal_url.
+    """
+    raw_instances: List[Union[str, Dict[str, Any]]] = service_data.get("instances") or [service_data["internal_url"]]
+    instances = []
+    for raw in raw_instances:
+        if isinstance(raw, str):
+            instances.append({"url": raw, "draining": False})
+        else:
+            instances.append({"url": raw["url"], "draining": bool(raw.get("draining", False))})
+    return instances
+
+class LoadBalancer:
+    """
+    Spread a service's traffic over its instances.
+
+    Picks the cheaper of two random available instances (power of two choices).
+    With peak_ewma the cost is the decayed peak latency times outstanding
+    requests plus one; with least_outstanding it is the outstanding count alone.
+    Instances failing repeatedly are ejected for a while. Draining instances get
+    no new requests; once removed from the catalog they are dropped as soon as
+    their in-flight requests finish.
+    """
+
+    def __init__(
+        self,
+        service_key: str,
+        instances: List[Dict[str, Any]],
+        algorithm: str = PEAK_EWMA,
+        decay_seconds: float = 10.0,
+        ejection_threshold: int = 5,
+        ejection_seconds: float = 30.0
+    ):
+        self.service_key = service_key
+        self.algorithm = algorithm if algorithm in (PEAK_EWMA, LEAST_OUTSTANDING) else PEAK_EWMA
+        self.decay_seconds = decay_seconds
+        self.ejection_threshold = ejection_threshold
+        self.ejection_seconds = ejection_seconds
+        self.instances: Dict[str, UpstreamInstance] = {}
+        self.update_instances(instances)
+
+    def update_instances(self, instances: List[Dict[str, Any]]):
+        """Apply a new instance list, draining instances that are no longer listed"""
+        listed = set()
+        for spec in instances:
+            url = spec["url"].rstrip("/")
+            listed.add(url)
+            instance = self.instances.get(url)
+            if instance is None:
+                self.instances[url] = UpstreamInstance(url, draining=spec.get("draining", False))
+            else:
+                instance.draining = spec.get("draining", False)
+                instance.removed = False
+
+        for url, instance in list(self.instances.items()):
+            if url not in listed:
+                instance.removed = True
+                self.drain(url)
+
+    def drain(self, url: str):
+        """Stop sending new requests to an instance; removed instances are dropped once idle"""
+        instance = self.instances.get(url.rstrip("/"))
+        if instance is None:
+            return
+        instance.draining = True
+        logger.info(f"Draining {instance.url} for {self.service_key} ({instance.outstanding} in flight)")
+        self._drop_if_drained(instance)
+
+    def _drop_if_drained(self, instance: UpstreamInstance):
+        if instance.removed and instance.outstanding == 0:
+            self.instances.pop(instance.url, None)
+            logger.info(f"Removed drained instance {instance.url} from {self.service_key}")
+
+    def _cost(self, instance: UpstreamInstance, now: float) -> float:
+        if self.algorithm == LEAST_OUTSTANDING:
+            return instance.outstanding
+        # Decay the latency estimate towards zero while the instance is idle
+        elapsed = max(0.0, now - instance.last_sample_at)
+        ewma = instance.ewma_ms * math.exp(-elapsed / self.decay_seconds)
+        return ewma * (instance.outstanding + 1) + instance.outstanding
+
+    def acquire(self, exclude: Optional[set] = None) -> Optional[UpstreamInstance]:
+        """Choose an instance for one request and count it as outstanding"""
+        now = time.time()
+        candidates = [
+            instance for instance in self.instances.values()
+            if instance.is_available(now) and not (exclude and instance.url in exclude)
+        ]
+        if not candidates:
+            # Panic mode: better to try a suspect instance than to fail outright
+            candidates = [instance for instance in self.instances.values() if not instance.draining]
+        if not candidates:
+            return None
+
+        if len(candidates) == 1:
+            chosen = candidates[0]
+        else:
+            first, second = random.sample(candidates, 2)
+            chosen = first if self._cost(first, now) <= self._cost(second, now) else second
+
+        chosen.outstanding += 1
+        chosen.total_requests += 1
+        return chosen
+
+    def release(self, instance: UpstreamInstance, success: Optional[bool], latency_ms: float):
+        """Record a finished request against its instance; success None (e.g. a cancelled hedge) is no verdict"""
+        now = time.time()
+        instance.outstanding = max(0, instance.outstanding - 1)
+
+        # Peak EWMA: jump to slower samples immediately, decay towards faster ones
+        if latency_ms > instance.ewma_ms:
+            instance.ewma_ms = latency_ms
+        else:
+            weight = math.exp(-max(0.0, now - instance.last_sample_at) / self.decay_seconds)
+            instance.ewma_ms = instance.ewma_ms * weight + latency_ms * (1 - weight)
+        instance.last_sample_at = now
+
+        if success:
+            instance.consecutive_failures = 0
+        elif success is not None:
+            instance.consecutive_failures += 1
+            if instance.consecutive_failures >= self.ejection_threshold:
+                instance.ejected_until = now + self.ejection_seconds
+                instance.consecutive_failures = 0
+                logger.warning(f"Ejected {instance.url} from {self.service_key} for {self.ejection_seconds:.0f}s")
+
+        self._drop_if_drained(instance)
+
+    def set_instance_health(self, url: str, healthy: bool):
+        """Apply an active health check result to one instance"""
+        instance = self.instances.get(url.rstrip("/"))
+        if instance is not None:
+            instance.healthy = healthy
+
+    def get_status(self) -> Dict[str, Any]:
+        """Balancer state for health endpoints"""
+        return {
+            "algorithm": self.algorithm,
+            "instances": [instance.snapshot() for instance in self.instances.values()]
+        }
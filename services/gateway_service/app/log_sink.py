@@ -0,0 +1,135 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+from collections import deque
+from typing import Dict, Any, List, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+# Share of successful requests whose INFO events are logged; errors and slow requests always are
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.1"))
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+
+class StructuredLogSink:
+    """
+    Queue-backed writer for the gateway's structured log events.
+
+    The request path only appends a record to an in-memory queue; a background
+    task drains it in batches and writes them as JSON lines from a worker thread,
+    so log I/O never blocks the event loop. When the queue is full new records
+    are dropped and counted rather than slowing requests down. Until start() is
+    called (scripts, tests) records go straight to the standard logger.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = LOG_SAMPLE_RATE,
+        slow_request_ms: float = SLOW_REQUEST_MS,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval_seconds: float = 0.05,
+        stream: Optional[TextIO] = None
+    ):
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.stream = stream
+        self._queue: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def should_sample(self) -> bool:
+        """Head-based sampling decision, made once when a request starts"""
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def is_notable(self, status_code: int, latency_ms: float, error_message: Optional[str] = None) -> bool:
+        """Whether a finished request is logged regardless of sampling"""
+        return status_code >= 500 or error_message is not None or latency_ms >= self.slow_request_ms
+
+    def emit(self, level: int, message: str, log_data: Dict[str, Any]):
+        """Queue one event for the background writer"""
+        if not self.running:
+            logger.log(level, f"{message}: {json.dumps(log_data)}")
+            return
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._queue.append((level, message, log_data))
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self):
+        """Start the background writer on the running event loop"""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the writer after flushing everything still queued"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        while self._queue:
+            self._write(self._take_batch())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._queue:
+                batch = self._take_batch()
+                try:
+                    await asyncio.to_thread(self._write, batch)
+                except Exception as e:
+                    logger.error(f"Failed to write {len(batch)} log records: {e}")
+
+    def _take_batch(self) -> List[tuple]:
+        count = min(len(self._queue), self.batch_size)
+        return [self._queue.popleft() for _ in range(count)]
+
+    def _write(self, batch: List[tuple]):
+        """Serialize and write one batch with a single write call"""
+        stream = self.stream or sys.stdout
+        lines = []
+        for level, message, log_data in batch:
+            record = {"level": logging.getLevelName(level), "message": message}
+            record.update(log_data)
+            lines.append(json.dumps(record, default=str))
+        stream.write("\n".join(lines) + "\n")
+        stream.flush()
+        self.written += len(batch)
+        self.batches += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get log sink counters for monitoring"""
+        return {
+            "gateway_log_records_written_total": self.written,
+            "gateway_log_records_dropped_total": self.dropped,
+            "gateway_log_batches_total": self.batches,
+            "gateway_log_queue_depth": len(self._queue),
+            "sample_rate": self.sample_rate
+        }
+
+# Global log sink instance
+log_sink = StructuredLogSink()
@@ -9,38 +9,77 @@ import logging
 from datetime import datetime
 import os
 import uuid
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Tuple
 
 # Import enhanced modules
-from app.routing import resolve_service, get_service_config, get_service_health_summary, get_service_metrics
-from app.middleware import (
-    AuthMiddleware, 
-    RBACMiddleware, 
-    RateLimitMiddleware, 
-    LoggingMiddleware, 
-    IdentityForwardingMiddleware
-)
+from app.routing import resolve_service, resolve_request_service, get_service_health_summary, get_service_metrics
+from app.middleware import GatewayPipelineMiddleware
+from app.compression import CompressionMiddleware, response_compressor
 from app.observability import observability_manager
+from app.metrics import gateway_metrics
+from app.log_sink import log_sink
 from app.service_registry import service_registry
+from app.health_monitor import health_monitor
+from app.client_pool import client_pool
+from app.rbac import rbac_validator, Role
+from app.token_cache import token_cache
+from app.rate_limiter import rate_limiter
+from app.bulkhead import Bulkhead, bulkheads
+from app.catalog_reload import catalog_reloader, CATALOG_WATCH_INTERVAL_SECONDS
+from app.batch import BatchRequest, batch_executor, BATCH_PATH, BATCH_MAX_REQUESTS
+from app.hedging import request_hedger
+from app.retry_policy import retry_budgets, request_deadline, is_retry_safe, DEADLINE_HEADER
+from app.single_flight import single_flight, build_coalesce_key, COALESCABLE_METHODS
+from app.response_cache import response_cache, build_cache_key, build_entry, cache_policy, is_storable, CachedResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Enhanced middleware stack
+# Single pure-ASGI pipeline: logging, auth, RBAC, rate limiting and identity forwarding,
+# wrapping response compression so its cost shows up in gateway overhead
 middlewares = [
-    Middleware(LoggingMiddleware),
-    Middleware(AuthMiddleware),
-    Middleware(RBACMiddleware),
-    Middleware(RateLimitMiddleware, default_limit_per_minute=100),
-    Middleware(IdentityForwardingMiddleware),
+    Middleware(GatewayPipelineMiddleware, default_limit_per_minute=100),
+    Middleware(CompressionMiddleware),
 ]
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start pooled upstream clients, health probing and the log writer on startup; stop them on shutdown"""
+    client_pool.start(service_registry.services)
+    rbac_validator.compile_decision_table(service_registry.services)
+    log_sink.start()
+    health_monitor.start()
+    
+    # Evict cached JWT claims as auth_service revokes tokens
+    revocation_task = None
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        revocation_task = asyncio.create_task(token_cache.listen_for_revocations(redis_url))
+    
+    # Pick up edits to service_catalog.json without a restart
+    catalog_watch_task = None
+    if CATALOG_WATCH_INTERVAL_SECONDS > 0:
+        catalog_watch_task = asyncio.create_task(catalog_reloader.watch(CATALOG_WATCH_INTERVAL_SECONDS))
+    
+    try:
+        yield
+    finally:
+        if revocation_task:
+            revocation_task.cancel()
+        if catalog_watch_task:
+            catalog_watch_task.cancel()
+        await health_monitor.stop()
+        await client_pool.close()
+        await log_sink.stop()
+
 app = FastAPI(
     title="ReqArchitect Gateway Service",
     description="Enhanced API Gateway with dynamic routing, RBAC enforcement, and observability",
     version="2.0.0",
-    middleware=middlewares
+    middleware=middlewares,
+    lifespan=lifespan
 )
 
 # Initialize app state
@@ -98,7 +137,15 @@ def gateway_health():
             "service_health": health_summary,
             "service_metrics": service_metrics,
             "circuit_breaker_status": {
-                "open_services": health_summary["services"],
+                "open_services": [
+                    service_key for service_key, summary in health_summary["services"].items()
+                    if summary["status"] == "circuit_open" or summary.get("circuit", {}).get("state") == "open"
+                ],
+                "circuits": {
+                    service_key: summary["circuit"]
+                    for service_key, summary in health_summary["services"].items()
+                    if "circuit" in summary
+                },
                 "healthy_count": health_summary["healthy_count"],
                 "unhealthy_count": health_summary["unhealthy_count"]
             }
@@ -116,8 +163,18 @@ def gateway_health():
         }
 
 @app.get("/metrics")
-def get_metrics():
-    """Enhanced Prometheus-style metrics endpoint"""
+def get_metrics(request: Request):
+    """
+    Gateway metrics.
+    
+    Prometheus scrapers (Accept: text/plain or OpenMetrics) get the text
+    exposition format; other callers get the JSON summary.
+    """
+    accept = request.headers.get("accept", "")
+    if "text/plain" in accept or "openmetrics" in accept:
+        body, content_type = gateway_metrics.exposition()
+        return Response(content=body, media_type=content_type)
+    
     try:
         service_metrics = get_service_metrics()
         observability_metrics = observability_manager.get_metrics()
@@ -128,7 +185,18 @@ def get_metrics():
             "gateway_errors_total": getattr(app.state, 'error_count', 0),
             "gateway_active_connections": getattr(app.state, 'active_connections', 0),
             "service_metrics": service_metrics,
-            "observability_metrics": observability_metrics
+            "observability_metrics": observability_metrics,
+            "upstream_pool_metrics": client_pool.get_metrics(),
+            "rate_limit_metrics": rate_limiter.get_metrics(),
+            "response_cache_metrics": response_cache.get_metrics(),
+            "single_flight_metrics": single_flight.get_metrics(),
+            "retry_budget_metrics": retry_budgets.get_metrics(),
+            "hedging_metrics": request_hedger.get_metrics(),
+            "log_sink_metrics": log_sink.get_metrics(),
+            "compression_metrics": response_compressor.get_metrics(),
+            "bulkhead_metrics": bulkheads.get_metrics(),
+            "catalog_reload_metrics": catalog_reloader.get_metrics(),
+            "health_probe_metrics": health_monitor.get_metrics()
         }
     except Exception as e:
         logger.error(f"Metrics collection failed: {e}")
@@ -144,100 +212,545 @@ def get_uptime() -> float:
     """Get service uptime in seconds"""
     return time.time() - app.state.start_time
 
+# Hop-by-hop headers are connection-specific and never forwarded to the client
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade"
+}
+
+def build_upstream_headers(request: Request, context: any) -> dict:
+    """Build forwarded headers with identity and correlation information"""
+    headers = dict(request.headers)
+    headers["X-User-ID"] = getattr(request.state, "user_id", "")
+    headers["X-Tenant-ID"] = getattr(request.state, "tenant_id", "")
+    headers["X-Role"] = getattr(request.state, "role", "")
+    headers["X-Request-ID"] = context.request_id
+    headers["X-Correlation-ID"] = context.correlation_id
+    
+    # Remove host header to avoid conflicts
+    headers.pop("host", None)
+    # The remaining deadline is set per attempt
+    headers.pop(DEADLINE_HEADER.lower(), None)
+    # Bodies are relayed still encoded, so never let httpx offer codings the client did not
+    headers.setdefault("accept-encoding", "identity")
+    return headers
+
+# Request validators; a gateway-supplied one replaces all of the client's
+CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+
+def apply_extra_headers(headers: dict, extra_headers: Optional[dict]) -> dict:
+    """
+    Layer gateway-supplied headers over the forwarded request headers.
+    
+    Names are matched case-insensitively so nothing is sent twice. When the
+    gateway adds its own validator the client's are dropped, so a 304 can only
+    mean the gateway's copy is current.
+    """
+    if not extra_headers:
+        return headers
+    extra = {name.lower(): value for name, value in extra_headers.items()}
+    if any(name in extra for name in CONDITIONAL_HEADERS):
+        for name in CONDITIONAL_HEADERS:
+            headers.pop(name, None)
+    headers.update(extra)
+    return headers
+
+def relayed_response_headers(response: httpx.Response) -> dict:
+    """
+    Headers to relay with a buffered upstream body.
+    
+    The body is relayed as the upstream encoded it, so Content-Encoding is kept;
+    the compression middleware only encodes responses that arrive uncompressed.
+    """
+    return {
+        name: value for name, value in response.headers.items()
+        if name.lower() not in HOP_BY_HOP_HEADERS and name.lower() != "content-length"
+    }
+
+async def read_raw_body(response: httpx.Response) -> bytes:
+    """Read a streamed upstream body without decoding its Content-Encoding"""
+    try:
+        return b"".join([chunk async for chunk in response.aiter_raw()])
+    finally:
+        await response.aclose()
+
+def instance_target_url(target_url: str, config: any, instance: any) -> str:
+    """Rebase a target URL built on the service's internal_url onto the chosen instance"""
+    if instance is None or not target_url.startswith(config.internal_url):
+        return target_url
+    return instance.url + target_url[len(config.internal_url):]
+
+class ProxyAttempts:
+    """
+    State shared by every attempt at proxying one request.
+    
+    All attempts share one deadline: each attempt's timeout is capped at the
+    remaining budget, which is also forwarded in X-Request-Deadline-Ms. Retries
+    are limited to replayable requests and drawn from the service's retry budget.
+    The buffered and streaming paths both retry through this, so they fail over
+    the same way.
+    """
+    
+    def __init__(
+        self,
+        request: Request,
+        target_url: str,
+        service_key: str,
+        config: any,
+        context: any,
+        replayable: bool,
+        action: str = "proxying"
+    ):
+        self.request = request
+        self.target_url = target_url
+        self.service_key = service_key
+        self.config = config
+        self.context = context
+        self.action = action
+        self.max_attempts = config.retry_policy.get("max_retries", 3) + 1 if replayable else 1
+        self.backoff_ms = config.retry_policy.get("backoff_ms", 1000)
+        self.deadline = request_deadline(request, config)
+        self.budget = retry_budgets.get(service_key, config.retry_policy)
+        self.budget.record_request()
+        # Instances already tried by this request, so retries prefer another one
+        self.tried_instances = set()
+    
+    def remaining(self, attempt: int) -> float:
+        """Seconds left before the deadline; 504 once it has passed"""
+        remaining = self.deadline - time.time()
+        if remaining <= 0:
+            raise HTTPException(
+                status_code=504, detail=f"Service {self.service_key} deadline exceeded after {attempt} attempts"
+            )
+        return remaining
+    
+    def attempt_timeout(self, remaining: float) -> float:
+        """Per-attempt timeout, capped at what is left of the deadline"""
+        return min(self.config.timeout_ms / 1000.0, remaining)
+    
+    def may_retry(self, attempt: int) -> bool:
+        """Whether another attempt is allowed after a failed one"""
+        if attempt >= self.max_attempts - 1:
+            return False
+        if service_registry.is_circuit_open(self.service_key):
+            return False
+        # Not worth retrying if the backoff alone would exhaust the deadline
+        if time.time() + self.backoff(attempt) >= self.deadline:
+            return False
+        allowed = self.budget.try_acquire()
+        gateway_metrics.retry_decision(self.service_key, allowed)
+        return allowed
+    
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before retrying after the given attempt"""
+        return self.backoff_ms / 1000.0 * (attempt + 1)
+    
+    async def send(self, client: httpx.AsyncClient, **request_kwargs) -> Tuple[httpx.Response, any, float]:
+        """
+        Send one attempt to the next instance, leaving the response body unread.
+        
+        Returns the response, the instance lease and when it was sent. The lease
+        is returned here only if sending fails; otherwise the caller releases it
+        once it is done with the body.
+        """
+        instance = service_registry.acquire_instance(self.service_key, self.tried_instances)
+        instance_url = instance_target_url(self.target_url, self.config, instance)
+        if instance is not None:
+            # Claim it now so a hedge sent while this call is in flight picks another instance
+            self.tried_instances.add(instance.url)
+        sent_at = time.time()
+        
+        # Log service proxy attempt
+        observability_manager.log_service_proxy(self.context, self.service_key, instance_url)
+        
+        try:
+            # Trace service call
+            async with observability_manager.trace_service_call(self.context, self.service_key, instance_url):
+                upstream_request = client.build_request(
+                    method=self.request.method,
+                    url=instance_url,
+                    params=self.request.query_params,
+                    **request_kwargs
+                )
+                response = await client.send(upstream_request, stream=True)
+        except asyncio.CancelledError:
+            # The losing side of a hedge says nothing about the instance's health
+            service_registry.release_instance(self.service_key, instance, None, (time.time() - sent_at) * 1000)
+            raise
+        except BaseException:
+            service_registry.release_instance(self.service_key, instance, False, (time.time() - sent_at) * 1000)
+            raise
+        return response, instance, sent_at
+    
+    async def failed(self, attempt: int, error: Exception, started_at: float) -> None:
+        """
+        Handle a failed attempt: raise the client's error, or back off when retrying.
+        
+        Timeouts are retried straight away; other errors after the backoff.
+        """
+        if isinstance(error, httpx.TimeoutException):
+            logger.warning(f"Timeout {self.action} to {self.service_key} on attempt {attempt + 1}: {self.target_url}")
+            status_code, detail = 504, f"Service {self.service_key} timeout after {attempt + 1} attempts"
+        else:
+            logger.error(f"Unexpected error {self.action} to {self.service_key}: {error}")
+            status_code, detail = 502, f"Service {self.service_key} error: {str(error)}"
+        
+        service_registry.record_outcome(self.service_key, False, (time.time() - started_at) * 1000)
+        if service_registry.is_circuit_open(self.service_key):
+            raise HTTPException(status_code=503, detail=f"Service {self.service_key} is currently unavailable")
+        if not self.may_retry(attempt):
+            raise HTTPException(status_code=status_code, detail=detail)
+        
+        if not isinstance(error, httpx.TimeoutException):
+            await asyncio.sleep(self.backoff(attempt))
+    
+    def exhausted(self) -> HTTPException:
+        """Error for a request whose attempts all failed without raising their own"""
+        return HTTPException(
+            status_code=502, detail=f"Service {self.service_key} failed after {self.max_attempts} attempts"
+        )
+
+async def send_buffered(
+    attempts: ProxyAttempts, client: httpx.AsyncClient, **request_kwargs
+) -> Tuple[httpx.Response, bytes]:
+    """Send one attempt and read its raw body, returning the instance lease once read"""
+    response, instance, sent_at = await attempts.send(client, **request_kwargs)
+    succeeded = False
+    try:
+        raw_body = await read_raw_body(response)
+        succeeded = response.status_code < 500
+        return response, raw_body
+    except asyncio.CancelledError:
+        # The losing side of a hedge says nothing about the instance's health
+        succeeded = None
+        raise
+    finally:
+        service_registry.release_instance(attempts.service_key, instance, succeeded, (time.time() - sent_at) * 1000)
+
+async def send_hedged(
+    attempts: ProxyAttempts, remaining: float, **request_kwargs
+) -> Tuple[httpx.Response, bytes]:
+    """Send one buffered attempt over the service's pooled client, hedging slow reads"""
+    service_key, config = attempts.service_key, attempts.config
+    client = client_pool.get_client(service_key, config)
+    hedge_delay = request_hedger.hedge_delay(
+        service_key, config, attempts.request.method, service_registry.get_latency_percentiles(service_key)
+    )
+    if hedge_delay is None or hedge_delay >= remaining:
+        return await send_buffered(attempts, client, **request_kwargs)
+    
+    hedge_client = client_pool.get_hedge_client(service_key, config)
+    return await request_hedger.run(
+        service_key,
+        lambda: send_buffered(attempts, client, **request_kwargs),
+        lambda: send_buffered(attempts, hedge_client, **request_kwargs),
+        hedge_delay
+    )
+
 async def proxy_request_with_retry(
     request: Request, 
     target_url: str, 
     service_key: str,
     config: any,
-    context: any
+    context: any,
+    extra_headers: Optional[dict] = None
 ) -> Response:
     """
     Proxy request with retry logic and fault tolerance.
     
+    Deadlines, retries and failure handling are shared with the streaming path
+    through ProxyAttempts.
+    
     Args:
         request: Original request
         target_url: Target service URL
         service_key: Service identifier
         config: Service configuration
         context: Request context for observability
+        extra_headers: Headers added on top of the forwarded request headers
         
     Returns:
         Proxied response
     """
-    max_retries = config.retry_policy.get("max_retries", 3)
-    backoff_ms = config.retry_policy.get("backoff_ms", 1000)
-    timeout_ms = config.timeout_ms
+    attempts = ProxyAttempts(request, target_url, service_key, config, context, is_retry_safe(request))
     
-    for attempt in range(max_retries + 1):
-        try:
-            # Log service proxy attempt
-            observability_manager.log_service_proxy(context, service_key, target_url)
-            
-            # Prepare headers
-            headers = dict(request.headers)
-            headers["X-User-ID"] = getattr(request.state, "user_id", "")
-            headers["X-Tenant-ID"] = getattr(request.state, "tenant_id", "")
-            headers["X-Role"] = getattr(request.state, "role", "")
-            headers["X-Request-ID"] = context.request_id
-            headers["X-Correlation-ID"] = context.correlation_id
-            
-            # Remove host header to avoid conflicts
-            headers.pop("host", None)
+    # Hold a slot in the service's bulkhead across all attempts; sheds with 503 when full
+    bulkhead = bulkheads.get(service_key, config.bulkhead)
+    await bulkhead.acquire()
+    try:
+        for attempt in range(attempts.max_attempts):
+            start_time = time.time()
+            remaining = attempts.remaining(attempt)
             
-            # Forward request with timeout
-            async with httpx.AsyncClient(timeout=timeout_ms / 1000.0) as client:
-                start_time = time.time()
+            try:
+                # Prepare headers
+                headers = apply_extra_headers(build_upstream_headers(request, context), extra_headers)
+                headers[DEADLINE_HEADER] = str(int(remaining * 1000))
                 
-                # Trace service call
-                async with observability_manager.trace_service_call(context, service_key, target_url):
-                    response = await client.request(
-                        method=request.method,
-                        url=target_url,
-                        headers=headers,
-                        content=await request.body(),
-                        params=request.query_params
-                    )
+                response, raw_body = await send_hedged(
+                    attempts, remaining,
+                    headers=headers, content=await request.body(), timeout=attempts.attempt_timeout(remaining)
+                )
                 
                 response_time = (time.time() - start_time) * 1000
                 
                 # Log service response
                 observability_manager.log_service_response(context, service_key, response.status_code, response_time)
+                service_registry.record_outcome(service_key, response.status_code < 500, response_time)
                 
                 # Return successful response
                 return Response(
-                    content=response.content,
+                    content=raw_body,
                     status_code=response.status_code,
-                    headers=dict(response.headers)
+                    headers=relayed_response_headers(response)
                 )
                 
-        except httpx.TimeoutException:
-            logger.warning(f"Timeout on attempt {attempt + 1} for {service_key}: {target_url}")
-            if attempt == max_retries:
-                raise HTTPException(status_code=504, detail=f"Service {service_key} timeout after {max_retries + 1} attempts")
-            
-        except httpx.HTTPStatusError as e:
-            # Handle specific HTTP errors
-            if e.response.status_code in [503, 504] and attempt < max_retries:
-                logger.warning(f"Service {service_key} returned {e.response.status_code}, retrying...")
-                await asyncio.sleep(backoff_ms / 1000.0 * (attempt + 1))
-                continue
-            else:
+            except httpx.HTTPStatusError as e:
+                # Handle specific HTTP errors
+                if e.response.status_code in [503, 504] and attempts.may_retry(attempt):
+                    logger.warning(f"Service {service_key} returned {e.response.status_code}, retrying...")
+                    await asyncio.sleep(attempts.backoff(attempt))
+                    continue
                 # Return the error response
                 return Response(
                     content=e.response.content,
                     status_code=e.response.status_code,
-                    headers=dict(e.response.headers)
+                    headers=relayed_response_headers(e.response)
                 )
                 
-        except Exception as e:
-            logger.error(f"Unexpected error proxying to {service_key}: {e}")
-            if attempt == max_retries:
-                raise HTTPException(status_code=502, detail=f"Service {service_key} error: {str(e)}")
-            
-            await asyncio.sleep(backoff_ms / 1000.0 * (attempt + 1))
+            except Exception as e:
+                await attempts.failed(attempt, e, start_time)
+        
+        # Should not reach here, but just in case
+        raise attempts.exhausted()
+    finally:
+        bulkhead.release()
+
+def cached_response(request: Request, entry: CachedResponse, cache_status: str, now: float) -> Response:
+    """Build a client response from a cache entry"""
+    headers = dict(entry.headers)
+    headers["X-Cache"] = cache_status
+    headers["Age"] = str(int(now - entry.stored_at))
+    
+    # Answer the client's own conditional request without a body
+    if entry.etag and request.headers.get("if-none-match") == entry.etag:
+        return Response(status_code=304, headers=headers)
     
-    # Should not reach here, but just in case
-    raise HTTPException(status_code=502, detail=f"Service {service_key} failed after {max_retries + 1} attempts")
+    return Response(content=entry.body, status_code=entry.status_code, headers=headers)
+
+async def fetch_and_cache(
+    request: Request,
+    target_url: str,
+    service_key: str,
+    config: any,
+    context: any,
+    cache_key: str,
+    entry: Optional[CachedResponse]
+) -> Response:
+    """Fetch from upstream, revalidating with If-None-Match when an entry has an ETag"""
+    policy = cache_policy(config)
+    extra_headers = None
+    if entry and entry.etag:
+        extra_headers = {"If-None-Match": entry.etag}
+        response_cache.revalidations += 1
+    
+    response = await proxy_request_with_retry(request, target_url, service_key, config, context, extra_headers=extra_headers)
+    now = time.time()
+    
+    if response.status_code == 304 and entry:
+        # Upstream confirmed our copy is current: extend its freshness
+        response_cache.not_modified += 1
+        refreshed_entry = build_entry(entry.status_code, entry.headers, entry.body, policy, now)
+        await response_cache.set(cache_key, refreshed_entry)
+        return cached_response(request, refreshed_entry, "REVALIDATED", now)
+    
+    headers = dict(response.headers)
+    if is_storable(response.status_code, headers):
+        await response_cache.set(cache_key, build_entry(response.status_code, headers, response.body, policy, now))
+    
+    response.headers["X-Cache"] = "MISS"
+    return response
+
+async def proxy_cacheable_request(
+    request: Request,
+    target_url: str,
+    service_key: str,
+    config: any,
+    context: any
+) -> Response:
+    """
+    Serve GETs to cacheable services through the tenant-scoped response cache.
+    
+    Fresh entries are returned directly. Stale entries inside the service's
+    stale-while-revalidate window are returned immediately and refreshed in the
+    background; anything older is revalidated with the upstream before answering.
+    
+    Args:
+        request: Original request
+        target_url: Target service URL
+        service_key: Service identifier
+        config: Service configuration
+        context: Request context for observability
+        
+    Returns:
+        Cached or proxied response
+    """
+    # Buffer the (empty) body now so background revalidation never reads from a finished request
+    await request.body()
+    
+    cache_key = build_cache_key(
+        getattr(request.state, "tenant_id", ""),
+        getattr(request.state, "role", ""),
+        request.url.path,
+        request.query_params.multi_items(),
+        user_id=getattr(request.state, "user_id", None) if config.tenant_scope == "user" else None,
+        headers=request.headers
+    )
+    now = time.time()
+    entry = await response_cache.get(cache_key)
+    
+    if entry and entry.is_fresh(now):
+        response_cache.hits += 1
+        return cached_response(request, entry, "HIT", now)
+    
+    if entry and entry.is_servable_stale(now):
+        response_cache.stale_hits += 1
+        response_cache.revalidate_in_background(
+            cache_key,
+            lambda: fetch_and_cache(request, target_url, service_key, config, context, cache_key, entry)
+        )
+        return cached_response(request, entry, "STALE", now)
+    
+    response_cache.misses += 1
+    return await fetch_and_cache(request, target_url, service_key, config, context, cache_key, entry)
+
+async def proxy_coalesced_request(
+    request: Request,
+    target_url: str,
+    service_key: str,
+    config: any,
+    context: any
+) -> Response:
+    """
+    Share one upstream call between concurrent identical idempotent requests.
+    
+    Every waiter receives its own copy of the response so per-request header
+    changes never leak between clients.
+    """
+    async def fetch() -> Response:
+        if config.cacheable and request.method == "GET":
+            return await proxy_cacheable_request(request, target_url, service_key, config, context)
+        return await proxy_request_with_retry(request, target_url, service_key, config, context)
+    
+    response = await single_flight.do(build_coalesce_key(request, config), fetch)
+    return Response(content=response.body, status_code=response.status_code, headers=dict(response.headers))
+
+async def relay_upstream_body(
+    upstream: httpx.Response,
+    service_key: str,
+    instance: any,
+    bulkhead: Bulkhead,
+    succeeded: bool,
+    response_time: float
+) -> AsyncIterator[bytes]:
+    """
+    Relay a streamed upstream body, then give the upstream back.
+    
+    The instance lease and bulkhead slot are returned and the upstream response
+    closed on every exit path: the body completing, the upstream failing partway through, or the
+    client going away. A body that fails partway through counts as a failed call.
+    Raw bytes keep any upstream content-encoding intact.
+    """
+    try:
+        async for chunk in upstream.aiter_raw():
+            yield chunk
+    except Exception as e:
+        logger.warning(f"Upstream body from {service_key} failed partway through: {e}")
+        succeeded = False
+        raise
+    finally:
+        # Release before awaiting: a cancelled response task may not get past the next await
+        service_registry.release_instance(service_key, instance, succeeded, response_time)
+        bulkhead.release()
+        await asyncio.shield(upstream.aclose())
+
+async def proxy_streaming_request(
+    request: Request,
+    target_url: str,
+    service_key: str,
+    config: any,
+    context: any
+) -> StreamingResponse:
+    """
+    Proxy request without buffering bodies in either direction.
+    
+    The request body is streamed to the upstream as it arrives and the upstream
+    response is relayed chunk by chunk. Retries are only attempted while the body
+    is still replayable, i.e. when the request carries no body, and share the
+    request's deadline and the service's retry budget with the buffered path.
+    
+    Args:
+        request: Original request
+        target_url: Target service URL
+        service_key: Service identifier
+        config: Service configuration
+        context: Request context for observability
+        
+    Returns:
+        Streaming proxied response
+    """
+    headers = build_upstream_headers(request, context)
+    has_body = headers.get("content-length", "0") != "0" or "transfer-encoding" in headers
+    
+    # A streamed body is consumed by the first attempt and cannot be replayed
+    attempts = ProxyAttempts(
+        request, target_url, service_key, config, context,
+        replayable=not has_body and is_retry_safe(request), action="streaming"
+    )
+    client = client_pool.get_client(service_key, config)
+    
+    bulkhead = bulkheads.get(service_key, config.bulkhead)
+    await bulkhead.acquire()
+    try:
+        for attempt in range(attempts.max_attempts):
+            start_time = time.time()
+            remaining = attempts.remaining(attempt)
+            headers[DEADLINE_HEADER] = str(int(remaining * 1000))
+            
+            try:
+                response, instance, _ = await attempts.send(
+                    client,
+                    headers=headers,
+                    content=request.stream() if has_body else None,
+                    timeout=attempts.attempt_timeout(remaining)
+                )
+                
+                # Time to upstream response headers
+                response_time = (time.time() - start_time) * 1000
+                succeeded = response.status_code < 500
+                observability_manager.log_service_response(context, service_key, response.status_code, response_time)
+                service_registry.record_outcome(service_key, succeeded, response_time)
+                
+                response_headers = {
+                    name: value for name, value in response.headers.items()
+                    if name.lower() not in HOP_BY_HOP_HEADERS
+                }
+                
+                # The instance and bulkhead slot stay held until the body has been relayed
+                return StreamingResponse(
+                    relay_upstream_body(response, service_key, instance, bulkhead, succeeded, response_time),
+                    status_code=response.status_code,
+                    headers=response_headers
+                )
+                
+            except Exception as e:
+                await attempts.failed(attempt, e, start_time)
+        
+        raise attempts.exhausted()
+    except BaseException:
+        # Responses release the slot in relay_upstream_body(), once the body has been relayed
+        bulkhead.release()
+        raise
 
 @app.get("/services")
 def list_services():
@@ -295,6 +808,74 @@ def get_service_health(service_key: str):
         logger.error(f"Failed to get service health for {service_key}: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve service health")
 
+async def forward_request(request: Request, service_key: str, config: any, context: any, allow_streaming: bool = True) -> Response:
+    """
+    Send a resolved request to its service.
+    
+    Shared by the catch-all proxy route and /batch sub-requests; batches pass
+    allow_streaming=False so every sub-response can be embedded in the batch body.
+    """
+    # Check if service is healthy
+    if not service_registry.is_service_healthy(service_key):
+        app.state.error_count += 1
+        raise HTTPException(
+            status_code=503, 
+            detail=f"Service {service_key} is currently unavailable"
+        )
+    
+    # Build target URL
+    target_url = f"{config.internal_url}{request.url.path}"
+    
+    # Proxy request, streaming bodies through for services that opt in
+    if config.streaming and allow_streaming:
+        return await proxy_streaming_request(request, target_url, service_key, config, context)
+    # Only cacheable services declare responses shareable within a tenant and role
+    if request.method in COALESCABLE_METHODS and config.cacheable:
+        return await proxy_coalesced_request(request, target_url, service_key, config, context)
+    return await proxy_request_with_retry(request, target_url, service_key, config, context)
+
+@app.post(BATCH_PATH)
+async def batch_proxy(request: Request, batch: BatchRequest):
+    """
+    Run many sub-requests in one round trip.
+    
+    The caller is authenticated once by the pipeline; each sub-request is routed
+    through the service registry and proxied concurrently, up to the batch
+    concurrency limit. Every sub-request reports its own status.
+    """
+    if not batch.requests:
+        raise HTTPException(status_code=400, detail="Batch contains no requests")
+    if len(batch.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {BATCH_MAX_REQUESTS} requests")
+    
+    app.state.request_count += len(batch.requests)
+    
+    async def forward(sub_request: Request, service_key: str, config: any, context: any) -> Response:
+        return await forward_request(sub_request, service_key, config, context, allow_streaming=False)
+    
+    responses = await batch_executor.run(request, batch, forward)
+    return {"responses": responses}
+
+@app.post("/admin/catalog/reload")
+async def reload_catalog(request: Request):
+    """
+    Reload service_catalog.json without restarting the gateway.
+    
+    Restricted to Owner and Admin. Returns the services that were added,
+    removed, changed or left as they were.
+    """
+    role = getattr(request.state, "role", Role.VIEWER.value)
+    if role not in (Role.OWNER.value, Role.ADMIN.value):
+        raise HTTPException(status_code=403, detail=f"Insufficient permissions to reload the service catalog, Role: {role}")
+    
+    try:
+        summary = await catalog_reloader.reload()
+    except Exception as e:
+        logger.error(f"Service catalog reload failed: {e}")
+        raise HTTPException(status_code=400, detail=f"Service catalog reload failed: {e}")
+    
+    return {"status": "reloaded", **summary}
+
 @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"])
 async def dynamic_proxy(request: Request, path: str):
     """
@@ -307,20 +888,22 @@ async def dynamic_proxy(request: Request, path: str):
         app.state.request_count += 1
         app.state.active_connections += 1
         
-        # Create observability context
-        context = observability_manager.create_request_context(
-            method=request.method,
-            path=f"/{path}",
-            user_id=getattr(request.state, "user_id", None),
-            tenant_id=getattr(request.state, "tenant_id", None),
-            service_target=None  # Will be determined
-        )
-        
-        # Store context in request state for middleware access
-        request.state.observability_context = context
+        # Reuse the pipeline's observability context when available
+        context = getattr(request.state, "observability_context", None)
+        if context is None:
+            context = observability_manager.create_request_context(
+                method=request.method,
+                path=f"/{path}",
+                user_id=getattr(request.state, "user_id", None),
+                tenant_id=getattr(request.state, "tenant_id", None),
+                service_target=None  # Will be determined
+            )
+            
+            # Store context in request state for middleware access
+            request.state.observability_context = context
         
         # Resolve service using enhanced routing
-        service_info = get_service_config(f"/{path}")
+        service_info = resolve_request_service(request)
         if not service_info:
             app.state.error_count += 1
             raise HTTPException(status_code=404, detail=f"No service found for path: /{path}")
@@ -330,21 +913,7 @@ async def dynamic_proxy(request: Request, path: str):
         # Update context with service target
         context.service_target = service_key
         
-        # Check if service is healthy
-        if not service_registry.is_service_healthy(service_key):
-            app.state.error_count += 1
-            raise HTTPException(
-                status_code=503, 
-                detail=f"Service {service_key} is currently unavailable"
-            )
-        
-        # Build target URL
-        target_url = f"{config.internal_url}/{path}"
-        
-        # Proxy request with retry logic
-        response = await proxy_request_with_retry(request, target_url, service_key, config, context)
-        
-        return response
+        return await forward_request(request, service_key, config, context)
         
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -0,0 +1,171 @@
+import logging
+from typing import Optional, Tuple
+
+# Prometheus client (installed via requirements.txt)
+try:
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+# Label values are restricted to these so series counts stay bounded
+KNOWN_METHODS = frozenset(["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])
+NO_SERVICE = "none"
+
+# Seconds; gateway overhead is expected well under the upstream buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+OVERHEAD_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+def method_label(method: str) -> str:
+    method = method.upper()
+    return method if method in KNOWN_METHODS else "OTHER"
+
+def status_class(status_code: int) -> str:
+    return f"{status_code // 100}xx" if 100 <= status_code < 600 else "unknown"
+
+class GatewayMetrics:
+    """
+    Prometheus metrics for the gateway, kept in their own registry.
+
+    Request duration is split into time spent waiting on upstreams and the
+    gateway's own overhead (routing, auth, RBAC, rate limiting, body handling).
+    Labels are limited to service key, method and status class.
+    """
+
+    def __init__(self):
+        self.enabled = PROMETHEUS_AVAILABLE
+        if not self.enabled:
+            logger.warning("prometheus_client not available, Prometheus metrics disabled")
+            return
+
+        self.registry = CollectorRegistry()
+        self.request_duration = Histogram(
+            "gateway_request_duration_seconds",
+            "End-to-end request duration at the gateway",
+            ["service_key", "method", "status_class"],
+            buckets=DURATION_BUCKETS,
+            registry=self.registry
+        )
+        self.upstream_duration = Histogram(
+            "gateway_upstream_duration_seconds",
+            "Time from sending a proxied request to receiving the upstream response",
+            ["service_key", "method", "status_class"],
+            buckets=DURATION_BUCKETS,
+            registry=self.registry
+        )
+        self.overhead_duration = Histogram(
+            "gateway_overhead_seconds",
+            "Request duration not spent waiting on upstreams",
+            ["service_key", "method"],
+            buckets=OVERHEAD_BUCKETS,
+            registry=self.registry
+        )
+        self.retries = Counter(
+            "gateway_upstream_retries",
+            "Retry decisions after a failed upstream attempt",
+            ["service_key", "outcome"],
+            registry=self.registry
+        )
+        self.circuit_opens = Counter(
+            "gateway_circuit_open",
+            "Times a service's circuit breaker opened",
+            ["service_key", "detector"],
+            registry=self.registry
+        )
+        self.health_probes = Counter(
+            "gateway_health_probes",
+            "Active health probe decisions per service",
+            ["service_key", "outcome"],
+            registry=self.registry
+        )
+        self.bulkhead_sheds = Counter(
+            "gateway_bulkhead_shed",
+            "Requests rejected by a service's bulkhead",
+            ["service_key", "reason"],
+            registry=self.registry
+        )
+        self.bulkhead_active = Gauge(
+            "gateway_bulkhead_active",
+            "Requests holding a bulkhead slot per service",
+            ["service_key"],
+            registry=self.registry
+        )
+        self.bulkhead_queue_depth = Gauge(
+            "gateway_bulkhead_queue_depth",
+            "Requests waiting for a bulkhead slot per service",
+            ["service_key"],
+            registry=self.registry
+        )
+        self.requests_in_flight = Gauge(
+            "gateway_requests_in_flight",
+            "Requests currently being handled by the gateway",
+            registry=self.registry
+        )
+        self.upstream_in_flight = Gauge(
+            "gateway_upstream_requests_in_flight",
+            "Proxied requests currently outstanding per service",
+            ["service_key"],
+            registry=self.registry
+        )
+
+    def request_started(self):
+        if self.enabled:
+            self.requests_in_flight.inc()
+
+    def request_finished(self, service_key: Optional[str], method: str, status_code: int, latency_ms: float, upstream_ms: float):
+        """Record a finished request and split its duration into upstream time and overhead"""
+        if not self.enabled:
+            return
+        self.requests_in_flight.dec()
+        service_label = service_key or NO_SERVICE
+        method = method_label(method)
+        self.request_duration.labels(service_label, method, status_class(status_code)).observe(latency_ms / 1000.0)
+        self.overhead_duration.labels(service_label, method).observe(max(0.0, latency_ms - upstream_ms) / 1000.0)
+
+    def upstream_response(self, service_key: str, method: str, status_code: int, latency_ms: float):
+        if self.enabled:
+            self.upstream_duration.labels(service_key, method_label(method), status_class(status_code)).observe(latency_ms / 1000.0)
+
+    def upstream_started(self, service_key: str):
+        if self.enabled:
+            self.upstream_in_flight.labels(service_key).inc()
+
+    def upstream_finished(self, service_key: str):
+        if self.enabled:
+            self.upstream_in_flight.labels(service_key).dec()
+
+    def retry_decision(self, service_key: str, allowed: bool):
+        if self.enabled:
+            self.retries.labels(service_key, "retried" if allowed else "budget_exhausted").inc()
+
+    def circuit_opened(self, service_key: str, detector: str):
+        """Count a circuit opening; detector is "passive" (proxied traffic) or "active" (health checks)"""
+        if self.enabled:
+            self.circuit_opens.labels(service_key, detector).inc()
+
+    def health_probe(self, service_key: str, outcome: str):
+        """Count a health probe by outcome: healthy, unhealthy, or skipped when traffic proved the service healthy"""
+        if self.enabled:
+            self.health_probes.labels(service_key, outcome).inc()
+
+    def bulkhead_state(self, service_key: str, active: int, queue_depth: int):
+        if self.enabled:
+            self.bulkhead_active.labels(service_key).set(active)
+            self.bulkhead_queue_depth.labels(service_key).set(queue_depth)
+
+    def bulkhead_shed(self, service_key: str, reason: str):
+        """Count a request shed by a bulkhead, by reason (queue_full or queue_timeout)"""
+        if self.enabled:
+            self.bulkhead_sheds.labels(service_key, reason).inc()
+
+    def exposition(self) -> Tuple[bytes, str]:
+        """Render all metrics in the Prometheus text format"""
+        if not self.enabled:
+            return b"", CONTENT_TYPE_LATEST
+        return generate_latest(self.registry), CONTENT_TYPE_LATEST
+
+# Global gateway metrics instance
+gateway_metrics = GatewayMetrics()
@@ -1,12 +1,15 @@
 import time
 import jwt
 import logging
-from fastapi import Request, Response, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from collections import defaultdict
-from app.rbac import rbac_validator, RBACContext
-from app.observability import observability_manager, RequestContext
-from app.routing import get_service_config
+from fastapi import Request, HTTPException
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send, Message
+from app.rbac import rbac_validator, service_resource
+from app.observability import observability_manager
+from app.metrics import gateway_metrics
+from app.routing import resolve_request_service
+from app.token_cache import token_cache
+from app.rate_limiter import rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -14,44 +17,132 @@ logger = logging.getLogger(__name__)
 SECRET_KEY = "REPLACE_ME"  # Match auth_service default
 ALGORITHM = "HS256"
 
-# In-memory rate limit store (for demo)
-rate_limit_store = defaultdict(list)
+# Paths served by the gateway itself, exempt from authentication and RBAC
+PUBLIC_PATHS = frozenset(["/health", "/metrics", "/gateway-health", "/services"])
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Enhanced authentication middleware with JWT decoding and identity forwarding"""
-    
-    async def dispatch(self, request: Request, call_next):
+def verified_claims(token: str) -> dict:
+    """Claims of a bearer JWT, reusing those verified earlier in the token's lifetime"""
+    payload = token_cache.get(token)
+    if payload is None:
+        # Decode JWT token (no regeneration)
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+        if not payload.get("user_id") or not payload.get("tenant_id"):
+            raise HTTPException(status_code=401, detail="Invalid token: missing user_id or tenant_id")
+
+        token_cache.put(token, payload)
+    return payload
+
+class GatewayPipelineMiddleware:
+    """
+    Pure-ASGI gateway pipeline.
+
+    Runs logging, authentication, RBAC, rate limiting and identity forwarding as
+    sequential stages of a single middleware instead of a stack of
+    BaseHTTPMiddleware layers. Stages read headers straight from the ASGI scope
+    and share state through request.state (backed by scope["state"]), so nothing
+    is copied and no extra tasks or stream wrappers are created per request.
+    """
+
+    def __init__(self, app: ASGIApp, default_limit_per_minute: int = 100):
+        self.app = app
+        self.default_limit_per_minute = default_limit_per_minute
+        self.stages = (self.authenticate, self.authorize, self.rate_limit, self.forward_identity)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        start_time = time.time()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # Create request context for observability, shared with the proxy handler
+        context = observability_manager.create_request_context(
+            method=request.method,
+            path=scope["path"],
+            user_id=None,
+            tenant_id=None,
+            service_target=None  # Will be determined during routing
+        )
+        request.state.observability_context = context
+        request.state.request_id = context.request_id
+        request.state.correlation_id = context.correlation_id
+
+        # Log request start
+        observability_manager.log_request_start(context)
+        gateway_metrics.request_started()
+
+        try:
+            # Process request with tracing
+            async with observability_manager.trace_request(context):
+                await self.dispatch(request, receive, send_wrapper)
+
+            # Log request end
+            observability_manager.log_request_end(context, status_code)
+
+        except Exception as e:
+            # Log request failure
+            status_code = 500
+            observability_manager.log_request_end(context, 500, str(e))
+            raise
+        finally:
+            # Latency is logged with request_end; here it only feeds the histograms
+            latency = (time.time() - start_time) * 1000
+            gateway_metrics.request_finished(context.service_target, request.method, status_code, latency, context.upstream_ms)
+
+    async def dispatch(self, request: Request, receive: Receive, send: Send):
+        """Run each stage in order, short-circuiting with an error response on rejection"""
+        try:
+            for stage in self.stages:
+                await stage(request)
+        except HTTPException as e:
+            response = JSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+            await response(request.scope, receive, send)
+            return
+
+        await self.app(request.scope, receive, send)
+
+    async def authenticate(self, request: Request):
+        """Decode the bearer JWT and store the caller identity on request.state"""
         # Skip authentication for health checks and metrics
-        if request.url.path in ["/health", "/metrics", "/gateway-health", "/services"]:
-            response = await call_next(request)
-            return response
-        
+        if request.url.path in PUBLIC_PATHS:
+            return
+
         # Extract and validate JWT token
-        auth_header = request.headers.get("Authorization")
+        auth_header = request.headers.get("authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
             raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-        
+
         token = auth_header.split(" ", 1)[1]
+        if token_cache.is_revoked(token):
+            raise HTTPException(status_code=401, detail="Token has been revoked")
+
         try:
-            # Decode JWT token (no regeneration)
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            
+            payload = verified_claims(token)
+
             # Extract user information
             user_id = payload.get("user_id")
             tenant_id = payload.get("tenant_id")
             role = payload.get("role", "Viewer")
-            
-            if not user_id or not tenant_id:
-                raise HTTPException(status_code=401, detail="Invalid token: missing user_id or tenant_id")
-            
+
             # Store in request state for downstream use
             request.state.user_id = user_id
             request.state.tenant_id = tenant_id
             request.state.role = role
             request.state.jwt_payload = payload
-            
+
             logger.debug(f"JWT decoded successfully for user {user_id} (tenant: {tenant_id}, role: {role})")
-            
+
+        except HTTPException:
+            raise
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail="Token has expired")
         except jwt.InvalidTokenError as e:
@@ -60,179 +151,82 @@ class AuthMiddleware(BaseHTTPMiddleware):
         except Exception as e:
             logger.error(f"JWT decoding error: {e}")
             raise HTTPException(status_code=401, detail="Token validation failed")
-        
-        response = await call_next(request)
-        return response
-
-class RBACMiddleware(BaseHTTPMiddleware):
-    """Non-intrusive RBAC enforcement middleware"""
-    
-    async def dispatch(self, request: Request, call_next):
+
+    async def authorize(self, request: Request):
+        """Non-intrusive RBAC enforcement based on the target service and HTTP method"""
         # Skip RBAC for health checks and metrics
-        if request.url.path in ["/health", "/metrics", "/gateway-health", "/services"]:
-            response = await call_next(request)
-            return response
-        
+        if request.url.path in PUBLIC_PATHS:
+            return
+
         # Get user context
         user_id = getattr(request.state, "user_id", None)
         tenant_id = getattr(request.state, "tenant_id", None)
         role = getattr(request.state, "role", "Viewer")
-        
+
         if not user_id or not tenant_id:
             raise HTTPException(status_code=401, detail="Missing user context")
-        
-        # Create RBAC context
-        rbac_context = rbac_validator.create_context(user_id, tenant_id, role)
-        
+
         # Determine target service from path
-        path = request.url.path
-        service_info = get_service_config(path)
-        
-        if service_info:
-            service_key, config = service_info
-            
-            # Check if RBAC is required for this service
-            if config.rbac_required:
-                # Extract service name from service key
-                service_name = service_key.replace("_", "")
-                
-                # Validate permission
-                has_permission = rbac_validator.validate_request_permission(
-                    rbac_context, service_name, request.method
-                )
-                
-                # Log RBAC decision
-                observability_manager.log_rbac_decision(
-                    RequestContext(
-                        request_id="",  # Will be set by observability
-                        correlation_id="",
-                        user_id=user_id,
-                        tenant_id=tenant_id,
-                        service_target=service_name,
-                        method=request.method,
-                        path=path,
-                        start_time=time.time()
-                    ),
-                    service_name,
-                    request.method,
-                    has_permission,
-                    role
-                )
-                
-                if not has_permission:
-                    raise HTTPException(
-                        status_code=403, 
-                        detail=f"Insufficient permissions. Required: {service_name}:{request.method.lower()}, Role: {role}"
-                    )
-        
-        response = await call_next(request)
-        return response
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Enhanced rate limiting middleware with service-specific limits"""
-    
-    def __init__(self, app, default_limit_per_minute=100):
-        super().__init__(app)
-        self.default_limit_per_minute = default_limit_per_minute
+        service_info = resolve_request_service(request)
+        if not service_info:
+            return
+
+        service_key, config = service_info
+        # Label metrics for requests rejected before reaching the proxy handler
+        request.state.observability_context.service_target = service_key
+
+        # Check if RBAC is required for this service
+        if not config.rbac_required:
+            return
+
+        # Single probe into the precompiled (role, service, method) decision table
+        has_permission = rbac_validator.is_allowed(role, service_key, request.method)
+
+        # Log denials and a sample of grants against the pipeline's request context
+        if rbac_validator.should_log_decision(has_permission):
+            context = request.state.observability_context
+            context.user_id = user_id
+            context.tenant_id = tenant_id
+            observability_manager.log_rbac_decision(context, service_key, request.method, has_permission, role)
 
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
+        if not has_permission:
+            raise HTTPException(
+                status_code=403,
+                detail=f"Insufficient permissions. Required: {service_resource(service_key)}:{request.method.lower()}, Role: {role}"
+            )
+
+    async def rate_limit(self, request: Request):
+        """Enforce service-specific per-user rate limits"""
         user_id = getattr(request.state, "user_id", None)
-        
         if not user_id:
-            response = await call_next(request)
-            return response
-        
+            return
+
         # Get service-specific rate limit
-        service_info = get_service_config(path)
-        rate_limit = self.default_limit_per_minute
-        
+        service_info = resolve_request_service(request)
+        service_key = "default"
+        rate_limit = {"requests_per_minute": self.default_limit_per_minute}
+
         if service_info:
             service_key, config = service_info
-            rate_limit = config.rate_limit.get("requests_per_minute", self.default_limit_per_minute)
-        
+            rate_limit.update(config.rate_limit)
+
         # Apply rate limiting
-        now = time.time()
-        window = 60  # 1 minute window
-        timestamps = rate_limit_store[user_id]
-        
-        # Remove old timestamps
-        rate_limit_store[user_id] = [t for t in timestamps if now - t < window]
-        
-        if len(rate_limit_store[user_id]) >= rate_limit:
-            logger.warning(f"Rate limit exceeded for user {user_id}: {len(rate_limit_store[user_id])} requests in {window}s")
-            raise HTTPException(status_code=429, detail="Rate limit exceeded")
-        
-        rate_limit_store[user_id].append(now)
-        
-        response = await call_next(request)
-        return response
-
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Enhanced logging middleware with structured logging and observability"""
-    
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        response = None
-        
-        # Create request context for observability
-        context = observability_manager.create_request_context(
-            method=request.method,
-            path=str(request.url.path),
-            user_id=getattr(request.state, "user_id", None),
-            tenant_id=getattr(request.state, "tenant_id", None),
-            service_target=None  # Will be determined during routing
-        )
-        
-        # Log request start
-        observability_manager.log_request_start(context)
-        
-        try:
-            # Process request with tracing
-            async with observability_manager.trace_request(context):
-                response = await call_next(request)
-                
-                # Log request end
-                observability_manager.log_request_end(context, response.status_code)
-                
-                return response
-                
-        except Exception as e:
-            # Log request failure
-            observability_manager.log_request_end(context, 500, str(e))
-            raise
-        finally:
-            # Calculate and log latency
-            latency = (time.time() - start_time) * 1000
-            status_code = getattr(response, 'status_code', 500) if response else 500
-            logger.info(f"{request.method} {request.url.path} {status_code} {latency:.2f}ms")
-
-class IdentityForwardingMiddleware(BaseHTTPMiddleware):
-    """Middleware to forward identity information to downstream services"""
-    
-    async def dispatch(self, request: Request, call_next):
-        # Forward identity headers to downstream services
-        headers = dict(request.headers)
-        
-        # Add identity headers
-        if hasattr(request.state, "user_id"):
-            headers["X-User-ID"] = request.state.user_id
-        if hasattr(request.state, "tenant_id"):
-            headers["X-Tenant-ID"] = request.state.tenant_id
-        if hasattr(request.state, "role"):
-            headers["X-Role"] = request.state.role
-        if hasattr(request.state, "jwt_payload"):
-            # Forward original JWT token
-            headers["X-JWT-Payload"] = str(request.state.jwt_payload)
-        
-        # Add correlation headers for tracing
-        if hasattr(request.state, "request_id"):
-            headers["X-Request-ID"] = request.state.request_id
-        if hasattr(request.state, "correlation_id"):
-            headers["X-Correlation-ID"] = request.state.correlation_id
-        
-        # Update request headers
-        request._headers = headers
-        
-        response = await call_next(request)
-        return response
+        decision = await rate_limiter.check(service_key, user_id, rate_limit)
+        if not decision.allowed:
+            logger.warning(f"Rate limit exceeded for user {user_id} on {service_key}: {rate_limit['requests_per_minute']}/min")
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": rate_limiter.retry_after_header(decision)}
+            )
+
+    async def forward_identity(self, request: Request):
+        """
+        Attach the caller identity to the request context for downstream forwarding.
+
+        Identity and correlation headers are written once, from request.state, when
+        the upstream request is built; the inbound scope headers are left untouched.
+        """
+        context = request.state.observability_context
+        context.user_id = getattr(request.state, "user_id", None)
+        context.tenant_id = getattr(request.state, "tenant_id", None)
@@ -2,11 +2,14 @@ import logging
 import time
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, asdict, field
 import json
 from contextlib import asynccontextmanager
 
+from app.metrics import gateway_metrics
+from app.log_sink import log_sink
+
 # OpenTelemetry imports (would be installed via requirements.txt)
 try:
     from opentelemetry import trace
@@ -42,6 +45,11 @@ class RequestContext:
     status_code: Optional[int] = None
     latency_ms: Optional[float] = None
     error_message: Optional[str] = None
+    # Time spent waiting on upstream responses, summed over proxied calls
+    upstream_ms: float = 0.0
+    # Head-based sampling: unsampled requests hold INFO events until they end
+    sampled: bool = True
+    pending_logs: List[Tuple[int, str, Dict[str, Any]]] = field(default_factory=list)
 
 class ObservabilityManager:
     """Centralized observability management for gateway service"""
@@ -112,9 +120,23 @@ class ObservabilityManager:
             service_target=service_target,
             method=method,
             path=path,
-            start_time=time.time()
+            start_time=time.time(),
+            sampled=log_sink.should_sample()
         )
     
+    def _log(self, context: Optional[RequestContext], level: int, message: str, log_data: Dict[str, Any]):
+        """
+        Hand an event to the log sink.
+        
+        Warnings and errors always go out. INFO events of unsampled requests are
+        held on the context and only written if the request turns out to be an
+        error or slow.
+        """
+        if context is None or context.sampled or level >= logging.WARNING:
+            log_sink.emit(level, message, log_data)
+        else:
+            context.pending_logs.append((level, message, log_data))
+    
     def log_request_start(self, context: RequestContext):
         """Log request start"""
         log_data = {
@@ -129,7 +151,7 @@ class ObservabilityManager:
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        logger.info(f"Request started: {json.dumps(log_data)}")
+        self._log(context, logging.INFO, "Request started", log_data)
     
     def log_request_end(self, context: RequestContext, status_code: int, error_message: Optional[str] = None):
         """Log request end with metrics"""
@@ -153,10 +175,17 @@ class ObservabilityManager:
             "timestamp": datetime.utcnow().isoformat()
         }
         
+        if not context.sampled and log_sink.is_notable(status_code, context.latency_ms, error_message):
+            # Errors and slow requests are logged in full even when not sampled
+            context.sampled = True
+            for pending in context.pending_logs:
+                log_sink.emit(*pending)
+        context.pending_logs.clear()
+        
         if status_code >= 400:
-            logger.error(f"Request failed: {json.dumps(log_data)}")
+            self._log(context, logging.ERROR, "Request failed", log_data)
         else:
-            logger.info(f"Request completed: {json.dumps(log_data)}")
+            self._log(context, logging.INFO, "Request completed", log_data)
     
     def log_service_proxy(self, context: RequestContext, target_service: str, target_url: str):
         """Log service proxy attempt"""
@@ -171,10 +200,13 @@ class ObservabilityManager:
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        logger.info(f"Proxying to service: {json.dumps(log_data)}")
+        self._log(context, logging.INFO, "Proxying to service", log_data)
     
     def log_service_response(self, context: RequestContext, target_service: str, status_code: int, latency_ms: float):
-        """Log service response"""
+        """Log service response and record its latency as upstream time"""
+        context.upstream_ms += latency_ms
+        gateway_metrics.upstream_response(target_service, context.method, status_code, latency_ms)
+        
         log_data = {
             "event": "service_response",
             "request_id": context.request_id,
@@ -187,7 +219,7 @@ class ObservabilityManager:
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        logger.info(f"Service response: {json.dumps(log_data)}")
+        self._log(context, logging.INFO, "Service response", log_data)
     
     def log_rbac_decision(self, context: RequestContext, service: str, method: str, allowed: bool, role: str):
         """Log RBAC decision"""
@@ -205,9 +237,9 @@ class ObservabilityManager:
         }
         
         if allowed:
-            logger.info(f"RBAC access granted: {json.dumps(log_data)}")
+            self._log(context, logging.INFO, "RBAC access granted", log_data)
         else:
-            logger.warning(f"RBAC access denied: {json.dumps(log_data)}")
+            self._log(context, logging.WARNING, "RBAC access denied", log_data)
     
     def log_health_check(self, service: str, status: str, response_time_ms: Optional[float] = None, error: Optional[str] = None):
         """Log health check result"""
@@ -221,9 +253,9 @@ class ObservabilityManager:
         }
         
         if status == "healthy":
-            logger.info(f"Health check passed: {json.dumps(log_data)}")
+            self._log(None, logging.INFO, "Health check passed", log_data)
         else:
-            logger.warning(f"Health check failed: {json.dumps(log_data)}")
+            self._log(None, logging.WARNING, "Health check failed", log_data)
     
     def log_circuit_breaker(self, service: str, action: str, consecutive_failures: int):
         """Log circuit breaker events"""
@@ -235,7 +267,7 @@ class ObservabilityManager:
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        logger.warning(f"Circuit breaker event: {json.dumps(log_data)}")
+        self._log(None, logging.WARNING, "Circuit breaker event", log_data)
     
     @asynccontextmanager
     async def trace_request(self, context: RequestContext):
@@ -301,9 +333,11 @@ class ObservabilityManager:
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics for monitoring"""
+        from app.token_cache import token_cache
+        
         # This would integrate with Prometheus or similar
         # For now, return basic metrics structure
-        return {
+        metrics = {
             "gateway_requests_total": 0,  # Would be from counter
             "gateway_requests_duration_seconds": 0.0,  # Would be from histogram
             "gateway_requests_failed_total": 0,  # Would be from counter
@@ -315,6 +349,10 @@ class ObservabilityManager:
             "gateway_health_checks_total": 0,  # Would be from counter
             "gateway_health_checks_failed_total": 0,  # Would be from counter
         }
+        
+        # Verified-JWT cache hit/miss counters
+        metrics.update(token_cache.get_metrics())
+        return metrics
 
 # Global observability manager instance
 observability_manager = ObservabilityManager() 
\ No newline at end of file
@@ -0,0 +1,57 @@
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class _TrieNode:
+    """Single path segment in the prefix trie"""
+    __slots__ = ("children", "match")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.match: Optional[Tuple[str, Any]] = None
+
+def _split_path(path: str) -> list:
+    """Split a path into its non-empty segments"""
+    return [segment for segment in path.split("/") if segment]
+
+class PrefixRouter:
+    """
+    Compiled prefix trie over service base paths.
+
+    Lookups walk one trie node per path segment and return the service with the
+    longest matching base_path, so the cost depends on the depth of the request
+    path rather than the number of services in the catalog.
+    """
+
+    def __init__(self, services: Dict[str, Any]):
+        self._root = _TrieNode()
+        self.size = 0
+        for service_key, config in services.items():
+            self._insert(service_key, config)
+
+    def _insert(self, service_key: str, config: Any):
+        """Add a service under its base_path"""
+        node = self._root
+        for segment in _split_path(config.base_path):
+            node = node.children.setdefault(segment, _TrieNode())
+
+        if node.match is not None:
+            # Keep catalog order semantics: the first service registered for a base_path wins
+            logger.warning(f"Duplicate base_path {config.base_path} for {service_key}, keeping {node.match[0]}")
+            return
+
+        node.match = (service_key, config)
+        self.size += 1
+
+    def match(self, path: str) -> Optional[Tuple[str, Any]]:
+        """Return (service_key, config) for the longest base_path prefix of path"""
+        node = self._root
+        best = node.match
+        for segment in _split_path(path):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.match is not None:
+                best = node.match
+        return best
@@ -0,0 +1,178 @@
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    retry_after_seconds: float = 0.0
+
+class InMemoryRateLimitBackend:
+    """
+    Single-process GCRA (token bucket) limiter.
+
+    Each key stores only its theoretical arrival time, so memory is constant per
+    key and every check is O(1). Keys whose bucket has refilled are swept periodically.
+    """
+
+    def __init__(self, sweep_interval_seconds: float = 60.0):
+        self._tat: Dict[str, float] = {}
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._last_sweep = time.monotonic()
+
+    async def acquire(self, key: str, requests_per_minute: int, burst: int) -> RateLimitDecision:
+        """Consume one token for key, or report how long until one is available"""
+        now = time.monotonic()
+        self._maybe_sweep(now)
+
+        emission_interval = 60.0 / requests_per_minute
+        tat = max(self._tat.get(key, now), now)
+        new_tat = tat + emission_interval
+        allow_at = new_tat - burst * emission_interval
+
+        if now < allow_at:
+            return RateLimitDecision(allowed=False, retry_after_seconds=allow_at - now)
+
+        self._tat[key] = new_tat
+        return RateLimitDecision(allowed=True)
+
+    def _maybe_sweep(self, now: float):
+        """Evict keys whose bucket is full again; they carry no state worth keeping"""
+        if now - self._last_sweep < self.sweep_interval_seconds:
+            return
+
+        self._last_sweep = now
+        stale = [key for key, tat in self._tat.items() if tat <= now]
+        for key in stale:
+            del self._tat[key]
+
+        if stale:
+            logger.debug(f"Evicted {len(stale)} idle rate limit keys")
+
+    def reset(self):
+        """Drop all limiter state"""
+        self._tat.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"backend": "memory", "tracked_keys": len(self._tat)}
+
+# GCRA in a single atomic step. Redis server time keeps replicas consistent, and the
+# key expires exactly when its bucket has refilled, so idle keys evict themselves.
+GCRA_LUA_SCRIPT = """
+local emission_interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+local new_tat = tat + emission_interval
+local allow_at = new_tat - burst * emission_interval
+if now < allow_at then
+    return {0, allow_at - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, 0}
+"""
+
+class RedisRateLimitBackend:
+    """
+    GCRA limiter shared by all gateway replicas through Redis.
+
+    Falls back to the in-process backend if Redis is unreachable so the gateway
+    keeps enforcing per-replica limits instead of failing requests.
+    """
+
+    def __init__(self, redis_url: str, key_prefix: str = "gateway:ratelimit:"):
+        import redis.asyncio as aioredis
+
+        self.key_prefix = key_prefix
+        self._client = aioredis.from_url(redis_url)
+        self._script = self._client.register_script(GCRA_LUA_SCRIPT)
+        self._fallback = InMemoryRateLimitBackend()
+        self.fallback_count = 0
+
+    async def acquire(self, key: str, requests_per_minute: int, burst: int) -> RateLimitDecision:
+        emission_interval_ms = 60000.0 / requests_per_minute
+        try:
+            allowed, retry_after_ms = await self._script(
+                keys=[f"{self.key_prefix}{key}"],
+                args=[emission_interval_ms, burst]
+            )
+        except Exception as e:
+            self.fallback_count += 1
+            logger.warning(f"Redis rate limiter unavailable, using in-process limits: {e}")
+            return await self._fallback.acquire(key, requests_per_minute, burst)
+
+        return RateLimitDecision(allowed=bool(allowed), retry_after_seconds=float(retry_after_ms) / 1000.0)
+
+    def reset(self):
+        self._fallback.reset()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"backend": "redis", "fallback_total": self.fallback_count}
+
+class RateLimiter:
+    """Per-service, per-user rate limiting driven by ServiceConfig.rate_limit"""
+
+    def __init__(self, backend=None, default_limit_per_minute: int = 100):
+        self.backend = backend or InMemoryRateLimitBackend()
+        self.default_limit_per_minute = default_limit_per_minute
+        self.rejected_count = 0
+
+    async def check(self, service_key: str, user_id: str, rate_limit: Dict[str, int]) -> RateLimitDecision:
+        """
+        Check a request against the service's limit.
+
+        Args:
+            service_key: Service identifier
+            user_id: Caller identifier
+            rate_limit: Catalog rate_limit section (requests_per_minute, optional burst)
+
+        Returns:
+            Decision with the wait time when the request is rejected
+        """
+        requests_per_minute = rate_limit.get("requests_per_minute", self.default_limit_per_minute)
+        burst = rate_limit.get("burst", requests_per_minute)
+
+        decision = await self.backend.acquire(f"{service_key}:{user_id}", requests_per_minute, burst)
+        if not decision.allowed:
+            self.rejected_count += 1
+        return decision
+
+    def retry_after_header(self, decision: RateLimitDecision) -> str:
+        """Retry-After value in whole seconds"""
+        return str(max(1, math.ceil(decision.retry_after_seconds)))
+
+    def reset(self):
+        self.backend.reset()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = {"gateway_rate_limited_total": self.rejected_count}
+        metrics.update(self.backend.get_metrics())
+        return metrics
+
+def create_rate_limiter() -> RateLimiter:
+    """Build the limiter from RATE_LIMIT_BACKEND ("memory" or "redis") and REDIS_URL"""
+    backend_name = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+    redis_url = os.getenv("REDIS_URL")
+
+    if backend_name == "redis":
+        if not redis_url:
+            logger.warning("RATE_LIMIT_BACKEND=redis but REDIS_URL is not set, using in-process limits")
+        else:
+            try:
+                return RateLimiter(RedisRateLimitBackend(redis_url))
+            except ImportError:
+                logger.warning("redis not available, using in-process rate limits")
+
+    return RateLimiter(InMemoryRateLimitBackend())
+
+# Global rate limiter instance
+rate_limiter = create_rate_limiter()
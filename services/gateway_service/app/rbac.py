@@ -1,5 +1,7 @@
 import logging
-from typing import Dict, List, Optional, Set
+import os
+import random
+from typing import Dict, List, Optional, Set, Tuple, Any
 from enum import Enum
 from dataclasses import dataclass
 
@@ -132,6 +134,24 @@ class Permission(Enum):
     AUDIT_LOG_UPDATE = "audit_log:update"
     AUDIT_LOG_DELETE = "audit_log:delete"
 
+# HTTP method to permission action; unlisted methods need read access
+METHOD_ACTIONS = {
+    "GET": "read",
+    "HEAD": "read",
+    "OPTIONS": "read",
+    "POST": "create",
+    "PUT": "update",
+    "PATCH": "update",
+    "DELETE": "delete"
+}
+
+# Share of allowed RBAC decisions that are logged; denials are always logged
+RBAC_LOG_SAMPLE_RATE = float(os.getenv("RBAC_LOG_SAMPLE_RATE", "0.01"))
+
+def service_resource(service_key: str) -> str:
+    """Permission resource guarding a service: the service key without underscores"""
+    return service_key.replace("_", "")
+
 @dataclass
 class RBACContext:
     user_id: str
@@ -142,8 +162,12 @@ class RBACContext:
 class RBACValidator:
     """Non-intrusive RBAC validation without payload inspection"""
     
-    def __init__(self):
+    def __init__(self, log_sample_rate: float = RBAC_LOG_SAMPLE_RATE):
         self._role_permissions = self._initialize_role_permissions()
+        self._role_names = frozenset(role.value for role in Role)
+        self._permission_values = frozenset(permission.value for permission in Permission)
+        self._decisions: Dict[Tuple[str, str, str], bool] = {}
+        self.log_sample_rate = log_sample_rate
     
     def _initialize_role_permissions(self) -> Dict[Role, Set[Permission]]:
         """Initialize role-based permission mappings"""
@@ -298,6 +322,54 @@ class RBACValidator:
             logger.warning(f"Unknown permission: {permission_name}")
             return False
     
+    def compile_decision_table(self, services: Dict[str, Any]):
+        """
+        Precompute every (role, service_key, method) decision for the catalog.
+
+        Replaces the table wholesale so a catalog reload never mixes old and new entries.
+        """
+        decisions: Dict[Tuple[str, str, str], bool] = {}
+        for service_key in services:
+            decisions.update(self._compile_service(service_key, service_resource(service_key)))
+
+        self._decisions = decisions
+        logger.info(f"Compiled {len(decisions)} RBAC decisions for {len(services)} services")
+
+    def _compile_service(self, service_key: str, resource: str) -> Dict[Tuple[str, str, str], bool]:
+        decisions = {}
+        for role, permissions in self._role_permissions.items():
+            granted = {permission.value for permission in permissions}
+            for method, action in METHOD_ACTIONS.items():
+                decisions[(role.value, service_key, method)] = f"{resource}:{action}" in granted
+        return decisions
+
+    def is_allowed(self, role: str, service_key: str, method: str) -> bool:
+        """
+        Decide a request with a single table probe.
+
+        Unknown roles are treated as Viewer and unknown methods as reads. Services
+        missing from the compiled table are compiled on first use.
+        """
+        decision = self._decisions.get((role, service_key, method))
+        if decision is not None:
+            return decision
+
+        if role not in self._role_names:
+            role = Role.VIEWER.value
+        if method not in METHOD_ACTIONS:
+            method = "GET"
+        key = (role, service_key, method)
+        if key not in self._decisions:
+            resource = service_resource(service_key)
+            if f"{resource}:read" not in self._permission_values:
+                logger.warning(f"No RBAC permissions defined for {service_key} (resource {resource}), denying access")
+            self._decisions.update(self._compile_service(service_key, resource))
+        return self._decisions[key]
+
+    def should_log_decision(self, allowed: bool) -> bool:
+        """Log every denial but only a sample of grants"""
+        return not allowed or random.random() < self.log_sample_rate
+
     def log_access_attempt(self, context: RBACContext, service: str, method: str, path: str, allowed: bool):
         """Log access attempt for audit purposes"""
         log_data = {
@@ -0,0 +1,263 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, Awaitable, Callable
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+# Defaults applied when a cacheable service has no "cache" section
+DEFAULT_TTL_SECONDS = 30
+DEFAULT_STALE_WHILE_REVALIDATE_SECONDS = 30
+
+# Response headers that describe the transfer rather than the cached representation
+UNCACHEABLE_HEADERS = {"content-length", "transfer-encoding", "connection", "keep-alive", "date", "set-cookie"}
+
+# Request headers that select a representation; they are part of every key
+CACHE_VARY_HEADERS = ("accept", "accept-encoding", "accept-language")
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float
+    fresh_until: float
+    stale_until: float
+    expires_at: float
+    etag: Optional[str] = None
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+    def is_servable_stale(self, now: float) -> bool:
+        # Past stale_until the entry is only kept as a validator for If-None-Match
+        return self.fresh_until <= now < self.stale_until
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["body"] = base64.b64encode(self.body).decode()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "CachedResponse":
+        data = json.loads(raw)
+        data["body"] = base64.b64decode(data["body"])
+        return cls(**data)
+
+def build_cache_key(
+    tenant_id: str,
+    role: str,
+    path: str,
+    query_items,
+    user_id: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    Tenant- and role-scoped key for a GET request.
+
+    The path is normalized (duplicate and trailing slashes removed) and query
+    parameters are sorted so equivalent URLs share one entry. Services scoped
+    per user pass the user id, and the representation-selecting request
+    headers in CACHE_VARY_HEADERS are always part of the key.
+    """
+    segments = [segment for segment in path.split("/") if segment]
+    normalized_path = "/" + "/".join(segments)
+    query = urlencode(sorted(query_items))
+    headers = headers or {}
+    vary = "|".join(headers.get(name, "") for name in CACHE_VARY_HEADERS)
+    raw_key = f"{tenant_id}|{role}|{user_id or ''}|{normalized_path}?{query}|{vary}"
+    return hashlib.sha256(raw_key.encode()).hexdigest()
+
+def build_entry(status_code: int, headers: Dict[str, str], body: bytes, policy: Dict[str, float], now: float) -> CachedResponse:
+    """Create a cache entry with freshness windows from the service's policy"""
+    fresh_until = now + policy["ttl_seconds"]
+    stale_until = fresh_until + policy["stale_while_revalidate_seconds"]
+    stored_headers = {
+        name: value for name, value in headers.items()
+        if name.lower() not in UNCACHEABLE_HEADERS
+    }
+    etag = next((value for name, value in headers.items() if name.lower() == "etag"), None)
+
+    return CachedResponse(
+        status_code=status_code,
+        headers=stored_headers,
+        body=body,
+        stored_at=now,
+        fresh_until=fresh_until,
+        stale_until=stale_until,
+        # Keep validators around a little longer so expired entries can be revalidated with a 304
+        expires_at=stale_until + policy["ttl_seconds"],
+        etag=etag
+    )
+
+def is_storable(status_code: int, headers: Dict[str, str]) -> bool:
+    """
+    Only cache successful responses the upstream has not marked private.
+
+    Responses that Vary on anything outside CACHE_VARY_HEADERS are skipped,
+    since the key cannot tell their representations apart.
+    """
+    if status_code != 200:
+        return False
+    cache_control = next((value for name, value in headers.items() if name.lower() == "cache-control"), "")
+    directives = {directive.strip().lower() for directive in cache_control.split(",")}
+    if directives & {"no-store", "private"}:
+        return False
+    vary = next((value for name, value in headers.items() if name.lower() == "vary"), "")
+    varied_on = {name.strip().lower() for name in vary.split(",") if name.strip()}
+    return varied_on <= set(CACHE_VARY_HEADERS)
+
+def cache_policy(config: Any) -> Dict[str, float]:
+    """Resolve TTL and stale-while-revalidate windows for a service"""
+    cache_config = getattr(config, "cache", None) or {}
+    return {
+        "ttl_seconds": cache_config.get("ttl_seconds", DEFAULT_TTL_SECONDS),
+        "stale_while_revalidate_seconds": cache_config.get(
+            "stale_while_revalidate_seconds", DEFAULT_STALE_WHILE_REVALIDATE_SECONDS
+        )
+    }
+
+class ResponseCache:
+    """
+    Two-tier response cache for idempotent GETs to cacheable services.
+
+    The memory tier is an LRU bounded by total body bytes. An optional Redis tier
+    shares entries across gateway replicas; memory misses fall through to it.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_entry_bytes: int = 1024 * 1024, redis_url: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._size_bytes = 0
+        self._redis = None
+        self._revalidating: set = set()
+        self._background_tasks: set = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.stores = 0
+        self.evictions = 0
+
+        if redis_url:
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(redis_url)
+            except ImportError:
+                logger.warning("redis not available, response cache Redis tier disabled")
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """Look up an entry in memory, then Redis"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at <= time.time():
+                self._remove(key)
+                entry = None
+            else:
+                self._entries.move_to_end(key)
+                return entry
+
+        if self._redis is None:
+            return None
+
+        try:
+            raw = await self._redis.get(f"gateway:response_cache:{key}")
+        except Exception as e:
+            logger.warning(f"Response cache Redis lookup failed: {e}")
+            return None
+
+        if raw is None:
+            return None
+
+        entry = CachedResponse.from_json(raw)
+        self._store_memory(key, entry)
+        return entry
+
+    async def set(self, key: str, entry: CachedResponse):
+        """Store an entry in every tier"""
+        if len(entry.body) > self.max_entry_bytes:
+            return
+
+        self._store_memory(key, entry)
+        self.stores += 1
+
+        if self._redis is None:
+            return
+
+        ttl_ms = int((entry.expires_at - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        try:
+            await self._redis.set(f"gateway:response_cache:{key}", entry.to_json(), px=ttl_ms)
+        except Exception as e:
+            logger.warning(f"Response cache Redis store failed: {e}")
+
+    def _store_memory(self, key: str, entry: CachedResponse):
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = entry
+        self._size_bytes += len(entry.body)
+        while self._size_bytes > self.max_bytes and self._entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size_bytes -= len(entry.body)
+
+    def revalidate_in_background(self, key: str, revalidate: Callable[[], Awaitable[None]]):
+        """Refresh a stale entry off the request path, at most once per key at a time"""
+        if key in self._revalidating:
+            return
+
+        self._revalidating.add(key)
+
+        async def run():
+            try:
+                await revalidate()
+            except Exception as e:
+                logger.warning(f"Background revalidation failed: {e}")
+            finally:
+                self._revalidating.discard(key)
+
+        task = asyncio.create_task(run())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def clear(self):
+        self._entries.clear()
+        self._size_bytes = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache counters for monitoring"""
+        return {
+            "gateway_response_cache_hits_total": self.hits,
+            "gateway_response_cache_stale_hits_total": self.stale_hits,
+            "gateway_response_cache_misses_total": self.misses,
+            "gateway_response_cache_revalidations_total": self.revalidations,
+            "gateway_response_cache_not_modified_total": self.not_modified,
+            "gateway_response_cache_stores_total": self.stores,
+            "gateway_response_cache_evictions_total": self.evictions,
+            "gateway_response_cache_entries": len(self._entries),
+            "gateway_response_cache_bytes": self._size_bytes,
+            "redis_tier_enabled": self._redis is not None
+        }
+
+# Global response cache instance
+response_cache = ResponseCache(
+    max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    max_entry_bytes=int(os.getenv("RESPONSE_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024))),
+    redis_url=os.getenv("RESPONSE_CACHE_REDIS_URL")
+)
@@ -0,0 +1,134 @@
+import logging
+import time
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Remaining time budget in milliseconds, sent to upstreams and honoured when a caller sends it
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+
+# Methods that can be replayed safely (RFC 9110 section 9.2.2)
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"])
+
+# Lets callers make POST/PATCH retryable by promising the upstream deduplicates them
+IDEMPOTENCY_KEY_HEADER = "idempotency-key"
+
+# Defaults, overridable per service in retry_policy
+DEFAULT_BUDGET_RATIO = 0.2
+DEFAULT_MIN_RETRIES_PER_SECOND = 1.0
+
+def request_deadline(request: Any, config: Any) -> float:
+    """
+    Absolute deadline (epoch seconds) for a proxied request.
+
+    Defaults to the service's retry_policy.deadline_ms, or timeout_ms, from when
+    the request is first seen; a caller's X-Request-Deadline-Ms can only tighten
+    it. Cached on request.state so every proxy path shares one deadline.
+    """
+    deadline = getattr(request.state, "deadline", None)
+    if deadline is not None:
+        return deadline
+
+    now = time.time()
+    budget_ms = config.retry_policy.get("deadline_ms", config.timeout_ms)
+    deadline = now + budget_ms / 1000.0
+
+    incoming = request.headers.get(DEADLINE_HEADER)
+    if incoming:
+        try:
+            deadline = min(deadline, now + max(0.0, float(incoming)) / 1000.0)
+        except ValueError:
+            logger.debug(f"Ignoring malformed {DEADLINE_HEADER} header: {incoming}")
+
+    request.state.deadline = deadline
+    return deadline
+
+def is_retry_safe(request: Any) -> bool:
+    """Whether a failed attempt may be replayed"""
+    return request.method in IDEMPOTENT_METHODS or IDEMPOTENCY_KEY_HEADER in request.headers
+
+class RetryBudget:
+    """
+    Caps retries at a share of a service's traffic.
+
+    Every original request deposits budget_ratio tokens and every retry spends
+    one, so retries stay below that share of requests; a small time-based
+    allowance keeps low-traffic services able to retry at all. During an
+    incident the bucket empties and the gateway stops amplifying load.
+    """
+
+    def __init__(self, budget_ratio: float = DEFAULT_BUDGET_RATIO, min_retries_per_second: float = DEFAULT_MIN_RETRIES_PER_SECOND):
+        self.budget_ratio = budget_ratio
+        self.min_retries_per_second = min_retries_per_second
+        # Bucket holds at most ten seconds' worth of the minimum allowance, and never less than one retry
+        self.capacity = max(1.0, min_retries_per_second * 10)
+        self.tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self.requests = 0
+        self.retries = 0
+        self.exhausted = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last_refill) * self.min_retries_per_second)
+        self._last_refill = now
+
+    def record_request(self):
+        """Count an original (non-retry) request"""
+        self.requests += 1
+        self.tokens = min(self.capacity, self.tokens + self.budget_ratio)
+
+    def try_acquire(self) -> bool:
+        """Spend budget for one retry, if any is left"""
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            self.retries += 1
+            return True
+        self.exhausted += 1
+        return False
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "requests_total": self.requests,
+            "retries_total": self.retries,
+            "budget_exhausted_total": self.exhausted,
+            "tokens": round(self.tokens, 2)
+        }
+
+class RetryBudgets:
+    """Per-service retry budgets, created lazily from each service's retry_policy"""
+
+    def __init__(self):
+        self._budgets: Dict[str, RetryBudget] = {}
+
+    def get(self, service_key: str, retry_policy: Dict[str, Any]) -> RetryBudget:
+        budget = self._budgets.get(service_key)
+        if budget is None:
+            budget = RetryBudget(
+                budget_ratio=retry_policy.get("budget_ratio", DEFAULT_BUDGET_RATIO),
+                min_retries_per_second=retry_policy.get("min_retries_per_second", DEFAULT_MIN_RETRIES_PER_SECOND)
+            )
+            self._budgets[service_key] = budget
+        return budget
+
+    def reset(self):
+        self._budgets.clear()
+
+    def prune(self, services: Dict[str, Any]):
+        """Drop budgets of removed or retuned services after a catalog reload"""
+        for service_key, budget in list(self._budgets.items()):
+            config = services.get(service_key)
+            if (
+                config is None
+                or budget.budget_ratio != config.retry_policy.get("budget_ratio", DEFAULT_BUDGET_RATIO)
+                or budget.min_retries_per_second != config.retry_policy.get("min_retries_per_second", DEFAULT_MIN_RETRIES_PER_SECOND)
+            ):
+                del self._budgets[service_key]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get retry counters per service for monitoring"""
+        return {service_key: budget.get_metrics() for service_key, budget in self._budgets.items()}
+
+# Global retry budget registry
+retry_budgets = RetryBudgets()
@@ -4,6 +4,9 @@ from app.service_registry import service_registry
 
 logger = logging.getLogger(__name__)
 
+# Marker for requests whose service has not been resolved yet
+_UNRESOLVED = object()
+
 def resolve_service(path: str) -> Optional[str]:
     """
     Resolve service URL using service registry with health checks.
@@ -42,6 +45,25 @@ def get_service_config(path: str) -> Optional[Tuple[str, any]]:
     """
     return service_registry.get_service_by_path(path)
 
+def resolve_request_service(request) -> Optional[Tuple[str, any]]:
+    """
+    Resolve the target service for a request once and cache it on request.state.
+    
+    Every middleware stage and the proxy handler share the cached result, so the
+    path is routed a single time per request.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        Tuple of (service_key, config) if found, None otherwise
+    """
+    service_info = getattr(request.state, "service_info", _UNRESOLVED)
+    if service_info is _UNRESOLVED:
+        service_info = get_service_config(request.url.path)
+        request.state.service_info = service_info
+    return service_info
+
 def is_service_healthy(service_key: str) -> bool:
     """
     Check if service is healthy.
@@ -1,14 +1,22 @@
 import json
+import os
 import asyncio
 import httpx
 import logging
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
+from app.circuit_breaker import ServiceCircuit, CircuitState, DEFAULT_CIRCUIT_SETTINGS
+from app.metrics import gateway_metrics
+from app.load_balancer import LoadBalancer, UpstreamInstance, PEAK_EWMA, parse_instances
+from app.path_router import PrefixRouter
+
 logger = logging.getLogger(__name__)
 
+HEALTH_CHECK_TIMEOUT_SECONDS = 5.0
+
 class ServiceStatus(Enum):
     HEALTHY = "healthy"
     UNHEALTHY = "unhealthy"
@@ -27,6 +35,14 @@ class ServiceConfig:
     retry_policy: Dict[str, Any]
     rbac_required: bool
     rate_limit: Dict[str, int]
+    connection_pool: Dict[str, Any] = field(default_factory=dict)
+    streaming: bool = False
+    compression: bool = True
+    bulkhead: Dict[str, Any] = field(default_factory=dict)
+    cache: Dict[str, Any] = field(default_factory=dict)
+    hedging: Dict[str, Any] = field(default_factory=dict)
+    instances: List[Dict[str, Any]] = field(default_factory=list)
+    load_balancer: str = PEAK_EWMA
 
 @dataclass
 class ServiceHealth:
@@ -36,6 +52,13 @@ class ServiceHealth:
     error_message: Optional[str] = None
     consecutive_failures: int = 0
 
+@dataclass
+class CatalogSnapshot:
+    """A parsed catalog waiting to be swapped into the registry"""
+    settings: Dict[str, Any]
+    services: Dict[str, ServiceConfig]
+    probed_health: Dict[str, ServiceHealth] = field(default_factory=dict)
+
 class ServiceRegistry:
     """Dynamic service registry with health monitoring and circuit breaker logic"""
     
@@ -43,65 +66,192 @@ class ServiceRegistry:
         self.catalog_path = catalog_path
         self.services: Dict[str, ServiceConfig] = {}
         self.health_status: Dict[str, ServiceHealth] = {}
+        self.router = PrefixRouter({})
+        self.circuits: Dict[str, ServiceCircuit] = {}
+        self.balancers: Dict[str, LoadBalancer] = {}
+        self.passive_circuit_settings: Dict[str, Any] = {}
         self.circuit_breaker_threshold = 5
         self.circuit_breaker_timeout = 30  # seconds
         self.health_check_interval = 60  # seconds
+        self.health_probe_settings: Dict[str, Any] = {}
+        # Shared probe client while the health monitor runs; probes open their own otherwise
+        self.health_client: Optional[httpx.AsyncClient] = None
+        self._catalog_stamp: Optional[tuple] = None
         self._load_catalog()
-        self._start_health_monitoring()
     
     def _load_catalog(self):
         """Load service catalog from JSON file"""
         try:
-            with open(self.catalog_path, 'r') as f:
-                catalog = json.load(f)
-            
-            # Load gateway config
-            gateway_config = catalog.get("gateway_config", {})
-            self.circuit_breaker_threshold = gateway_config.get("circuit_breaker_threshold", 5)
-            self.circuit_breaker_timeout = gateway_config.get("circuit_breaker_timeout_seconds", 30)
-            self.health_check_interval = gateway_config.get("health_check_interval_seconds", 60)
-            
-            # Load services
-            for service_key, service_data in catalog.get("services", {}).items():
-                config = ServiceConfig(
-                    service_name=service_data["service_name"],
-                    base_path=service_data["base_path"],
-                    internal_url=service_data["internal_url"],
-                    healthcheck_endpoint=service_data["healthcheck_endpoint"],
-                    timeout_ms=service_data["timeout_ms"],
-                    tenant_scope=service_data["tenant_scope"],
-                    cacheable=service_data["cacheable"],
-                    retry_policy=service_data["retry_policy"],
-                    rbac_required=service_data["rbac_required"],
-                    rate_limit=service_data["rate_limit"]
-                )
-                self.services[service_key] = config
-                
-                # Initialize health status
-                self.health_status[service_key] = ServiceHealth(
-                    status=ServiceStatus.UNKNOWN,
-                    last_check=datetime.utcnow()
-                )
-            
+            snapshot = self.read_catalog()
+            self.apply_catalog(snapshot)
             logger.info(f"Loaded {len(self.services)} services from catalog")
             
         except Exception as e:
             logger.error(f"Failed to load service catalog: {e}")
             raise
     
+    def read_catalog(self) -> "CatalogSnapshot":
+        """Parse the catalog file into service configs without touching live state"""
+        self._catalog_stamp = self._file_stamp()
+        with open(self.catalog_path, 'r') as f:
+            catalog = json.load(f)
+        
+        # Load gateway config
+        gateway_config = catalog.get("gateway_config", {})
+        circuit_breaker_timeout = gateway_config.get("circuit_breaker_timeout_seconds", 30)
+        settings = {
+            "circuit_breaker_threshold": gateway_config.get("circuit_breaker_threshold", 5),
+            "circuit_breaker_timeout": circuit_breaker_timeout,
+            "health_check_interval": gateway_config.get("health_check_interval_seconds", 60),
+            "health_probe_settings": gateway_config.get("health_probing", {}),
+            "passive_circuit_settings": gateway_config.get(
+                "passive_circuit_breaker", {"open_seconds": circuit_breaker_timeout}
+            )
+        }
+        
+        # Load services
+        services = {}
+        for service_key, service_data in catalog.get("services", {}).items():
+            services[service_key] = ServiceConfig(
+                service_name=service_data["service_name"],
+                base_path=service_data["base_path"],
+                internal_url=service_data["internal_url"],
+                healthcheck_endpoint=service_data["healthcheck_endpoint"],
+                timeout_ms=service_data["timeout_ms"],
+                tenant_scope=service_data["tenant_scope"],
+                cacheable=service_data["cacheable"],
+                retry_policy=service_data["retry_policy"],
+                rbac_required=service_data["rbac_required"],
+                rate_limit=service_data["rate_limit"],
+                connection_pool=service_data.get("connection_pool", {}),
+                streaming=service_data.get("streaming", False),
+                compression=service_data.get("compression", True),
+                bulkhead={**gateway_config.get("bulkhead", {}), **service_data.get("bulkhead", {})},
+                cache=service_data.get("cache", {}),
+                hedging=service_data.get("hedging", {}),
+                instances=parse_instances(service_data),
+                load_balancer=service_data.get("load_balancer", gateway_config.get("load_balancer", PEAK_EWMA))
+            )
+        
+        return CatalogSnapshot(settings=settings, services=services)
+    
+    def _file_stamp(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.catalog_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def catalog_changed_on_disk(self) -> bool:
+        """Whether the catalog file changed since it was last read"""
+        return self._file_stamp() != self._catalog_stamp
+    
+    async def prepare_catalog(self) -> "CatalogSnapshot":
+        """
+        Read the catalog off the event loop and probe services whose endpoints are new.
+        
+        Nothing live changes here; apply_catalog swaps the result in.
+        """
+        snapshot = await asyncio.to_thread(self.read_catalog)
+        probe_keys = [
+            service_key for service_key, config in snapshot.services.items()
+            if not self._same_endpoints(self.services.get(service_key), config)
+        ]
+        results = await asyncio.gather(*(
+            asyncio.gather(*(
+                self.check_instance_health(instance["url"], snapshot.services[service_key])
+                for instance in snapshot.services[service_key].instances
+            ))
+            for service_key in probe_keys
+        ))
+        for service_key, instance_results in zip(probe_keys, results):
+            healthy = [health for health in instance_results if health.status == ServiceStatus.HEALTHY]
+            snapshot.probed_health[service_key] = healthy[0] if healthy else instance_results[0]
+        return snapshot
+    
+    @staticmethod
+    def _same_endpoints(old: Optional[ServiceConfig], new: ServiceConfig) -> bool:
+        return (
+            old is not None
+            and old.internal_url == new.internal_url
+            and old.instances == new.instances
+            and old.healthcheck_endpoint == new.healthcheck_endpoint
+        )
+    
+    def apply_catalog(self, snapshot: "CatalogSnapshot") -> Dict[str, List[str]]:
+        """
+        Swap a parsed catalog in.
+        
+        Runs without awaiting, so every request sees either the old or the new
+        catalog, never a mix. Requests already past routing keep the config they
+        resolved. Services whose endpoints did not change keep their health,
+        passive circuit and balancer state; removed instances are drained.
+        """
+        services = snapshot.services
+        settings = snapshot.settings
+        health_status: Dict[str, ServiceHealth] = {}
+        circuits: Dict[str, ServiceCircuit] = {}
+        balancers: Dict[str, LoadBalancer] = {}
+        circuit_settings = {**DEFAULT_CIRCUIT_SETTINGS, **settings["passive_circuit_settings"]}
+        summary: Dict[str, List[str]] = {"added": [], "removed": [], "changed": [], "unchanged": []}
+        
+        for service_key, config in services.items():
+            old = self.services.get(service_key)
+            if old is None:
+                summary["added"].append(service_key)
+            else:
+                summary["unchanged" if old == config else "changed"].append(service_key)
+            
+            # Health and the passive circuit describe the endpoints, so they survive retuning
+            same_endpoints = self._same_endpoints(old, config)
+            health = self.health_status.get(service_key) if same_endpoints else None
+            health_status[service_key] = health or snapshot.probed_health.get(service_key) or ServiceHealth(
+                status=ServiceStatus.UNKNOWN,
+                last_check=datetime.utcnow()
+            )
+            
+            # Passive circuit fed by proxied traffic
+            circuit = self.circuits.get(service_key) if same_endpoints else None
+            if circuit is None or circuit.settings != circuit_settings:
+                circuit = ServiceCircuit(service_key, circuit_settings)
+            circuits[service_key] = circuit
+            
+            # Spread traffic over the service's instances
+            balancer = self.balancers.get(service_key)
+            if balancer is None or balancer.algorithm != config.load_balancer:
+                balancer = LoadBalancer(service_key, config.instances, config.load_balancer)
+            else:
+                balancer.update_instances(config.instances)
+            balancers[service_key] = balancer
+        
+        for service_key, balancer in self.balancers.items():
+            if service_key not in services:
+                summary["removed"].append(service_key)
+                balancer.update_instances([])
+        
+        self.circuit_breaker_threshold = settings["circuit_breaker_threshold"]
+        self.circuit_breaker_timeout = settings["circuit_breaker_timeout"]
+        self.health_check_interval = settings["health_check_interval"]
+        self.health_probe_settings = settings["health_probe_settings"]
+        self.passive_circuit_settings = settings["passive_circuit_settings"]
+        self.services = services
+        self.health_status = health_status
+        self.circuits = circuits
+        self.balancers = balancers
+        # Compile path routing once per catalog load
+        self.router = PrefixRouter(services)
+        return summary
+    
     def get_service_config(self, service_key: str) -> Optional[ServiceConfig]:
         """Get service configuration by key"""
         return self.services.get(service_key)
     
     def get_service_by_path(self, path: str) -> Optional[tuple[str, ServiceConfig]]:
-        """Get service configuration by request path"""
-        for service_key, config in self.services.items():
-            if path.startswith(config.base_path):
-                return service_key, config
-        return None
+        """Get service configuration by request path (longest base_path prefix wins)"""
+        return self.router.match(path)
     
     def is_service_healthy(self, service_key: str) -> bool:
-        """Check if service is healthy and circuit breaker is closed"""
+        """Check if service is healthy and both active and passive circuit breakers admit traffic"""
         health = self.health_status.get(service_key)
         if not health:
             return False
@@ -113,13 +263,63 @@ class ServiceRegistry:
                 # Reset circuit breaker
                 health.status = ServiceStatus.UNKNOWN
                 health.consecutive_failures = 0
-                return True
+                return self._circuit_allows(service_key)
+            return False
+        
+        if health.status != ServiceStatus.HEALTHY:
             return False
         
-        return health.status == ServiceStatus.HEALTHY
+        # Checked last: a half-open circuit counts this request as its probe
+        return self._circuit_allows(service_key)
+    
+    def _circuit_allows(self, service_key: str) -> bool:
+        circuit = self.circuits.get(service_key)
+        return circuit is None or circuit.allow_request()
+    
+    def record_outcome(self, service_key: str, success: bool, latency_ms: float):
+        """Feed the outcome of a proxied call into the service's passive circuit"""
+        circuit = self.circuits.get(service_key)
+        if circuit is not None:
+            was_open = circuit.state == CircuitState.OPEN
+            circuit.record(success, latency_ms)
+            if not was_open and circuit.state == CircuitState.OPEN:
+                gateway_metrics.circuit_opened(service_key, "passive")
+    
+    def get_latency_percentiles(self, service_key: str, min_samples: int = 20) -> Dict[str, float]:
+        """Rolling p50/p95/p99 latency of proxied calls, empty until enough calls were seen"""
+        circuit = self.circuits.get(service_key)
+        if circuit is None or circuit.sample_count < min_samples:
+            return {}
+        return circuit.latency_percentiles()
+    
+    def is_circuit_open(self, service_key: str) -> bool:
+        """Whether passive outlier detection has tripped the service's circuit"""
+        circuit = self.circuits.get(service_key)
+        return circuit is not None and circuit.state == CircuitState.OPEN
+    
+    def acquire_instance(self, service_key: str, exclude: Optional[set] = None) -> Optional[UpstreamInstance]:
+        """Pick the instance to send one request to; release it with release_instance"""
+        balancer = self.balancers.get(service_key)
+        instance = balancer.acquire(exclude) if balancer else None
+        if instance is not None:
+            gateway_metrics.upstream_started(service_key)
+        return instance
+    
+    def release_instance(self, service_key: str, instance: Optional[UpstreamInstance], success: Optional[bool], latency_ms: float):
+        """Return an instance acquired with acquire_instance"""
+        balancer = self.balancers.get(service_key)
+        if balancer is not None and instance is not None:
+            balancer.release(instance, success, latency_ms)
+            gateway_metrics.upstream_finished(service_key)
+    
+    def drain_instance(self, service_key: str, url: str):
+        """Stop routing new requests to one instance of a service"""
+        balancer = self.balancers.get(service_key)
+        if balancer is not None:
+            balancer.drain(url)
     
     async def check_service_health(self, service_key: str) -> ServiceHealth:
-        """Check health of a specific service"""
+        """Check health of every instance of a service; healthy if any instance is"""
         config = self.services.get(service_key)
         if not config:
             return ServiceHealth(
@@ -128,36 +328,56 @@ class ServiceRegistry:
                 error_message="Service not found in catalog"
             )
         
-        health_url = f"{config.internal_url}{config.healthcheck_endpoint}"
+        balancer = self.balancers.get(service_key)
+        urls = list(balancer.instances) if balancer else [config.internal_url]
+        results = await asyncio.gather(*(self.check_instance_health(url, config) for url in urls))
+        
+        if balancer is not None:
+            for url, health in zip(urls, results):
+                balancer.set_instance_health(url, health.status == ServiceStatus.HEALTHY)
+        
+        healthy = [health for health in results if health.status == ServiceStatus.HEALTHY]
+        if healthy:
+            return min(healthy, key=lambda health: health.response_time_ms or 0.0)
+        return results[0]
+    
+    async def check_instance_health(self, instance_url: str, config: ServiceConfig) -> ServiceHealth:
+        """Check health of a single service instance"""
+        if self.health_client is not None:
+            return await self._probe_instance(self.health_client, instance_url, config)
+        async with httpx.AsyncClient(timeout=HEALTH_CHECK_TIMEOUT_SECONDS) as client:
+            return await self._probe_instance(client, instance_url, config)
+    
+    async def _probe_instance(self, client: httpx.AsyncClient, instance_url: str, config: ServiceConfig) -> ServiceHealth:
+        health_url = f"{instance_url}{config.healthcheck_endpoint}"
         start_time = datetime.utcnow()
         
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(health_url)
-                response_time = (datetime.utcnow() - start_time).total_seconds() * 1000
-                
-                if response.status_code == 200:
-                    health_data = response.json()
-                    if health_data.get("status") == "healthy":
-                        return ServiceHealth(
-                            status=ServiceStatus.HEALTHY,
-                            last_check=datetime.utcnow(),
-                            response_time_ms=response_time
-                        )
-                    else:
-                        return ServiceHealth(
-                            status=ServiceStatus.UNHEALTHY,
-                            last_check=datetime.utcnow(),
-                            response_time_ms=response_time,
-                            error_message=f"Service reported unhealthy status: {health_data.get('status')}"
-                        )
+            response = await client.get(health_url, timeout=HEALTH_CHECK_TIMEOUT_SECONDS)
+            response_time = (datetime.utcnow() - start_time).total_seconds() * 1000
+            
+            if response.status_code == 200:
+                health_data = response.json()
+                if health_data.get("status") == "healthy":
+                    return ServiceHealth(
+                        status=ServiceStatus.HEALTHY,
+                        last_check=datetime.utcnow(),
+                        response_time_ms=response_time
+                    )
                 else:
                     return ServiceHealth(
                         status=ServiceStatus.UNHEALTHY,
                         last_check=datetime.utcnow(),
                         response_time_ms=response_time,
-                        error_message=f"Health check returned status code: {response.status_code}"
+                        error_message=f"Service reported unhealthy status: {health_data.get('status')}"
                     )
+            else:
+                return ServiceHealth(
+                    status=ServiceStatus.UNHEALTHY,
+                    last_check=datetime.utcnow(),
+                    response_time_ms=response_time,
+                    error_message=f"Health check returned status code: {response.status_code}"
+                )
         
         except Exception as e:
             return ServiceHealth(
@@ -178,6 +398,8 @@ class ServiceRegistry:
             else:
                 current_health.consecutive_failures += 1
                 if current_health.consecutive_failures >= self.circuit_breaker_threshold:
+                    if current_health.status != ServiceStatus.CIRCUIT_OPEN:
+                        gateway_metrics.circuit_opened(service_key, "active")
                     current_health.status = ServiceStatus.CIRCUIT_OPEN
                 else:
                     current_health.status = ServiceStatus.UNHEALTHY
@@ -185,33 +407,18 @@ class ServiceRegistry:
             current_health.last_check = health.last_check
             current_health.response_time_ms = health.response_time_ms
             current_health.error_message = health.error_message
-        else:
+        elif service_key in self.services:
             self.health_status[service_key] = health
     
     async def check_all_services_health(self):
         """Check health of all services concurrently"""
         tasks = []
-        for service_key in self.services.keys():
+        for service_key in list(self.services.keys()):
             tasks.append(self.update_service_health(service_key))
         
         await asyncio.gather(*tasks, return_exceptions=True)
         logger.info("Completed health check for all services")
     
-    def _start_health_monitoring(self):
-        """Start background health monitoring"""
-        async def health_monitor():
-            while True:
-                try:
-                    await self.check_all_services_health()
-                except Exception as e:
-                    logger.error(f"Health monitoring error: {e}")
-                
-                await asyncio.sleep(self.health_check_interval)
-        
-        # Start health monitoring in background
-        asyncio.create_task(health_monitor())
-        logger.info("Started health monitoring")
-    
     def get_health_summary(self) -> Dict[str, Any]:
         """Get health summary for all services"""
         summary = {
@@ -232,9 +439,17 @@ class ServiceRegistry:
                 "error_message": health.error_message
             }
             
+            circuit = self.circuits.get(service_key)
+            if circuit is not None:
+                service_summary["circuit"] = circuit.snapshot()
+            
+            balancer = self.balancers.get(service_key)
+            if balancer is not None:
+                service_summary["load_balancer"] = balancer.get_status()
+            
             summary["services"][service_key] = service_summary
             
-            if health.status == ServiceStatus.HEALTHY:
+            if health.status == ServiceStatus.HEALTHY and not self.is_circuit_open(service_key):
                 summary["healthy_count"] += 1
             else:
                 summary["unhealthy_count"] += 1
@@ -262,11 +477,11 @@ class ServiceRegistry:
         total_response_time = 0.0
         response_time_count = 0
         
-        for health in self.health_status.values():
-            if health.status == ServiceStatus.HEALTHY:
-                metrics["healthy_services"] += 1
-            elif health.status == ServiceStatus.CIRCUIT_OPEN:
+        for service_key, health in self.health_status.items():
+            if health.status == ServiceStatus.CIRCUIT_OPEN or self.is_circuit_open(service_key):
                 metrics["circuit_open_services"] += 1
+            elif health.status == ServiceStatus.HEALTHY:
+                metrics["healthy_services"] += 1
             else:
                 metrics["unhealthy_services"] += 1
             
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from typing import Dict, Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Only idempotent reads are safe to share between callers
+COALESCABLE_METHODS = frozenset(["GET", "HEAD"])
+
+# Request headers that can change the upstream response
+COALESCE_VARY_HEADERS = ("accept", "accept-encoding", "accept-language", "if-none-match", "if-modified-since", "range")
+
+def build_coalesce_key(request: Any, config: Any) -> str:
+    """
+    Key identifying requests that can share one upstream call.
+
+    Covers tenant, role, method, path, query and representation-affecting
+    headers. Services scoped per user also include the user id. Only
+    cacheable services are coalesced, so other users never share a response.
+    """
+    state = request.state
+    parts = [
+        getattr(state, "tenant_id", ""),
+        getattr(state, "role", ""),
+        request.method,
+        request.url.path,
+        request.url.query,
+    ]
+    if getattr(config, "tenant_scope", "") == "user":
+        parts.append(getattr(state, "user_id", ""))
+
+    headers = request.headers
+    parts.extend(headers.get(name, "") for name in COALESCE_VARY_HEADERS)
+    return "\x1f".join(str(part) for part in parts)
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one.
+
+    The first caller for a key starts the call in its own task; callers that
+    arrive while it is in flight await the same task. The task is shielded so a
+    disconnecting leader does not cancel the call for everyone else.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.leader_count = 0
+        self.saved_count = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn once per key among concurrent callers and return its result to all of them"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.leader_count += 1
+        else:
+            self.saved_count += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the outcome as retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get coalescing counters for monitoring"""
+        return {
+            "gateway_coalesced_leaders_total": self.leader_count,
+            "gateway_upstream_calls_saved_total": self.saved_count,
+            "gateway_coalesced_in_flight": len(self._calls)
+        }
+
+# Global single-flight instance
+single_flight = SingleFlight()
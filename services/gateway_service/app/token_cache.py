@@ -0,0 +1,154 @@
+import ast
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Channel auth_service publishes to on logout
+REVOCATION_CHANNEL = "auth.logout"
+
+def token_digest(token: str) -> bytes:
+    """Fixed-size cache key for a bearer token"""
+    return hashlib.sha256(token.encode()).digest()
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of verified JWT claims keyed by token digest.
+
+    Entries expire at the token's exp claim (or after max_ttl_seconds for tokens
+    without one) so a cache hit never outlives the signature check it replaces.
+    Revoked tokens are remembered until they would have expired anyway.
+    """
+
+    def __init__(self, max_size: int = 10000, max_ttl_seconds: float = 300.0):
+        self.max_size = max_size
+        self.max_ttl_seconds = max_ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._revoked: Dict[bytes, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expiry(self, payload: Dict[str, Any], now: float) -> float:
+        """Cache expiry for a payload: its exp claim, bounded by the max TTL"""
+        expires_at = now + self.max_ttl_seconds
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        return expires_at
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return cached claims for a token, or None on a miss"""
+        key = token_digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, token: str, payload: Dict[str, Any]):
+        """Cache verified claims for a token"""
+        now = time.time()
+        key = token_digest(token)
+        if key in self._revoked:
+            return
+
+        expires_at = self._expiry(payload, now)
+        if expires_at <= now:
+            return
+
+        self._entries[key] = (payload, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def revoke(self, token: str, expires_at: Optional[float] = None):
+        """Drop a token from the cache and reject it until it expires"""
+        now = time.time()
+        key = token_digest(token)
+        entry = self._entries.pop(key, None)
+        if expires_at is None:
+            expires_at = entry[1] if entry else now + self.max_ttl_seconds
+        self._revoked[key] = expires_at
+
+        # Forget revocations for tokens that have expired on their own
+        if len(self._revoked) > self.max_size:
+            self._revoked = {k: v for k, v in self._revoked.items() if v > now}
+
+    def is_revoked(self, token: str) -> bool:
+        """Check whether a token has been revoked"""
+        if not self._revoked:
+            return False
+
+        key = token_digest(token)
+        expires_at = self._revoked.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self._revoked[key]
+            return False
+        return True
+
+    def clear(self):
+        """Drop all cached entries and revocations"""
+        self._entries.clear()
+        self._revoked.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache counters for monitoring"""
+        return {
+            "gateway_jwt_cache_hits_total": self.hits,
+            "gateway_jwt_cache_misses_total": self.misses,
+            "gateway_jwt_cache_evictions_total": self.evictions,
+            "gateway_jwt_cache_size": len(self._entries),
+            "gateway_jwt_cache_revoked_size": len(self._revoked)
+        }
+
+    async def listen_for_revocations(self, redis_url: str):
+        """Revoke tokens as auth_service publishes logout events"""
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            logger.warning("redis not available, token revocation feed disabled")
+            return
+
+        client = aioredis.from_url(redis_url, decode_responses=True)
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(REVOCATION_CHANNEL)
+            logger.info(f"Listening for token revocations on {REVOCATION_CHANNEL}")
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    token = ast.literal_eval(message["data"]).get("token")
+                except (ValueError, SyntaxError, AttributeError):
+                    logger.warning("Ignoring malformed revocation event")
+                    continue
+                if token:
+                    self.revoke(token)
+        except Exception as e:
+            logger.error(f"Token revocation feed stopped: {e}")
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+# Global verified token cache instance
+token_cache = VerifiedTokenCache(
+    max_size=int(os.getenv("JWT_CACHE_MAX_SIZE", "10000")),
+    max_ttl_seconds=float(os.getenv("JWT_CACHE_MAX_TTL_SECONDS", "300"))
+)
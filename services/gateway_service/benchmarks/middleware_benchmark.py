@@ -0,0 +1,119 @@
+"""
+Before/after latency benchmark for the gateway middleware pipeline.
+
+"before" reproduces the previous layering: one BaseHTTPMiddleware per stage
+(logging, auth, RBAC, rate limit, identity forwarding). "after" is the single
+pure-ASGI GatewayPipelineMiddleware. Both run the same stage logic in-process
+against a trivial endpoint, so the difference is the per-layer overhead.
+
+Run from the gateway_service directory:
+    python -m benchmarks.middleware_benchmark
+"""
+import asyncio
+import logging
+import statistics
+import time
+
+REQUESTS = 3000
+WARMUP = 200
+
+def build_apps():
+    """Build the legacy-layered and pure-ASGI apps around the same endpoint"""
+    import jwt
+    from fastapi import FastAPI, HTTPException
+    from fastapi.responses import JSONResponse
+    from starlette.middleware import Middleware
+    from starlette.middleware.base import BaseHTTPMiddleware
+
+    from app import middleware as gateway_middleware
+    from app.middleware import GatewayPipelineMiddleware
+    from app.observability import observability_manager
+
+    # Stage logic is shared; only the layering differs
+    pipeline = GatewayPipelineMiddleware(app=None, default_limit_per_minute=10 ** 9)
+
+    class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            context = observability_manager.create_request_context(request.method, request.url.path)
+            request.state.observability_context = context
+            observability_manager.log_request_start(context)
+            response = await call_next(request)
+            observability_manager.log_request_end(context, response.status_code)
+            return response
+
+    class LegacyStageMiddleware(BaseHTTPMiddleware):
+        def __init__(self, app, stage):
+            super().__init__(app)
+            self.stage = stage
+
+        async def dispatch(self, request, call_next):
+            try:
+                await self.stage(request)
+            except HTTPException as e:
+                return JSONResponse({"detail": e.detail}, status_code=e.status_code)
+            return await call_next(request)
+
+    def endpoint_app(middleware):
+        app = FastAPI(middleware=middleware)
+
+        @app.get("/gateway/analytics/ping")
+        async def ping():
+            return {"ok": True}
+
+        return app
+
+    before = endpoint_app([
+        Middleware(LegacyLoggingMiddleware),
+        Middleware(LegacyStageMiddleware, stage=pipeline.authenticate),
+        Middleware(LegacyStageMiddleware, stage=pipeline.authorize),
+        Middleware(LegacyStageMiddleware, stage=pipeline.rate_limit),
+        Middleware(LegacyStageMiddleware, stage=pipeline.forward_identity),
+    ])
+    after = endpoint_app([Middleware(GatewayPipelineMiddleware, default_limit_per_minute=10 ** 9)])
+
+    payload = {"user_id": "bench-user", "tenant_id": "bench-tenant", "role": "Admin", "exp": time.time() + 3600}
+    token = jwt.encode(payload, gateway_middleware.SECRET_KEY, algorithm=gateway_middleware.ALGORITHM)
+    return before, after, {"Authorization": f"Bearer {token}"}
+
+async def measure(app, headers) -> dict:
+    """Issue sequential requests and collect per-request latency in microseconds"""
+    import httpx
+    from app.rate_limiter import rate_limiter
+
+    latencies = []
+    async with httpx.AsyncClient(app=app, base_url="http://gateway") as client:
+        for i in range(WARMUP + REQUESTS):
+            # Keep the synthetic user under its rate limit outside the timed region
+            rate_limiter.reset()
+            start = time.perf_counter()
+            response = await client.get("/gateway/analytics/ping", headers=headers)
+            elapsed = (time.perf_counter() - start) * 1e6
+            assert response.status_code == 200, response.text
+            if i >= WARMUP:
+                latencies.append(elapsed)
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "mean_us": statistics.fmean(latencies),
+        "p50_us": quantiles[49],
+        "p95_us": quantiles[94],
+        "p99_us": quantiles[98],
+    }
+
+async def main():
+    from unittest.mock import patch
+
+    logging.disable(logging.INFO)
+    before, after, headers = build_apps()
+
+    # Measure pipeline overhead only, not the RBAC outcome for the synthetic route
+    with patch("app.rbac.RBACValidator.is_allowed", return_value=True):
+        results = {"before (5x BaseHTTPMiddleware)": await measure(before, headers),
+                   "after (pure ASGI pipeline)": await measure(after, headers)}
+
+    print(f"{'stack':<34} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9}  (microseconds)")
+    for name, stats in results.items():
+        print(f"{name:<34} {stats['mean_us']:>9.0f} {stats['p50_us']:>9.0f} {stats['p95_us']:>9.0f} {stats['p99_us']:>9.0f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+"""
+Microbenchmark for per-request RBAC checks.
+
+Compares the previous path (build an RBACContext, derive the service name with
+string munging, look up the Permission enum and test set membership) against
+the precompiled (role, service_key, method) decision table.
+
+Run from the gateway_service directory:
+    python -m benchmarks.rbac_benchmark
+"""
+import logging
+import random
+import timeit
+
+from app.rbac import RBACValidator, Role, METHOD_ACTIONS
+
+CHECKS = 50000
+SERVICE_KEYS = ["assessment", "capability", "goal", "business_process", "usage", "billing", "invoice", "audit_log"]
+
+def build_checks(count: int) -> list:
+    rng = random.Random(42)
+    roles = [role.value for role in Role]
+    methods = list(METHOD_ACTIONS)
+    return [(rng.choice(roles), rng.choice(SERVICE_KEYS), rng.choice(methods)) for _ in range(count)]
+
+def main():
+    logging.disable(logging.WARNING)
+    validator = RBACValidator()
+    validator.compile_decision_table({key: None for key in SERVICE_KEYS})
+    checks = build_checks(CHECKS)
+
+    def legacy():
+        for role, service_key, method in checks:
+            context = validator.create_context("user", "tenant", role)
+            validator.validate_request_permission(context, service_key.replace("_", ""), method)
+
+    def table():
+        for role, service_key, method in checks:
+            validator.is_allowed(role, service_key, method)
+
+    legacy_ns = timeit.timeit(legacy, number=1) / CHECKS * 1e9
+    table_ns = timeit.timeit(table, number=1) / CHECKS * 1e9
+
+    print(f"{'check':<22} {'ns/check':>10}")
+    print(f"{'legacy enum lookup':<22} {legacy_ns:>10.0f}")
+    print(f"{'decision table':<22} {table_ns:>10.0f}")
+
+if __name__ == "__main__":
+    main()
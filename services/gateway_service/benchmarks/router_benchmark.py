@@ -0,0 +1,56 @@
+"""
+Microbenchmark for service path resolution.
+
+Compares the compiled prefix trie used by ServiceRegistry against the previous
+linear startswith scan over synthetic catalogs of increasing size.
+
+Run from the gateway_service directory:
+    python -m benchmarks.router_benchmark
+"""
+import random
+import timeit
+from types import SimpleNamespace
+
+from app.path_router import PrefixRouter
+
+CATALOG_SIZES = [10, 50, 100, 250, 500, 1000]
+LOOKUPS = 20000
+
+def build_catalog(size: int) -> dict:
+    """Build a synthetic catalog of nested gateway base paths"""
+    services = {}
+    for i in range(size):
+        services[f"service_{i}"] = SimpleNamespace(base_path=f"/gateway/domain{i % 10}/service{i}")
+    return services
+
+def linear_match(services: dict, path: str):
+    """Previous resolution strategy: first startswith match in catalog order"""
+    for service_key, config in services.items():
+        if path.startswith(config.base_path):
+            return service_key, config
+    return None
+
+def build_paths(services: dict, count: int) -> list:
+    """Request paths spread uniformly over the catalog"""
+    rng = random.Random(42)
+    base_paths = [config.base_path for config in services.values()]
+    return [f"{rng.choice(base_paths)}/items/{rng.randint(1, 1000)}" for _ in range(count)]
+
+def bench(size: int) -> tuple:
+    services = build_catalog(size)
+    router = PrefixRouter(services)
+    paths = build_paths(services, LOOKUPS)
+
+    trie_seconds = timeit.timeit(lambda: [router.match(p) for p in paths], number=1)
+    linear_seconds = timeit.timeit(lambda: [linear_match(services, p) for p in paths], number=1)
+
+    return trie_seconds / LOOKUPS * 1e9, linear_seconds / LOOKUPS * 1e9
+
+def main():
+    print(f"{'services':>10} {'trie ns/lookup':>16} {'linear ns/lookup':>18}")
+    for size in CATALOG_SIZES:
+        trie_ns, linear_ns = bench(size)
+        print(f"{size:>10} {trie_ns:>16.0f} {linear_ns:>18.0f}")
+
+if __name__ == "__main__":
+    main()
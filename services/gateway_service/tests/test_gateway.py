@@ -1,12 +1,31 @@
+import asyncio
+import httpx
+import json
+import logging
 import pytest
 import jwt
 import time
+from datetime import datetime
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi.testclient import TestClient
 from app.main import app
 from app.service_registry import ServiceRegistry, ServiceConfig, ServiceHealth, ServiceStatus
 from app.rbac import RBACValidator, RBACContext, Role, Permission
 from app.observability import ObservabilityManager, RequestContext
+from app.log_sink import StructuredLogSink
+from app.metrics import GatewayMetrics, gateway_metrics, method_label, status_class
+from app.client_pool import UpstreamClientPool
+from app.path_router import PrefixRouter
+from app.circuit_breaker import ServiceCircuit, CircuitState
+from app.hedging import RequestHedger
+from app.health_monitor import HealthMonitor
+from app.bulkhead import Bulkhead, bulkheads
+from app.retry_policy import RetryBudget, request_deadline, retry_budgets, DEADLINE_HEADER
+from app.load_balancer import LoadBalancer, parse_instances, LEAST_OUTSTANDING
+from app.token_cache import VerifiedTokenCache
+from app.response_cache import ResponseCache, build_cache_key
+from app.single_flight import SingleFlight
+from app.rate_limiter import RateLimiter, RateLimitDecision, InMemoryRateLimitBackend, RedisRateLimitBackend
 
 # Test client
 client = TestClient(app)
@@ -53,6 +72,1540 @@ class TestServiceRegistry:
         health.status = ServiceStatus.CIRCUIT_OPEN
         assert registry.is_service_healthy("assessment") is False
 
+class TestPrefixRouter:
+    """Test compiled prefix trie routing"""
+    
+    def _services(self, *base_paths):
+        return {f"svc{i}": Mock(base_path=base_path) for i, base_path in enumerate(base_paths)}
+    
+    def test_longest_prefix_wins(self):
+        """Test that the most specific base_path is chosen regardless of catalog order"""
+        router = PrefixRouter(self._services("/gateway", "/gateway/auth"))
+        assert router.match("/gateway/auth/login")[0] == "svc1"
+        assert router.match("/gateway/other")[0] == "svc0"
+    
+    def test_matches_on_segment_boundaries(self):
+        """Test that a base_path does not match a longer sibling segment"""
+        router = PrefixRouter(self._services("/assessment"))
+        assert router.match("/assessment")[0] == "svc0"
+        assert router.match("/assessment/items/1")[0] == "svc0"
+        assert router.match("/assessments") is None
+    
+    def test_unknown_path(self):
+        """Test that unmatched paths resolve to None"""
+        router = PrefixRouter(self._services("/goal", "/resource"))
+        assert router.match("/unknown/path") is None
+        assert router.match("/") is None
+    
+    def test_registry_uses_longest_prefix(self):
+        """Test registry resolution with nested catalog base paths"""
+        registry = ServiceRegistry("service_catalog.json")
+        assert registry.get_service_by_path("/gateway/analytics/reports")[0] == "analytics_service"
+        assert registry.get_service_by_path("/gateway/status")[0] == "gateway_service"
+    
+    def test_request_resolution_is_cached(self):
+        """Test that a request is routed once and reused by later stages"""
+        from app.routing import resolve_request_service
+        
+        request = make_request("GET", "/gateway/analytics/reports")
+        with patch('app.routing.get_service_config') as mock_get_service:
+            mock_get_service.return_value = ("analytics_service", Mock())
+            first = resolve_request_service(request)
+            second = resolve_request_service(request)
+        
+        assert first is second
+        assert mock_get_service.call_count == 1
+
+class TestUpstreamClientPool:
+    """Test pooled upstream clients"""
+    
+    def test_start_creates_client_per_service(self):
+        """Test that a client is created for every catalog entry"""
+        registry = ServiceRegistry("service_catalog.json")
+        pool = UpstreamClientPool()
+        pool.start(registry.services)
+        
+        metrics = pool.get_metrics()
+        assert metrics["gateway_upstream_pools_total"] == len(registry.services)
+        assert set(metrics["pools"].keys()) == set(registry.services.keys())
+        asyncio.run(pool.close())
+    
+    def test_client_is_reused(self):
+        """Test that the same client is returned for repeated requests"""
+        registry = ServiceRegistry("service_catalog.json")
+        service_key, config = next(iter(registry.services.items()))
+        pool = UpstreamClientPool()
+        
+        first = pool.get_client(service_key, config)
+        second = pool.get_client(service_key, config)
+        assert first is second
+        asyncio.run(pool.close())
+    
+    def test_connection_pool_settings(self):
+        """Test per-service connection pool configuration"""
+        registry = ServiceRegistry("service_catalog.json")
+        service_key, config = next(iter(registry.services.items()))
+        config.connection_pool = {"max_connections": 7, "max_keepalive_connections": 3, "http2": False}
+        pool = UpstreamClientPool()
+        pool.get_client(service_key, config)
+        
+        pool_metrics = pool.get_metrics()["pools"][service_key]
+        assert pool_metrics["max_connections"] == 7
+        assert pool_metrics["max_keepalive_connections"] == 3
+        assert pool_metrics["open_connections"] == 0
+        asyncio.run(pool.close())
+    
+    def test_close_releases_clients(self):
+        """Test that closing the pool closes every client"""
+        registry = ServiceRegistry("service_catalog.json")
+        pool = UpstreamClientPool()
+        pool.start(registry.services)
+        clients = [pool.get_client(key, config) for key, config in registry.services.items()]
+        
+        asyncio.run(pool.close())
+        assert all(client.is_closed for client in clients)
+        assert pool.get_metrics()["gateway_upstream_pools_total"] == 0
+
+class TestCatalogReload:
+    """Test hot reloading of the service catalog"""
+    
+    def _write_catalog(self, path, mutate=None):
+        import json
+        with open("service_catalog.json") as f:
+            catalog = json.load(f)
+        if mutate:
+            mutate(catalog["services"])
+        path.write_text(json.dumps(catalog))
+        return str(path)
+    
+    def _add_reports(self, services):
+        services["reports"] = {**services["analytics_service"], "service_name": "reports_service", "base_path": "/reports",
+                               "internal_url": "http://reports_service:8080"}
+    
+    def test_apply_keeps_health_and_swaps_routes(self, tmp_path):
+        """Test that unchanged services keep their health while added and removed services are rerouted"""
+        catalog_path = self._write_catalog(tmp_path / "catalog.json")
+        registry = ServiceRegistry(catalog_path)
+        registry.health_status["analytics_service"].status = ServiceStatus.HEALTHY
+        auth_balancer = registry.balancers["auth_service"]
+        
+        def mutate(services):
+            self._add_reports(services)
+            del services["auth_service"]
+        self._write_catalog(tmp_path / "catalog.json", mutate)
+        summary = registry.apply_catalog(registry.read_catalog())
+        
+        assert summary["added"] == ["reports"]
+        assert summary["removed"] == ["auth_service"]
+        assert "analytics_service" in summary["unchanged"]
+        assert registry.is_service_healthy("analytics_service") is True
+        assert registry.get_service_by_path("/reports/weekly")[0] == "reports"
+        assert registry.get_service_by_path("/gateway/auth/login")[0] == "gateway_service"
+        assert "auth_service" not in registry.health_status
+        assert auth_balancer.instances == {}
+    
+    def test_changed_endpoints_reset_health(self, tmp_path):
+        """Test that a service moved to a new URL does not inherit the old health"""
+        catalog_path = self._write_catalog(tmp_path / "catalog.json")
+        registry = ServiceRegistry(catalog_path)
+        registry.health_status["analytics_service"].status = ServiceStatus.HEALTHY
+        
+        def mutate(services):
+            services["analytics_service"]["internal_url"] = "http://analytics_v2:8080"
+        self._write_catalog(tmp_path / "catalog.json", mutate)
+        summary = registry.apply_catalog(registry.read_catalog())
+        
+        assert summary["changed"] == ["analytics_service"]
+        assert registry.health_status["analytics_service"].status == ServiceStatus.UNKNOWN
+    
+    def test_prepare_probes_only_new_endpoints(self, tmp_path):
+        """Test that reloading health-checks new services before they take traffic"""
+        catalog_path = self._write_catalog(tmp_path / "catalog.json")
+        registry = ServiceRegistry(catalog_path)
+        assert registry.catalog_changed_on_disk() is False
+        
+        self._write_catalog(tmp_path / "catalog.json", self._add_reports)
+        import os
+        os.utime(catalog_path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+        assert registry.catalog_changed_on_disk() is True
+        
+        healthy = ServiceHealth(status=ServiceStatus.HEALTHY, last_check=datetime.utcnow())
+        with patch.object(registry, "check_instance_health", AsyncMock(return_value=healthy)) as probe:
+            snapshot = asyncio.run(registry.prepare_catalog())
+        registry.apply_catalog(snapshot)
+        
+        assert probe.await_count == len(snapshot.services["reports"].instances)
+        assert registry.is_service_healthy("reports") is True
+        assert registry.catalog_changed_on_disk() is False
+    
+    def test_client_pool_retires_retuned_clients(self):
+        """Test that reconfiguring replaces clients of retuned services and keeps the rest"""
+        import copy
+        registry = ServiceRegistry("service_catalog.json")
+        pool = UpstreamClientPool()
+        
+        async def run():
+            pool.start(registry.services)
+            old_analytics = pool.get_client("analytics_service", registry.services["analytics_service"])
+            old_auth = pool.get_client("auth_service", registry.services["auth_service"])
+            
+            services = copy.deepcopy(registry.services)
+            services["analytics_service"].connection_pool = {"max_connections": 5}
+            pool.reconfigure(services)
+            
+            assert pool.get_client("analytics_service", services["analytics_service"]) is not old_analytics
+            assert pool.get_client("auth_service", services["auth_service"]) is old_auth
+            # In-flight requests may still be using the retired client
+            assert old_analytics.is_closed is False
+            await pool.close()
+            return old_analytics
+        
+        assert asyncio.run(run()).is_closed is True
+    
+    def test_reload_endpoint_requires_admin(self):
+        """Test that only Owner and Admin can trigger a catalog reload"""
+        from app.middleware import SECRET_KEY, ALGORITHM
+        
+        def headers(role):
+            payload = {"user_id": "user123", "tenant_id": "tenant456", "role": role, "exp": time.time() + 3600}
+            return {"Authorization": f"Bearer {jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)}"}
+        
+        summary = {"added": [], "removed": [], "changed": ["analytics_service"], "unchanged": []}
+        with patch("app.main.catalog_reloader.reload", AsyncMock(return_value=summary)) as reload:
+            denied = client.post("/admin/catalog/reload", headers=headers("Viewer"))
+            allowed = client.post("/admin/catalog/reload", headers=headers("Admin"))
+        
+        assert denied.status_code == 403
+        assert allowed.status_code == 200
+        assert allowed.json()["changed"] == ["analytics_service"]
+        assert reload.await_count == 1
+
+class TestHealthMonitor:
+    """Test jittered, adaptive active health probing"""
+    
+    def _monitor(self):
+        registry = ServiceRegistry("service_catalog.json")
+        registry.health_probe_settings = {"failing_interval_seconds": 10, "max_interval_seconds": 300, "jitter": 0.2}
+        return registry, HealthMonitor(registry)
+    
+    def test_registry_does_not_start_probing(self):
+        """Test that building a registry outside an event loop starts no background task"""
+        registry, monitor = self._monitor()
+        assert registry.health_client is None
+        assert monitor.get_metrics()["health_probes_total"] == 0
+    
+    def test_first_probes_are_spread_out(self):
+        """Test that services get jittered first probe times instead of firing together"""
+        registry, monitor = self._monitor()
+        with patch("app.health_monitor.random.uniform", side_effect=[0.3, 1.1, 1.7]):
+            assert monitor.due_services(1000.0) == []
+        
+        assert sorted(monitor._next_probe_at.values()) == [1000.3, 1001.1, 1001.7]
+        assert len(monitor.due_services(1001.5)) == 2
+    
+    def test_healthy_services_back_off_and_failing_ones_probe_often(self):
+        """Test that intervals stretch while healthy, cap out, and shrink after a failure"""
+        registry, monitor = self._monitor()
+        registry.health_check_interval = 60
+        results = iter([ServiceStatus.HEALTHY] * 4 + [ServiceStatus.UNHEALTHY])
+        
+        async def fake_update(service_key):
+            registry.health_status[service_key].status = next(results)
+        
+        intervals = []
+        with patch.object(registry, "update_service_health", side_effect=fake_update), \
+             patch("app.health_monitor.random.uniform", return_value=1.0):
+            for _ in range(5):
+                asyncio.run(monitor.probe("analytics_service"))
+                intervals.append(monitor.next_interval("analytics_service"))
+        
+        assert intervals == [120, 240, 300, 300, 10]
+        assert monitor.probes == 5
+    
+    def test_probe_skipped_after_successful_traffic(self):
+        """Test that proxied successes since the last probe stand in for a probe"""
+        registry, monitor = self._monitor()
+        registry.health_status["analytics_service"].status = ServiceStatus.HEALTHY
+        update = AsyncMock()
+        
+        with patch.object(registry, "update_service_health", update):
+            registry.record_outcome("analytics_service", True, 5.0)
+            asyncio.run(monitor.probe("analytics_service"))
+            assert update.await_count == 0
+            
+            # No traffic since the skipped probe, so the next one goes out
+            asyncio.run(monitor.probe("analytics_service"))
+            assert update.await_count == 1
+        
+        assert monitor.skipped == 1
+    
+    def test_unhealthy_service_is_never_skipped(self):
+        """Test that traffic does not stand in for probes of a service marked unhealthy"""
+        registry, monitor = self._monitor()
+        registry.health_status["analytics_service"].status = ServiceStatus.UNHEALTHY
+        registry.record_outcome("analytics_service", True, 5.0)
+        assert monitor.traffic_proved_healthy("analytics_service") is False
+    
+    def test_probes_reuse_the_shared_client(self):
+        """Test that probes go over the monitor's pooled client rather than a new one each time"""
+        registry, monitor = self._monitor()
+        config = registry.services["analytics_service"]
+        seen = []
+        
+        def handler(request):
+            seen.append(str(request.url))
+            return httpx.Response(200, json={"status": "healthy"})
+        
+        async def run():
+            registry.health_client = httpx.AsyncClient(transport=RawMockTransport(handler))
+            with patch("app.service_registry.httpx.AsyncClient") as new_client:
+                health = await registry.check_instance_health(config.internal_url, config)
+                assert new_client.call_count == 0
+            await registry.health_client.aclose()
+            return health
+        
+        assert asyncio.run(run()).status == ServiceStatus.HEALTHY
+        assert seen == [f"{config.internal_url}{config.healthcheck_endpoint}"]
+    
+    def test_removed_services_are_forgotten(self):
+        """Test that services dropped by a catalog reload leave the schedule"""
+        registry, monitor = self._monitor()
+        monitor.due_services(1000.0)
+        del registry.services["auth_service"]
+        monitor.due_services(1001.0)
+        assert "auth_service" not in monitor._next_probe_at
+
+def make_request(method="GET", path="/test", headers=None, body=b""):
+    """Build a Starlette request whose body is delivered in small chunks"""
+    from starlette.requests import Request
+    
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    chunks = [body[i:i + 4] for i in range(0, len(body), 4)] or [b""]
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+    
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": b"",
+        "headers": raw_headers,
+    }
+    return Request(scope, receive)
+
+class RawMockTransport(httpx.MockTransport):
+    """
+    MockTransport whose responses arrive unread, like a real transport's.
+    
+    httpx reads (and decodes) responses built from content= up front; the
+    gateway relays raw upstream bytes, so hand back the original byte stream.
+    """
+    
+    async def handle_async_request(self, request):
+        response = await super().handle_async_request(request)
+        return httpx.Response(response.status_code, headers=response.headers, stream=response.stream)
+
+class TestStreamingProxy:
+    """Test streaming proxy mode"""
+    
+    def _config(self, **overrides):
+        values = dict(
+            service_name="export_service", base_path="/export", internal_url="http://export:8000",
+            healthcheck_endpoint="/health", timeout_ms=1000, tenant_scope="tenant", cacheable=False,
+            retry_policy={"max_retries": 2, "backoff_ms": 1}, rbac_required=False,
+            rate_limit={"requests_per_minute": 100}, streaming=True
+        )
+        values.update(overrides)
+        return ServiceConfig(**values)
+    
+    def test_catalog_streaming_flag_defaults_off(self):
+        """Test that services do not stream unless the catalog opts in"""
+        registry = ServiceRegistry("service_catalog.json")
+        assert all(not config.streaming for config in registry.services.values())
+    
+    def test_streams_request_and_response(self):
+        """Test that bodies are relayed through without buffering"""
+        from app.main import proxy_streaming_request
+        from app.client_pool import client_pool
+        
+        received = {}
+        
+        async def handler(request):
+            received["body"] = request.content
+            
+            async def chunks():
+                yield b"streamed-"
+                yield b"response"
+            
+            return httpx.Response(200, content=chunks(), headers={"X-Upstream": "yes"})
+        
+        async def run():
+            client_pool._clients["export"] = httpx.AsyncClient(transport=RawMockTransport(handler))
+            context = ObservabilityManager().create_request_context("POST", "/export/data")
+            request = make_request("POST", "/export/data", {"transfer-encoding": "chunked"}, b"large-upload-body")
+            response = await proxy_streaming_request(request, "http://export:8000/export/data", "export", self._config(), context)
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            await client_pool._clients.pop("export").aclose()
+            return response, body
+        
+        response, body = asyncio.run(run())
+        assert received["body"] == b"large-upload-body"
+        assert body == b"streamed-response"
+        assert response.status_code == 200
+        assert response.headers["x-upstream"] == "yes"
+    
+    def test_retries_only_replayable_requests(self):
+        """Test that bodiless requests retry but streamed bodies do not"""
+        from app.main import proxy_streaming_request
+        from app.client_pool import client_pool
+        from fastapi import HTTPException
+        
+        calls = {"count": 0}
+        
+        async def handler(request):
+            calls["count"] += 1
+            raise httpx.ConnectError("connection refused")
+        
+        async def run(method, headers, body):
+            client_pool._clients["export"] = httpx.AsyncClient(transport=RawMockTransport(handler))
+            context = ObservabilityManager().create_request_context(method, "/export/data")
+            request = make_request(method, "/export/data", headers, body)
+            try:
+                with pytest.raises(HTTPException):
+                    await proxy_streaming_request(request, "http://export:8000/export/data", "export", self._config(), context)
+            finally:
+                await client_pool._clients.pop("export").aclose()
+        
+        asyncio.run(run("GET", {}, b""))
+        assert calls["count"] == 3
+        
+        calls["count"] = 0
+        asyncio.run(run("POST", {"content-length": "9"}, b"some-body"))
+        assert calls["count"] == 1
+    
+    def test_body_failure_releases_upstream(self):
+        """Test that an upstream failing partway through the body is closed, released and counted as failed"""
+        from app.main import proxy_streaming_request
+        from app.client_pool import client_pool
+        
+        closed = []
+        
+        class FailingBody(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield b"partial-"
+                raise httpx.ReadError("connection reset")
+            
+            async def aclose(self):
+                closed.append(True)
+        
+        async def handler(request):
+            return httpx.Response(200, stream=FailingBody())
+        
+        async def receive():
+            await asyncio.sleep(3600)
+        
+        sent = []
+        
+        async def send(message):
+            sent.append(message)
+        
+        async def run():
+            client_pool._clients["export"] = httpx.AsyncClient(transport=RawMockTransport(handler))
+            context = ObservabilityManager().create_request_context("GET", "/export/data")
+            request = make_request("GET", "/export/data")
+            try:
+                response = await proxy_streaming_request(request, "http://export:8000/export/data", "export", self._config(), context)
+                with pytest.raises(httpx.ReadError):
+                    await response({"type": "http"}, receive, send)
+            finally:
+                await client_pool._clients.pop("export").aclose()
+        
+        with patch('app.service_registry.ServiceRegistry.release_instance') as release:
+            asyncio.run(run())
+        
+        assert sent[1]["body"] == b"partial-"
+        assert closed == [True]
+        release.assert_called_once()
+        assert release.call_args.args[2] is False
+
+class TestPassiveCircuitBreaker:
+    """Test circuit breaking driven by proxied outcomes"""
+    
+    settings = {"min_requests": 4, "error_rate_threshold": 0.5, "open_seconds": 10, "max_open_seconds": 40,
+                "half_open_successes": 2, "probe_interval_seconds": 1}
+    
+    def test_opens_on_error_rate(self):
+        """Test that the circuit opens once the rolling error rate crosses the threshold"""
+        circuit = ServiceCircuit("assessment", self.settings)
+        for success in (True, False, True):
+            circuit.record(success, 10.0)
+        assert circuit.state == CircuitState.CLOSED
+        
+        circuit.record(False, 10.0)
+        assert circuit.state == CircuitState.OPEN
+        assert circuit.allow_request() is False
+    
+    def test_half_open_probing(self):
+        """Test that an open circuit admits paced probes and closes after enough successes"""
+        circuit = ServiceCircuit("assessment", self.settings)
+        for _ in range(4):
+            circuit.record(False, 10.0)
+        
+        with patch("app.circuit_breaker.time.time", return_value=circuit.opened_at + 11):
+            assert circuit.allow_request() is True
+            assert circuit.state == CircuitState.HALF_OPEN
+            # One probe per interval
+            assert circuit.allow_request() is False
+        
+        circuit.record(True, 10.0)
+        assert circuit.state == CircuitState.HALF_OPEN
+        circuit.record(True, 10.0)
+        assert circuit.state == CircuitState.CLOSED
+        assert circuit.snapshot()["window_requests"] == 0
+    
+    def test_failed_probe_backs_off(self):
+        """Test that a failed probe reopens the circuit for longer"""
+        circuit = ServiceCircuit("assessment", self.settings)
+        for _ in range(4):
+            circuit.record(False, 10.0)
+        
+        with patch("app.circuit_breaker.time.time", return_value=circuit.opened_at + 11):
+            assert circuit.allow_request() is True
+        circuit.record(False, 10.0)
+        
+        assert circuit.state == CircuitState.OPEN
+        assert circuit.open_seconds == 20
+        assert circuit.open_count == 2
+    
+    def test_latency_percentiles(self):
+        """Test rolling latency percentiles"""
+        circuit = ServiceCircuit("assessment", self.settings)
+        for latency in range(1, 101):
+            circuit.record(True, float(latency))
+        
+        snapshot = circuit.snapshot()
+        assert snapshot["p50_ms"] == 50
+        assert snapshot["p95_ms"] == 95
+        assert snapshot["p99_ms"] == 99
+        assert snapshot["error_rate"] == 0
+    
+    def test_registry_stops_routing_to_open_circuit(self):
+        """Test that a tripped passive circuit overrides a healthy active check"""
+        registry = ServiceRegistry("service_catalog.json")
+        registry.health_status["analytics_service"].status = ServiceStatus.HEALTHY
+        registry.circuits["analytics_service"] = ServiceCircuit("analytics_service", self.settings)
+        assert registry.is_service_healthy("analytics_service") is True
+        
+        for _ in range(4):
+            registry.record_outcome("analytics_service", False, 10.0)
+        
+        assert registry.is_service_healthy("analytics_service") is False
+        summary = registry.get_health_summary()
+        assert summary["services"]["analytics_service"]["circuit"]["state"] == "open"
+        assert registry.get_service_metrics()["circuit_open_services"] >= 1
+    
+    def test_proxy_feeds_circuit_and_stops_retrying(self):
+        """Test that proxied failures trip the circuit and cut retries short"""
+        from app.main import proxy_request_with_retry
+        from app.client_pool import client_pool
+        from app.service_registry import service_registry
+        from fastapi import HTTPException
+        
+        calls = {"count": 0}
+        
+        async def handler(request):
+            calls["count"] += 1
+            raise httpx.ConnectError("connection refused")
+        
+        config = ServiceConfig(
+            service_name="assessment_service", base_path="/assessment", internal_url="http://assessment:8000",
+            healthcheck_endpoint="/health", timeout_ms=1000, tenant_scope="tenant", cacheable=False,
+            retry_policy={"max_retries": 10, "backoff_ms": 1}, rbac_required=False,
+            rate_limit={"requests_per_minute": 100}
+        )
+        
+        async def run():
+            client_pool._clients["assessment"] = httpx.AsyncClient(transport=RawMockTransport(handler))
+            context = ObservabilityManager().create_request_context("GET", "/assessment/items")
+            request = make_request("GET", "/assessment/items")
+            try:
+                with pytest.raises(HTTPException) as exc_info:
+                    await proxy_request_with_retry(request, "http://assessment:8000/assessment/items", "assessment", config, context)
+                return exc_info.value
+            finally:
+                await client_pool._clients.pop("assessment").aclose()
+        
+        with patch.dict(service_registry.circuits, {"assessment": ServiceCircuit("assessment", self.settings)}):
+            error = asyncio.run(run())
+            assert service_registry.circuits["assessment"].state == CircuitState.OPEN
+        
+        assert error.status_code == 503
+        assert calls["count"] == 4
+    
+    def test_gateway_health_exposes_circuits(self):
+        """Test that circuit state is reported on /gateway-health"""
+        response = client.get("/gateway-health")
+        assert response.status_code == 200
+        status = response.json()["circuit_breaker_status"]
+        assert "analytics_service" in status["circuits"]
+        assert status["circuits"]["analytics_service"]["state"] in ("closed", "open", "half_open")
+        assert isinstance(status["open_services"], list)
+
+class TestLoadBalancer:
+    """Test multi-instance upstream balancing"""
+    
+    instances = [{"url": "http://analytics-1:8000"}, {"url": "http://analytics-2:8000"}]
+    
+    def test_single_instance_defaults_to_internal_url(self):
+        """Test that catalog entries without instances balance over internal_url"""
+        registry = ServiceRegistry("service_catalog.json")
+        config = registry.get_service_config("analytics_service")
+        balancer = registry.balancers["analytics_service"]
+        assert list(balancer.instances) == [config.internal_url.rstrip("/")]
+        assert registry.acquire_instance("analytics_service").url == config.internal_url.rstrip("/")
+    
+    def test_parse_instances(self):
+        """Test that instances may be URLs or objects"""
+        parsed = parse_instances({
+            "internal_url": "http://a:8000",
+            "instances": ["http://a:8000", {"url": "http://b:8000", "draining": True}]
+        })
+        assert parsed == [{"url": "http://a:8000", "draining": False}, {"url": "http://b:8000", "draining": True}]
+    
+    def test_peak_ewma_prefers_faster_instance(self):
+        """Test that the slower instance gets less traffic"""
+        balancer = LoadBalancer("analytics_service", self.instances)
+        fast, slow = balancer.instances["http://analytics-1:8000"], balancer.instances["http://analytics-2:8000"]
+        fast.ewma_ms, slow.ewma_ms = 5.0, 500.0
+        fast.last_sample_at = slow.last_sample_at = time.time()
+        
+        picks = []
+        for _ in range(20):
+            instance = balancer.acquire()
+            picks.append(instance.url)
+            balancer.release(instance, True, 5.0 if instance is fast else 500.0)
+        assert picks.count(fast.url) == 20
+    
+    def test_least_outstanding_spreads_concurrent_requests(self):
+        """Test that concurrent requests go to the least busy instance"""
+        balancer = LoadBalancer("analytics_service", self.instances, LEAST_OUTSTANDING)
+        first = balancer.acquire()
+        second = balancer.acquire()
+        assert first is not second
+    
+    def test_failing_instance_is_ejected(self):
+        """Test passive ejection and panic fallback when every instance is ejected"""
+        balancer = LoadBalancer("analytics_service", self.instances, ejection_threshold=2)
+        bad = balancer.instances["http://analytics-1:8000"]
+        for _ in range(2):
+            bad.outstanding += 1
+            balancer.release(bad, False, 10.0)
+        
+        assert all(balancer.acquire().url == "http://analytics-2:8000" for _ in range(10))
+        
+        balancer.instances["http://analytics-2:8000"].ejected_until = bad.ejected_until
+        assert balancer.acquire() is not None
+    
+    def test_removed_instance_drains(self):
+        """Test that removed instances finish in-flight requests before being dropped"""
+        balancer = LoadBalancer("analytics_service", self.instances, LEAST_OUTSTANDING)
+        leaving = balancer.instances["http://analytics-2:8000"]
+        leaving.outstanding = 1
+        
+        balancer.update_instances(self.instances[:1])
+        assert leaving.draining
+        assert leaving.url in balancer.instances
+        assert all(balancer.acquire().url == "http://analytics-1:8000" for _ in range(5))
+        
+        balancer.release(leaving, True, 10.0)
+        assert leaving.url not in balancer.instances
+    
+    def test_health_checks_each_instance(self):
+        """Test that active health checks mark individual instances"""
+        registry = ServiceRegistry("service_catalog.json")
+        registry.balancers["analytics_service"] = LoadBalancer("analytics_service", self.instances)
+        
+        async def fake_check(url, config):
+            status = ServiceStatus.HEALTHY if url.endswith("-1:8000") else ServiceStatus.UNHEALTHY
+            return ServiceHealth(status=status, last_check=datetime.utcnow(), response_time_ms=1.0)
+        
+        with patch.object(registry, "check_instance_health", side_effect=fake_check):
+            health = asyncio.run(registry.check_service_health("analytics_service"))
+        
+        assert health.status == ServiceStatus.HEALTHY
+        instances = registry.balancers["analytics_service"].instances
+        assert instances["http://analytics-1:8000"].healthy
+        assert not instances["http://analytics-2:8000"].healthy
+    
+    def test_retry_moves_to_another_instance(self):
+        """Test that a failed attempt is retried on a different instance"""
+        from app.main import proxy_request_with_retry
+        from app.client_pool import client_pool
+        from app.service_registry import service_registry
+        
+        hosts = []
+        
+        async def handler(request):
+            hosts.append(request.url.host)
+            if request.url.host == hosts[0] and len(hosts) == 1:
+                raise httpx.ConnectError("connection refused")
+            return httpx.Response(200, content=b"ok")
+        
+        config = ServiceConfig(
+            service_name="analytics_service", base_path="/gateway/analytics", internal_url="http://analytics-1:8000",
+            healthcheck_endpoint="/health", timeout_ms=1000, tenant_scope="tenant", cacheable=False,
+            retry_policy={"max_retries": 2, "backoff_ms": 1}, rbac_required=False,
+            rate_limit={"requests_per_minute": 100}
+        )
+        
+        async def run():
+            client_pool._clients["analytics_service"] = httpx.AsyncClient(transport=RawMockTransport(handler))
+            context = ObservabilityManager().create_request_context("GET", "/gateway/analytics/reports")
+            request = make_request("GET", "/gateway/analytics/reports")
+            try:
+                return await proxy_request_with_retry(
+                    request, "http://analytics-1:8000/gateway/analytics/reports", "analytics_service", config, context
+                )
+            finally:
+                await client_pool._clients.pop("analytics_service").aclose()
+        
+        balancer = LoadBalancer("analytics_service", self.instances)
+        with patch.dict(service_registry.balancers, {"analytics_service": balancer}):
+            response = asyncio.run(run())
+        
+        assert response.status_code == 200
+        assert len(hosts) == 2 and hosts[0] != hosts[1]
+        assert all(instance.outstanding == 0 for instance in balancer.instances.values())
+
+class TestRetryPolicy:
+    """Test deadline propagation, retry budgets and idempotency-aware retries"""
+    
+    def _config(self, **retry_policy):
+        policy = {"max_retries": 3, "backoff_ms": 1}
+        policy.update(retry_policy)
+        return ServiceConfig(
+            service_name="report_service", base_path="/reports", internal_url="http://reports:8000",
+            healthcheck_endpoint="/health", timeout_ms=2000, tenant_scope="tenant", cacheable=False,
+            retry_policy=policy, rbac_required=False, rate_limit={"requests_per_minute": 100}
+        )
+    
+    def _proxy(self, handler, request, config):
+        from app.main import proxy_request_with_retry
+        from app.client_pool import client_pool
+        
+        async def run():
+            client_pool._clients["reports"] = httpx.AsyncClient(transport=RawMockTransport(handler))
+            context = ObservabilityManager().create_request_context(request.method, "/reports/daily")
+            try:
+                return await proxy_request_with_retry(request, "http://reports:8000/reports/daily", "reports", config, context)
+            finally:
+                await client_pool._clients.pop("reports").aclose()
+        
+        retry_budgets.reset()
+        return asyncio.run(run())
+    
+    def test_deadline_is_propagated_and_tightened_by_caller(self):
+        """Test that upstreams receive the remaining budget, never more than the caller's"""
+        seen = {}
+        
+        async def handler(request):
+            seen["deadline"] = int(request.headers[DEADLINE_HEADER])
+            return httpx.Response(200)
+        
+        self._proxy(handler, make_request("GET", "/reports/daily"), self._config())
+        assert 1900 <= seen["deadline"] <= 2000
+        
+        self._proxy(handler, make_request("GET", "/reports/daily", {DEADLINE_HEADER: "300"}), self._config())
+        assert seen["deadline"] <= 300
+    
+    def test_retries_stop_at_deadline(self):
+        """Test that retries are not attempted once the backoff would pass the deadline"""
+        from fastapi import HTTPException
+        calls = {"count": 0}
+        
+        async def handler(request):
+            calls["count"] += 1
+            raise httpx.ConnectError("connection refused")
+        
+        with pytest.raises(HTTPException) as exc_info:
+            self._proxy(handler, make_request("GET", "/reports/daily"), self._config(deadline_ms=50, backoff_ms=100))
+        assert exc_info.value.status_code == 502
+        assert calls["count"] == 1
+    
+    def test_non_idempotent_requests_need_idempotency_key(self):
+        """Test that POSTs are only retried when they carry an Idempotency-Key"""
+        from fastapi import HTTPException
+        calls = {"count": 0}
+        
+        async def handler(request):
+            calls["count"] += 1
+            if calls["count"] == 1:
+                raise httpx.ConnectError("connection refused")
+            return httpx.Response(201)
+        
+        with pytest.raises(HTTPException):
+            self._proxy(handler, make_request("POST", "/reports/daily", body=b"{}"), self._config())
+        assert calls["count"] == 1
+        
+        calls["count"] = 0
+        request = make_request("POST", "/reports/daily", {"Idempotency-Key": "abc-123"}, b"{}")
+        response = self._proxy(handler, request, self._config())
+        assert response.status_code == 201
+        assert calls["count"] == 2
+    
+    def test_retry_budget_caps_retry_share(self):
+        """Test that retries are refused once the budget is spent"""
+        budget = RetryBudget(budget_ratio=0.5, min_retries_per_second=0)
+        assert budget.try_acquire() is True
+        assert budget.try_acquire() is False
+        
+        budget.record_request()
+        budget.record_request()
+        assert budget.try_acquire() is True
+        assert budget.get_metrics()["budget_exhausted_total"] == 1
+    
+    def test_deadline_is_shared_across_proxy_paths(self):
+        """Test that the deadline is computed once per request"""
+        request = make_request("GET", "/reports/daily")
+        first = request_deadline(request, self._config())
+        assert request_deadline(request, self._config(deadline_ms=1)) == first
+
+class TestBulkhead:
+    """Test per-service concurrency limits and load shedding"""
+    
+    def test_requests_queue_then_shed_when_queue_is_full(self):
+        """Test that excess requests wait in the queue and overflow is shed with Retry-After"""
+        from fastapi import HTTPException
+        bulkhead = Bulkhead("reports", {"max_concurrent": 1, "max_queue": 1, "queue_timeout_ms": 1000, "retry_after_seconds": 2})
+        
+        async def run():
+            await bulkhead.acquire()
+            waiter = asyncio.create_task(bulkhead.acquire())
+            await asyncio.sleep(0)
+            assert bulkhead.queue_depth == 1
+            
+            with pytest.raises(HTTPException) as shed:
+                await bulkhead.acquire()
+            
+            bulkhead.release()
+            await waiter
+            assert bulkhead.active == 1
+            assert bulkhead.queue_depth == 0
+            bulkhead.release()
+            return shed.value
+        
+        shed = asyncio.run(run())
+        assert shed.status_code == 503
+        assert shed.headers["Retry-After"] == "2"
+        metrics = bulkhead.get_metrics()
+        assert metrics["shed_queue_full_total"] == 1
+        assert metrics["queued_total"] == 1
+        assert metrics["active"] == 0
+    
+    def test_queued_request_is_shed_after_timeout(self):
+        """Test that waiting longer than queue_timeout_ms sheds the request"""
+        from fastapi import HTTPException
+        bulkhead = Bulkhead("reports", {"max_concurrent": 1, "max_queue": 5, "queue_timeout_ms": 10})
+        
+        async def run():
+            await bulkhead.acquire()
+            with pytest.raises(HTTPException):
+                await bulkhead.acquire()
+            bulkhead.release()
+        
+        asyncio.run(run())
+        assert bulkhead.get_metrics()["shed_queue_timeout_total"] == 1
+        assert bulkhead.active == 0
+        assert bulkhead.queue_depth == 0
+    
+    def test_slots_are_handed_over_in_order(self):
+        """Test that a released slot goes to the longest-waiting request, not a newcomer"""
+        bulkhead = Bulkhead("reports", {"max_concurrent": 1, "max_queue": 5})
+        order = []
+        
+        async def worker(name):
+            await bulkhead.acquire()
+            order.append(name)
+            await asyncio.sleep(0)
+            bulkhead.release()
+        
+        async def run():
+            await bulkhead.acquire()
+            tasks = [asyncio.create_task(worker(name)) for name in ("first", "second", "third")]
+            await asyncio.sleep(0)
+            bulkhead.release()
+            await asyncio.gather(*tasks)
+        
+        asyncio.run(run())
+        assert order == ["first", "second", "third"]
+        assert bulkhead.active == 0
+    
+    def test_catalog_settings_merge_gateway_defaults(self):
+        """Test that services inherit gateway_config.bulkhead"""
+        registry = ServiceRegistry("service_catalog.json")
+        assert registry.services["analytics_service"].bulkhead["max_concurrent"] == 100
+    
+    def test_proxy_sheds_with_503_when_service_is_saturated(self):
+        """Test that the proxy rejects requests beyond the bulkhead without calling the upstream"""
+        from fastapi import HTTPException
+        from app.main import proxy_request_with_retry
+        config = ServiceConfig(
+            service_name="report_service", base_path="/reports", internal_url="http://reports:8000",
+            healthcheck_endpoint="/health", timeout_ms=2000, tenant_scope="tenant", cacheable=False,
+            retry_policy={"max_retries": 0}, rbac_required=False, rate_limit={"requests_per_minute": 100},
+            bulkhead={"max_concurrent": 1, "max_queue": 0}
+        )
+        
+        async def run():
+            bulkheads.reset()
+            saturated = bulkheads.get("reports", config.bulkhead)
+            await saturated.acquire()
+            context = ObservabilityManager().create_request_context("GET", "/reports/daily")
+            try:
+                await proxy_request_with_retry(make_request("GET", "/reports/daily"), "http://reports:8000/reports/daily", "reports", config, context)
+            finally:
+                saturated.release()
+                bulkheads.reset()
+        
+        with pytest.raises(HTTPException) as shed:
+            asyncio.run(run())
+        assert shed.value.status_code == 503
+        assert "Retry-After" in shed.value.headers
+        assert "at capacity" in shed.value.detail
+    
+    def test_aborted_stream_returns_its_slot(self):
+        """Test that a streamed response failing partway through still frees its bulkhead slot"""
+        from app.main import proxy_streaming_request
+        from app.client_pool import client_pool
+        config = ServiceConfig(
+            service_name="export_service", base_path="/export", internal_url="http://export:8000",
+            healthcheck_endpoint="/health", timeout_ms=1000, tenant_scope="tenant", cacheable=False,
+            retry_policy={"max_retries": 0}, rbac_required=False, rate_limit={"requests_per_minute": 100},
+            streaming=True, bulkhead={"max_concurrent": 1, "max_queue": 0}
+        )
+        
+        async def handler(request):
+            async def chunks():
+                yield b"partial-"
+                raise httpx.ReadError("connection reset")
+            
+            return httpx.Response(200, content=chunks())
+        
+        async def receive():
+            await asyncio.sleep(3600)
+        
+        async def send(message):
+            pass
+        
+        async def run():
+            bulkheads.reset()
+            client_pool._clients["export"] = httpx.AsyncClient(transport=RawMockTransport(handler))
+            try:
+                for _ in range(2):
+                    context = ObservabilityManager().create_request_context("GET", "/export/data")
+                    response = await proxy_streaming_request(make_request("GET", "/export/data"), "http://export:8000/export/data", "export", config, context)
+                    with pytest.raises(httpx.ReadError):
+                        await response({"type": "http"}, receive, send)
+                return bulkheads.get("export", config.bulkhead).active
+            finally:
+                await client_pool._clients.pop("export").aclose()
+                bulkheads.reset()
+        
+        assert asyncio.run(run()) == 0
+
+class TestRequestHedging:
+    """Test hedged requests for slow idempotent reads"""
+    
+    def _config(self, **hedging):
+        return ServiceConfig(
+            service_name="report_service", base_path="/reports", internal_url="http://reports:8000",
+            healthcheck_endpoint="/health", timeout_ms=2000, tenant_scope="tenant", cacheable=False,
+            retry_policy={"max_retries": 0}, rbac_required=False, rate_limit={"requests_per_minute": 100},
+            hedging=hedging
+        )
+    
+    def test_hedge_delay_follows_p95(self):
+        """Test that only opted-in reads with latency history are hedged"""
+        hedger = RequestHedger()
+        config = self._config(enabled=True, min_delay_ms=5)
+        assert hedger.hedge_delay("reports", self._config(), "GET", {"p95_ms": 40.0}) is None
+        assert hedger.hedge_delay("reports", config, "POST", {"p95_ms": 40.0}) is None
+        assert hedger.hedge_delay("reports", config, "GET", {}) is None
+        assert hedger.hedge_delay("reports", config, "GET", {"p95_ms": 40.0}) == pytest.approx(0.04)
+        assert hedger.hedge_delay("reports", config, "GET", {"p95_ms": 1.0}) == pytest.approx(0.005)
+    
+    def test_first_response_wins_and_loser_is_cancelled(self):
+        """Test that a fast hedge beats a slow primary, which is then cancelled"""
+        hedger = RequestHedger()
+        hedger.hedge_delay("reports", self._config(enabled=True), "GET", {"p95_ms": 10.0})
+        cancelled = {}
+        
+        async def primary():
+            try:
+                await asyncio.sleep(1)
+                return "primary"
+            except asyncio.CancelledError:
+                cancelled["primary"] = True
+                raise
+        
+        async def hedge():
+            return "hedge"
+        
+        assert asyncio.run(hedger.run("reports", primary, hedge, 0.01)) == "hedge"
+        assert cancelled["primary"] is True
+        assert hedger.get_metrics()["reports"]["hedge_wins_total"] == 1
+    
+    def test_fast_primary_is_not_hedged(self):
+        """Test that no hedge is sent when the primary answers within the delay"""
+        hedger = RequestHedger()
+        hedger.hedge_delay("reports", self._config(enabled=True), "GET", {"p95_ms": 10.0})
+        hedge = AsyncMock(return_value="hedge")
+        
+        async def primary():
+            return "primary"
+        
+        assert asyncio.run(hedger.run("reports", primary, hedge, 0.5)) == "primary"
+        hedge.assert_not_called()
+    
+    def test_hedge_rate_is_capped(self):
+        """Test that hedges stop once the hedge budget is spent"""
+        hedger = RequestHedger()
+        config = self._config(enabled=True, max_hedge_rate=0.0)
+        hedges = {"count": 0}
+        
+        async def primary():
+            await asyncio.sleep(0.02)
+            return "primary"
+        
+        async def hedge():
+            hedges["count"] += 1
+            await asyncio.sleep(0.05)
+            return "hedge"
+        
+        for _ in range(3):
+            hedger.hedge_delay("reports", config, "GET", {"p95_ms": 1.0})
+            assert asyncio.run(hedger.run("reports", primary, hedge, 0.001)) == "primary"
+        
+        assert hedges["count"] == 1
+        assert hedger.get_metrics()["reports"]["hedges_suppressed_total"] == 2
+    
+    def test_proxy_hedges_on_separate_client(self):
+        """Test that the proxy sends the hedge over the dedicated hedge client"""
+        from app.main import proxy_request_with_retry
+        from app.client_pool import client_pool
+        from app.service_registry import service_registry
+        
+        async def slow_handler(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200, content=b"slow")
+        
+        async def fast_handler(request):
+            return httpx.Response(200, content=b"fast")
+        
+        async def run():
+            client_pool._clients["reports"] = httpx.AsyncClient(transport=RawMockTransport(slow_handler))
+            client_pool._clients["reports:hedge"] = httpx.AsyncClient(transport=RawMockTransport(fast_handler))
+            context = ObservabilityManager().create_request_context("GET", "/reports/daily")
+            try:
+                return await proxy_request_with_retry(
+                    make_request("GET", "/reports/daily"), "http://reports:8000/reports/daily",
+                    "reports", self._config(enabled=True, max_hedge_rate=1.0), context
+                )
+            finally:
+                await client_pool._clients.pop("reports").aclose()
+                await client_pool._clients.pop("reports:hedge").aclose()
+        
+        with patch.object(service_registry, "get_latency_percentiles", return_value={"p95_ms": 10.0}):
+            start = time.time()
+            response = asyncio.run(run())
+        
+        assert response.body == b"fast"
+        assert time.time() - start < 0.5
+    
+    def test_hedge_goes_to_another_instance_and_loser_is_not_ejected(self):
+        """Test that hedges avoid the primary's instance and cancelled losers do not count as failures"""
+        from app.main import proxy_request_with_retry
+        from app.client_pool import client_pool
+        from app.service_registry import service_registry
+        
+        balancer = LoadBalancer(
+            "reports", [{"url": "http://reports-slow:8000"}, {"url": "http://reports-fast:8000"}], ejection_threshold=2
+        )
+        slow = balancer.instances["http://reports-slow:8000"]
+        fast = balancer.instances["http://reports-fast:8000"]
+        
+        async def handler(request):
+            if request.url.host == "reports-slow":
+                await asyncio.sleep(1)
+                return httpx.Response(200, content=b"slow")
+            return httpx.Response(200, content=b"fast")
+        
+        async def run():
+            client_pool._clients["reports"] = httpx.AsyncClient(transport=RawMockTransport(handler))
+            client_pool._clients["reports:hedge"] = httpx.AsyncClient(transport=RawMockTransport(handler))
+            try:
+                bodies = []
+                for _ in range(3):
+                    # Make the slow instance look cheaper so the primary goes to it
+                    fast.ewma_ms, fast.last_sample_at = 10000.0, time.time()
+                    context = ObservabilityManager().create_request_context("GET", "/reports/daily")
+                    response = await proxy_request_with_retry(
+                        make_request("GET", "/reports/daily"), "http://reports:8000/reports/daily",
+                        "reports", self._config(enabled=True, max_hedge_rate=1.0), context
+                    )
+                    bodies.append(response.body)
+                return bodies
+            finally:
+                await client_pool._clients.pop("reports").aclose()
+                await client_pool._clients.pop("reports:hedge").aclose()
+        
+        with patch.dict(service_registry.balancers, {"reports": balancer}), \
+             patch.object(service_registry, "get_latency_percentiles", return_value={"p95_ms": 10.0}):
+            start = time.time()
+            bodies = asyncio.run(run())
+        
+        assert bodies == [b"fast"] * 3
+        assert time.time() - start < 1.5
+        assert slow.total_requests == 3
+        assert slow.outstanding == 0
+        assert slow.consecutive_failures == 0
+        assert slow.is_available(time.time())
+
+class TestResponseCompression:
+    """Test Accept-Encoding negotiation and the compression middleware"""
+    
+    def _app(self, body, headers=None, config=None, **middleware_options):
+        from starlette.applications import Starlette
+        from starlette.responses import Response as StarletteResponse
+        from starlette.routing import Route
+        from app.compression import CompressionMiddleware, ResponseCompressor
+        
+        async def endpoint(request):
+            if config is not None:
+                request.state.service_info = ("reports", config)
+            return StarletteResponse(body, media_type="application/json", headers=headers)
+        
+        self.compressor = ResponseCompressor(**middleware_options.pop("compressor_options", {}))
+        app = Starlette(routes=[Route("/reports", endpoint)])
+        return TestClient(CompressionMiddleware(app, compressor=self.compressor, **middleware_options))
+    
+    def test_negotiation_honours_q_values_and_server_preference(self):
+        """Test that client weights win and ties go to the preferred codec"""
+        from app.compression import negotiate_encoding
+        supported = ["zstd", "br", "gzip"]
+        assert negotiate_encoding("gzip, br, zstd", supported) == "zstd"
+        assert negotiate_encoding("gzip;q=1.0, br;q=0.5", supported) == "gzip"
+        assert negotiate_encoding("*;q=0.1, zstd;q=0", supported) == "br"
+        assert negotiate_encoding("identity", supported) is None
+        assert negotiate_encoding("", supported) is None
+    
+    def test_large_json_is_compressed(self):
+        """Test that bodies above the threshold are compressed for the client"""
+        body = b'{"rows": [' + b",".join(b'{"id": %d}' % i for i in range(500)) + b"]}"
+        client = self._app(body, minimum_size=1024)
+        
+        response = client.get("/reports", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.content == body
+        assert int(response.headers["content-length"]) < len(body)
+        assert self.compressor.compressed == 1
+    
+    def test_small_bodies_and_opted_out_services_are_not_compressed(self):
+        """Test the minimum size threshold and the per-service opt-out"""
+        body = b'{"value": "' + b"x" * 4096 + b'"}'
+        
+        client = self._app(b'{"ok": true}', minimum_size=1024)
+        assert "content-encoding" not in client.get("/reports", headers={"Accept-Encoding": "gzip"}).headers
+        
+        client = self._app(body, config=Mock(compression=False), minimum_size=1024)
+        assert "content-encoding" not in client.get("/reports", headers={"Accept-Encoding": "gzip"}).headers
+    
+    def test_already_encoded_bodies_pass_through(self):
+        """Test that upstream-encoded responses are relayed unchanged"""
+        import gzip
+        encoded = gzip.compress(b'{"value": "' + b"x" * 4096 + b'"}')
+        client = self._app(encoded, headers={"Content-Encoding": "gzip"}, minimum_size=16)
+        
+        response = client.get("/reports", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert self.compressor.compressed == 0
+        assert self.compressor.passed_through == 1
+    
+    def test_large_bodies_compress_on_worker_pool(self):
+        """Test that payloads above the thread threshold are offloaded"""
+        body = b'{"value": "' + b"x" * 10000 + b'"}'
+        client = self._app(body, minimum_size=16, compressor_options={"thread_threshold": 4096})
+        
+        response = client.get("/reports", headers={"Accept-Encoding": "gzip"})
+        assert response.content == body
+        assert self.compressor.offloaded == 1
+    
+    def _proxy(self, handler, headers):
+        from app.main import proxy_request_with_retry
+        from app.client_pool import client_pool
+        
+        config = ServiceConfig(
+            service_name="report_service", base_path="/reports", internal_url="http://reports:8000",
+            healthcheck_endpoint="/health", timeout_ms=2000, tenant_scope="tenant", cacheable=False,
+            retry_policy={"max_retries": 0}, rbac_required=False, rate_limit={"requests_per_minute": 100}
+        )
+        
+        async def run():
+            client_pool._clients["reports"] = httpx.AsyncClient(transport=RawMockTransport(handler))
+            context = ObservabilityManager().create_request_context("GET", "/reports")
+            request = make_request("GET", "/reports", headers)
+            try:
+                return await proxy_request_with_retry(request, "http://reports:8000/reports", "reports", config, context)
+            finally:
+                await client_pool._clients.pop("reports").aclose()
+        
+        return asyncio.run(run())
+    
+    def test_buffered_proxy_relays_upstream_encoding(self):
+        """Test that the negotiated encoding is forwarded and the encoded body relayed unchanged"""
+        import gzip
+        encoded = gzip.compress(b'{"ok": true}')
+        
+        async def handler(request):
+            assert request.headers["accept-encoding"] == "gzip"
+            return httpx.Response(200, content=encoded, headers={"Content-Encoding": "gzip", "Content-Type": "application/json"})
+        
+        response = self._proxy(handler, {"Accept-Encoding": "gzip"})
+        assert response.body == encoded
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-length"] == str(len(encoded))
+    
+    def test_buffered_proxy_asks_for_identity_without_accept_encoding(self):
+        """Test that httpx's default codings are not offered on the client's behalf"""
+        async def handler(request):
+            assert request.headers["accept-encoding"] == "identity"
+            return httpx.Response(200, json={"ok": True})
+        
+        response = self._proxy(handler, {})
+        assert response.body == b'{"ok": true}'
+        assert "content-encoding" not in response.headers
+
+class TestResponseCache:
+    """Test the tenant-scoped response cache"""
+    
+    def _config(self, tenant_scope="tenant", **cache):
+        return ServiceConfig(
+            service_name="goal_service", base_path="/goal", internal_url="http://goal:8000",
+            healthcheck_endpoint="/health", timeout_ms=1000, tenant_scope=tenant_scope, cacheable=True,
+            retry_policy={"max_retries": 0, "backoff_ms": 1}, rbac_required=False,
+            rate_limit={"requests_per_minute": 100}, cache=cache
+        )
+    
+    def _request(self, tenant_id="tenant-a", path="/goal/goals", query=b"", headers=None, user_id="user-1"):
+        request = make_request("GET", path, headers)
+        request.scope["query_string"] = query
+        request.state.tenant_id = tenant_id
+        request.state.user_id = user_id
+        request.state.role = "Viewer"
+        return request
+    
+    def _run(self, handler, requests, config):
+        from app.main import proxy_cacheable_request
+        from app.client_pool import client_pool
+        import app.main as gateway_main
+        
+        async def run():
+            client_pool._clients["goal"] = httpx.AsyncClient(transport=RawMockTransport(handler))
+            responses = []
+            try:
+                for request in requests:
+                    context = ObservabilityManager().create_request_context("GET", request.url.path)
+                    responses.append(await proxy_cacheable_request(request, "http://goal:8000/goal/goals", "goal", config, context))
+                    await asyncio.sleep(0)
+                await asyncio.gather(*gateway_main.response_cache._background_tasks)
+            finally:
+                await client_pool._clients.pop("goal").aclose()
+            return responses
+        
+        return asyncio.run(run())
+    
+    def setup_method(self):
+        import app.main as gateway_main
+        gateway_main.response_cache = ResponseCache()
+    
+    def test_cache_key_normalizes_path_and_query(self):
+        """Test that equivalent URLs share a key and tenants never do"""
+        key = build_cache_key("t1", "Viewer", "/goal/goals/", [("b", "2"), ("a", "1")])
+        assert key == build_cache_key("t1", "Viewer", "//goal/goals", [("a", "1"), ("b", "2")])
+        assert key != build_cache_key("t2", "Viewer", "/goal/goals", [("a", "1"), ("b", "2")])
+        assert key != build_cache_key("t1", "Admin", "/goal/goals", [("a", "1"), ("b", "2")])
+    
+    def test_repeated_reads_served_from_cache(self):
+        """Test that a second identical GET does not reach the upstream"""
+        calls = []
+        
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json=[{"id": 1}], headers={"ETag": '"v1"'})
+        
+        responses = self._run(handler, [self._request(), self._request()], self._config(ttl_seconds=60))
+        assert len(calls) == 1
+        assert responses[0].headers["x-cache"] == "MISS"
+        assert responses[1].headers["x-cache"] == "HIT"
+        assert responses[1].body == responses[0].body
+    
+    def test_tenants_do_not_share_entries(self):
+        """Test tenant isolation of cached responses"""
+        calls = []
+        
+        def handler(request):
+            calls.append(request.headers["x-tenant-id"])
+            return httpx.Response(200, json={"tenant": request.headers["x-tenant-id"]})
+        
+        self._run(handler, [self._request("tenant-a"), self._request("tenant-b")], self._config(ttl_seconds=60))
+        assert calls == ["tenant-a", "tenant-b"]
+    
+    def test_users_of_user_scoped_service_do_not_share_entries(self):
+        """Test that a per-user service caches each user's response separately"""
+        calls = []
+        
+        def handler(request):
+            calls.append(request.headers["x-user-id"])
+            return httpx.Response(200, json={"user": request.headers["x-user-id"]})
+        
+        requests = [self._request(user_id="user-1"), self._request(user_id="user-2"), self._request(user_id="user-1")]
+        responses = self._run(handler, requests, self._config(tenant_scope="user", ttl_seconds=60))
+        assert calls == ["user-1", "user-2"]
+        assert responses[1].body != responses[0].body
+        assert responses[2].headers["x-cache"] == "HIT"
+    
+    def test_representation_headers_are_part_of_the_key(self):
+        """Test that requests negotiating a different language get their own entry"""
+        calls = []
+        
+        def handler(request):
+            calls.append(request.headers.get("accept-language"))
+            return httpx.Response(200, json={"lang": request.headers.get("accept-language")}, headers={"Vary": "Accept-Language"})
+        
+        requests = [
+            self._request(headers={"Accept-Language": "en"}),
+            self._request(headers={"Accept-Language": "de"}),
+            self._request(headers={"Accept-Language": "en"})
+        ]
+        responses = self._run(handler, requests, self._config(ttl_seconds=60))
+        assert calls == ["en", "de"]
+        assert responses[2].headers["x-cache"] == "HIT"
+    
+    def test_responses_varying_on_other_headers_are_not_cached(self):
+        """Test that a Vary the key cannot represent disables caching"""
+        calls = []
+        
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json=[], headers={"Vary": "Cookie"})
+        
+        self._run(handler, [self._request(), self._request()], self._config(ttl_seconds=60))
+        assert len(calls) == 2
+    
+    def test_stale_while_revalidate_uses_etag(self):
+        """Test stale entries are served immediately and revalidated with If-None-Match"""
+        calls = []
+        
+        def handler(request):
+            calls.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=[{"id": 1}], headers={"ETag": '"v1"'})
+        
+        config = self._config(ttl_seconds=0, stale_while_revalidate_seconds=60)
+        responses = self._run(handler, [self._request(), self._request()], config)
+        
+        assert responses[1].headers["x-cache"] == "STALE"
+        assert calls == [None, '"v1"']
+        import app.main as gateway_main
+        assert gateway_main.response_cache.get_metrics()["gateway_response_cache_not_modified_total"] == 1
+    
+    def test_revalidation_replaces_client_validators(self):
+        """Test that only the cached entry's ETag is sent when revalidating"""
+        calls = []
+        
+        def handler(request):
+            calls.append((request.headers.get_list("if-none-match"), request.headers.get("if-modified-since")))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=[{"id": 1}], headers={"ETag": '"v1"'})
+        
+        client_validators = {"If-None-Match": '"client"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        config = self._config(ttl_seconds=0, stale_while_revalidate_seconds=60)
+        self._run(handler, [self._request(), self._request(headers=client_validators)], config)
+        
+        assert calls[1] == (['"v1"'], None)
+    
+    def test_no_store_responses_are_not_cached(self):
+        """Test that upstream Cache-Control: no-store is honoured"""
+        calls = []
+        
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json=[], headers={"Cache-Control": "no-store"})
+        
+        self._run(handler, [self._request(), self._request()], self._config(ttl_seconds=60))
+        assert len(calls) == 2
+    
+    def test_memory_tier_is_size_bounded(self):
+        """Test that the memory tier evicts least recently used entries by bytes"""
+        from app.response_cache import build_entry
+        
+        cache = ResponseCache(max_bytes=10)
+        policy = {"ttl_seconds": 60, "stale_while_revalidate_seconds": 0}
+        asyncio.run(cache.set("a", build_entry(200, {}, b"123456", policy, time.time())))
+        asyncio.run(cache.set("b", build_entry(200, {}, b"123456", policy, time.time())))
+        
+        assert asyncio.run(cache.get("a")) is None
+        assert asyncio.run(cache.get("b")) is not None
+        assert cache.get_metrics()["gateway_response_cache_bytes"] == 6
+
+class TestSingleFlight:
+    """Test request coalescing"""
+    
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that identical in-flight calls run once and fan out"""
+        flight = SingleFlight()
+        calls = {"count": 0}
+        
+        async def fetch():
+            calls["count"] += 1
+            await asyncio.sleep(0.01)
+            return "payload"
+        
+        async def run():
+            return await asyncio.gather(*[flight.do("key", fetch) for _ in range(5)])
+        
+        assert asyncio.run(run()) == ["payload"] * 5
+        assert calls["count"] == 1
+        assert flight.get_metrics()["gateway_upstream_calls_saved_total"] == 4
+        assert flight.get_metrics()["gateway_coalesced_in_flight"] == 0
+    
+    def test_errors_fan_out_and_key_is_released(self):
+        """Test that a failed call is reported to all waiters and not reused"""
+        flight = SingleFlight()
+        
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+        
+        async def run():
+            return await asyncio.gather(*[flight.do("key", failing) for _ in range(3)], return_exceptions=True)
+        
+        results = asyncio.run(run())
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert asyncio.run(flight.do("key", lambda: asyncio.sleep(0, result="ok"))) == "ok"
+    
+    def test_leader_cancellation_does_not_cancel_waiters(self):
+        """Test that a disconnecting first caller leaves the shared call running"""
+        flight = SingleFlight()
+        
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "payload"
+        
+        async def run():
+            leader = asyncio.ensure_future(flight.do("key", fetch))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do("key", fetch))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await follower
+        
+        assert asyncio.run(run()) == "payload"
+    
+    def test_proxy_coalesces_identical_gets(self):
+        """Test that concurrent identical proxied GETs reach the upstream once"""
+        from app.main import proxy_coalesced_request
+        from app.client_pool import client_pool
+        
+        calls = []
+        config = ServiceConfig(
+            service_name="goal_service", base_path="/goal", internal_url="http://goal:8000",
+            healthcheck_endpoint="/health", timeout_ms=1000, tenant_scope="tenant", cacheable=False,
+            retry_policy={"max_retries": 0, "backoff_ms": 1}, rbac_required=False,
+            rate_limit={"requests_per_minute": 100}
+        )
+        
+        async def handler(request):
+            calls.append(request.url.path)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=[{"id": 1}])
+        
+        def request_for(tenant_id):
+            request = make_request("GET", "/goal/goals")
+            request.state.tenant_id = tenant_id
+            request.state.role = "Viewer"
+            return request
+        
+        async def run():
+            client_pool._clients["goal"] = httpx.AsyncClient(transport=RawMockTransport(handler))
+            try:
+                requests = [request_for("tenant-a") for _ in range(4)] + [request_for("tenant-b")]
+                return await asyncio.gather(*[
+                    proxy_coalesced_request(
+                        request, "http://goal:8000/goal/goals", "goal", config,
+                        ObservabilityManager().create_request_context("GET", "/goal/goals")
+                    )
+                    for request in requests
+                ])
+            finally:
+                await client_pool._clients.pop("goal").aclose()
+        
+        responses = asyncio.run(run())
+        assert len(calls) == 2
+        assert all(response.status_code == 200 for response in responses)
+        assert len({id(response) for response in responses}) == 5
+    
+    def test_users_never_share_a_flight_to_uncacheable_services(self):
+        """Test that concurrent GETs from two users of one tenant each reach the upstream"""
+        from app.main import forward_request
+        from app.client_pool import client_pool
+        
+        calls = []
+        config = ServiceConfig(
+            service_name="auth_service", base_path="/auth", internal_url="http://auth:8000",
+            healthcheck_endpoint="/health", timeout_ms=1000, tenant_scope="tenant", cacheable=False,
+            retry_policy={"max_retries": 0, "backoff_ms": 1}, rbac_required=False,
+            rate_limit={"requests_per_minute": 100}
+        )
+        
+        async def handler(request):
+            calls.append(request.headers["x-user-id"])
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"user": request.headers["x-user-id"]})
+        
+        def request_for(user_id):
+            request = make_request("GET", "/auth/user")
+            request.state.tenant_id = "t1"
+            request.state.user_id = user_id
+            request.state.role = "Viewer"
+            return request
+        
+        async def run():
+            client_pool._clients["auth"] = httpx.AsyncClient(transport=RawMockTransport(handler))
+            try:
+                return await asyncio.gather(*[
+                    forward_request(
+                        request_for(user_id), "auth", config,
+                        ObservabilityManager().create_request_context("GET", "/auth/user")
+                    )
+                    for user_id in ("alice", "bob")
+                ])
+            finally:
+                await client_pool._clients.pop("auth").aclose()
+        
+        with patch('app.service_registry.ServiceRegistry.is_service_healthy', return_value=True):
+            responses = asyncio.run(run())
+        assert sorted(calls) == ["alice", "bob"]
+        assert [json.loads(response.body) for response in responses] == [{"user": "alice"}, {"user": "bob"}]
+
 class TestRBACValidator:
     """Test RBAC validation logic"""
     
@@ -96,6 +1649,40 @@ class TestRBACValidator:
         assert self.validator.validate_request_permission(context, "assessment", "GET")
         assert self.validator.validate_request_permission(context, "assessment", "PUT")
         assert not self.validator.validate_request_permission(context, "assessment", "DELETE")
+    
+    def test_decision_table_matches_request_validation(self):
+        """Test that every compiled decision equals validate_request_permission's answer"""
+        services = ["assessment", "auth_service", "analytics_service", "gateway_service"]
+        self.validator.compile_decision_table({service_key: None for service_key in services})
+        
+        roles = [role.value for role in Role] + ["Superuser"]
+        methods = ["GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE", "PROPFIND"]
+        for role in roles:
+            context = self.validator.create_context("user-1", "tenant-1", role)
+            for service_key in services + ["goal", "business_capability"]:
+                for method in methods:
+                    expected = self.validator.validate_request_permission(context, service_key.replace("_", ""), method)
+                    assert self.validator.is_allowed(role, service_key, method) == expected, (role, service_key, method)
+    
+    def test_decision_table_fallbacks(self):
+        """Test unknown roles, methods and services"""
+        self.validator.compile_decision_table({"assessment": None})
+        
+        assert self.validator.is_allowed("Editor", "assessment", "PATCH")
+        assert not self.validator.is_allowed("Editor", "assessment", "DELETE")
+        assert not self.validator.is_allowed("Superuser", "assessment", "POST")
+        assert self.validator.is_allowed("Superuser", "assessment", "GET")
+        assert self.validator.is_allowed("Viewer", "assessment", "PROPFIND")
+        # Not in the compiled catalog: compiled on first use, unknown resources are denied
+        assert self.validator.is_allowed("Owner", "goal", "DELETE")
+        assert not self.validator.is_allowed("Owner", "analytics_service", "GET")
+    
+    def test_decision_logging_is_sampled(self):
+        """Test that denials are always logged and grants only when sampled"""
+        validator = RBACValidator(log_sample_rate=0.0)
+        assert validator.should_log_decision(False)
+        assert not any(validator.should_log_decision(True) for _ in range(100))
+        assert RBACValidator(log_sample_rate=1.0).should_log_decision(True)
 
 class TestObservabilityManager:
     """Test observability functionality"""
@@ -140,6 +1727,175 @@ class TestObservabilityManager:
         # Should not raise exception
         self.manager.log_rbac_decision(context, "assessment", "GET", True, "Admin")
 
+class TestStructuredLogSink:
+    """Test the queue-backed, sampled log writer"""
+    
+    def _manager(self, sink):
+        manager = ObservabilityManager()
+        patcher = patch('app.observability.log_sink', sink)
+        patcher.start()
+        self._patchers.append(patcher)
+        return manager
+    
+    def setup_method(self):
+        self._patchers = []
+    
+    def teardown_method(self):
+        for patcher in self._patchers:
+            patcher.stop()
+    
+    def test_background_writer_emits_batched_json_lines(self):
+        """Test that queued records are written as JSON lines off the request path"""
+        import io
+        import json
+        stream = io.StringIO()
+        sink = StructuredLogSink(sample_rate=1.0, stream=stream, flush_interval_seconds=0.01)
+        
+        async def run():
+            sink.start()
+            for index in range(3):
+                sink.emit(logging.INFO, "Request completed", {"event": "request_end", "index": index})
+            assert stream.getvalue() == ""
+            await sink.stop()
+        
+        asyncio.run(run())
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [line["index"] for line in lines] == [0, 1, 2]
+        assert lines[0]["level"] == "INFO"
+        assert lines[0]["message"] == "Request completed"
+        assert sink.get_metrics()["gateway_log_records_written_total"] == 3
+    
+    def test_full_queue_drops_records(self):
+        """Test that a full queue drops records instead of blocking"""
+        sink = StructuredLogSink(max_queue=2)
+        
+        async def run():
+            sink.start()
+            for _ in range(5):
+                sink.emit(logging.INFO, "Request started", {})
+            assert sink.get_metrics()["gateway_log_records_dropped_total"] == 3
+            sink._queue.clear()
+            await sink.stop()
+        
+        asyncio.run(run())
+    
+    def test_unsampled_success_is_not_logged(self):
+        """Test that unsampled successful requests produce no log records"""
+        sink = StructuredLogSink(sample_rate=0.0)
+        emitted = []
+        sink.emit = lambda *record: emitted.append(record)
+        manager = self._manager(sink)
+        
+        context = manager.create_request_context("GET", "/reports/daily")
+        assert not context.sampled
+        manager.log_request_start(context)
+        manager.log_service_response(context, "reports", 200, 5.0)
+        manager.log_request_end(context, 200)
+        assert emitted == []
+    
+    def test_unsampled_error_and_slow_requests_are_logged_in_full(self):
+        """Test that errors and slow requests flush their held events"""
+        sink = StructuredLogSink(sample_rate=0.0, slow_request_ms=1000)
+        emitted = []
+        sink.emit = lambda *record: emitted.append(record)
+        manager = self._manager(sink)
+        
+        context = manager.create_request_context("GET", "/reports/daily")
+        manager.log_request_start(context)
+        manager.log_request_end(context, 502)
+        assert [record[2]["event"] for record in emitted] == ["request_start", "request_end"]
+        
+        emitted.clear()
+        context = manager.create_request_context("GET", "/reports/daily")
+        context.start_time -= 2
+        manager.log_request_start(context)
+        manager.log_request_end(context, 200)
+        assert [record[2]["event"] for record in emitted] == ["request_start", "request_end"]
+    
+    def test_warnings_bypass_sampling(self):
+        """Test that RBAC denials are logged even for unsampled requests"""
+        sink = StructuredLogSink(sample_rate=0.0)
+        emitted = []
+        sink.emit = lambda *record: emitted.append(record)
+        manager = self._manager(sink)
+        
+        context = manager.create_request_context("DELETE", "/reports/daily")
+        manager.log_rbac_decision(context, "reports", "DELETE", False, "Viewer")
+        assert emitted[0][0] == logging.WARNING
+
+class TestPrometheusMetrics:
+    """Test Prometheus histograms, counters and gauges"""
+    
+    def _sample(self, metrics, name, labels=None):
+        return metrics.registry.get_sample_value(name, labels or {})
+    
+    def test_labels_are_bounded(self):
+        """Test that methods and status codes collapse into a fixed label set"""
+        assert method_label("get") == "GET"
+        assert method_label("PROPFIND") == "OTHER"
+        assert status_class(204) == "2xx"
+        assert status_class(503) == "5xx"
+        assert status_class(999) == "unknown"
+    
+    def test_request_duration_is_split_into_upstream_and_overhead(self):
+        """Test that gateway overhead excludes time spent waiting on upstreams"""
+        metrics = GatewayMetrics()
+        metrics.request_started()
+        assert self._sample(metrics, "gateway_requests_in_flight") == 1
+        
+        metrics.upstream_response("reports", "GET", 200, 80.0)
+        metrics.request_finished("reports", "GET", 200, 100.0, 80.0)
+        
+        assert self._sample(metrics, "gateway_requests_in_flight") == 0
+        labels = {"service_key": "reports", "method": "GET", "status_class": "2xx"}
+        assert self._sample(metrics, "gateway_request_duration_seconds_sum", labels) == pytest.approx(0.1)
+        assert self._sample(metrics, "gateway_upstream_duration_seconds_sum", labels) == pytest.approx(0.08)
+        assert self._sample(
+            metrics, "gateway_overhead_seconds_sum", {"service_key": "reports", "method": "GET"}
+        ) == pytest.approx(0.02)
+    
+    def test_service_response_accumulates_upstream_time(self):
+        """Test that log_service_response feeds upstream time into the request context"""
+        manager = ObservabilityManager()
+        context = manager.create_request_context("GET", "/reports/daily")
+        manager.log_service_response(context, "reports", 200, 30.0)
+        manager.log_service_response(context, "reports", 200, 20.0)
+        assert context.upstream_ms == 50.0
+    
+    def test_retry_and_circuit_counters(self):
+        """Test retry decision and circuit-open counters"""
+        metrics = GatewayMetrics()
+        metrics.retry_decision("reports", True)
+        metrics.retry_decision("reports", False)
+        metrics.circuit_opened("reports", "passive")
+        
+        assert self._sample(metrics, "gateway_upstream_retries_total", {"service_key": "reports", "outcome": "retried"}) == 1
+        assert self._sample(metrics, "gateway_upstream_retries_total", {"service_key": "reports", "outcome": "budget_exhausted"}) == 1
+        assert self._sample(metrics, "gateway_circuit_open_total", {"service_key": "reports", "detector": "passive"}) == 1
+    
+    def test_passive_circuit_open_is_counted(self):
+        """Test that the registry counts a passive circuit opening once"""
+        registry = ServiceRegistry()
+        registry.passive_circuit_settings = {"min_requests": 2, "error_rate_threshold": 0.5}
+        registry.circuits["analytics_service"] = ServiceCircuit("analytics_service", registry.passive_circuit_settings)
+        labels = {"service_key": "analytics_service", "detector": "passive"}
+        before = gateway_metrics.registry.get_sample_value("gateway_circuit_open_total", labels) or 0
+        
+        for _ in range(4):
+            registry.record_outcome("analytics_service", False, 10.0)
+        
+        assert gateway_metrics.registry.get_sample_value("gateway_circuit_open_total", labels) == before + 1
+    
+    def test_metrics_endpoint_serves_prometheus_text_to_scrapers(self):
+        """Test that scrapers get the text exposition format and other callers keep JSON"""
+        response = client.get("/metrics", headers={"Accept": "text/plain;version=0.0.4"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE gateway_request_duration_seconds histogram" in response.text
+        assert "gateway_requests_in_flight" in response.text
+        
+        assert "gateway_uptime_seconds" in client.get("/metrics").json()
+
 class TestGatewayEndpoints:
     """Test gateway API endpoints"""
     
@@ -325,6 +2081,237 @@ class TestFaultTolerance:
             assert response.status_code == 503
             assert "currently unavailable" in response.json()["detail"]
 
+class TestGatewayPipeline:
+    """Test the pure-ASGI middleware pipeline"""
+    
+    def _headers(self, role="Admin"):
+        from app.middleware import SECRET_KEY, ALGORITHM
+        payload = {"user_id": "user123", "tenant_id": "tenant456", "role": role, "exp": time.time() + 3600}
+        return {"Authorization": f"Bearer {jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)}"}
+    
+    def test_public_paths_skip_auth(self):
+        """Test that gateway endpoints are served without a token"""
+        assert client.get("/health").status_code == 200
+        assert client.get("/metrics").status_code == 200
+    
+    def test_rejection_returns_json_error(self):
+        """Test that stage rejections become JSON error responses"""
+        response = client.get("/gateway/analytics/reports")
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Missing or invalid authorization header"}
+    
+    def test_rbac_stage_denies_viewer_delete(self):
+        """Test RBAC enforcement inside the pipeline"""
+        with patch('app.middleware.resolve_request_service') as mock_resolve:
+            mock_resolve.return_value = ("assessment", Mock(rbac_required=True, rate_limit={}))
+            response = client.delete("/assessment/assessments/123", headers=self._headers("Viewer"))
+        
+        assert response.status_code == 403
+        assert "assessment:delete" in response.json()["detail"]
+    
+    def test_identity_reaches_proxy_handler(self):
+        """Test that identity and the request context are shared with the proxy handler"""
+        from fastapi import Response
+        captured = {}
+        
+        async def fake_proxy(request, target_url, service_key, config, context, **kwargs):
+            captured["user_id"] = request.state.user_id
+            captured["context"] = context
+            return Response(content=b"ok", status_code=200)
+        
+        with patch('app.main.proxy_request_with_retry', side_effect=fake_proxy), \
+             patch('app.rbac.RBACValidator.is_allowed', return_value=True), \
+             patch('app.service_registry.ServiceRegistry.is_service_healthy', return_value=True):
+            response = client.get("/gateway/analytics/reports", headers=self._headers())
+        
+        assert response.status_code == 200
+        assert captured["user_id"] == "user123"
+        assert captured["context"].tenant_id == "tenant456"
+        assert captured["context"].service_target == "analytics_service"
+
+class TestBatchEndpoint:
+    """Test the /batch fan-out endpoint"""
+    
+    def _headers(self, role="Admin"):
+        from app.middleware import SECRET_KEY, ALGORITHM
+        payload = {"user_id": "user123", "tenant_id": "tenant456", "role": role, "exp": time.time() + 3600}
+        return {"Authorization": f"Bearer {jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)}"}
+    
+    def _post(self, requests, role="Admin", permission=True):
+        from fastapi import Response
+        calls = []
+        
+        async def fake_proxy(request, target_url, service_key, config, context, **kwargs):
+            calls.append((request.method, target_url, await request.body(), request.state.user_id))
+            return Response(content=b'{"ok": true}', status_code=200, media_type="application/json")
+        
+        rbac_mock = Mock(return_value=permission)
+        with patch('app.main.proxy_request_with_retry', side_effect=fake_proxy), \
+             patch('app.main.proxy_coalesced_request', side_effect=fake_proxy), \
+             patch('app.rbac.RBACValidator.is_allowed', rbac_mock), \
+             patch('app.service_registry.ServiceRegistry.is_service_healthy', return_value=True):
+            response = client.post("/batch", json={"requests": requests}, headers=self._headers(role))
+        return response, calls, rbac_mock
+    
+    def test_requires_authentication(self):
+        """Test that the batch itself is authenticated"""
+        response = client.post("/batch", json={"requests": [{"path": "/gateway/analytics/reports"}]})
+        assert response.status_code == 401
+    
+    def test_fans_out_with_per_request_status(self):
+        """Test that each sub-request is routed and reports its own status"""
+        response, calls, _ = self._post([
+            {"id": "reports", "path": "/gateway/analytics/reports", "query": {"page": "2"}},
+            {"id": "login", "method": "POST", "path": "/gateway/auth/sessions", "body": {"name": "x"}},
+            {"id": "missing", "path": "/unknown/thing"},
+        ])
+        
+        assert response.status_code == 200
+        results = {result["id"]: result for result in response.json()["responses"]}
+        assert results["reports"]["status"] == 200
+        assert results["reports"]["body"] == {"ok": True}
+        assert results["login"]["status"] == 200
+        assert results["missing"]["status"] == 404
+        
+        assert len(calls) == 2
+        method, target_url, body, user_id = next(call for call in calls if call[0] == "POST")
+        assert target_url.endswith("/gateway/auth/sessions")
+        assert body == b'{"name": "x"}'
+        assert user_id == "user123"
+    
+    def test_rbac_checked_once_per_service_and_method(self):
+        """Test that repeated sub-requests reuse one RBAC decision"""
+        response, calls, rbac_mock = self._post([
+            {"path": "/gateway/analytics/reports/1"},
+            {"path": "/gateway/analytics/reports/2"},
+            {"path": "/gateway/analytics/reports/3"},
+        ])
+        
+        assert response.status_code == 200
+        assert len(calls) == 3
+        assert rbac_mock.call_count == 1
+    
+    def test_denied_sub_requests_do_not_fail_the_batch(self):
+        """Test that RBAC denials are reported per sub-request"""
+        response, calls, _ = self._post([{"path": "/gateway/analytics/reports"}], role="Viewer", permission=False)
+        
+        assert response.status_code == 200
+        assert response.json()["responses"][0]["status"] == 403
+        assert calls == []
+    
+    def test_rejects_oversized_and_nested_batches(self):
+        """Test batch size limit and nesting guard"""
+        from app.batch import BATCH_MAX_REQUESTS
+        response, _, _ = self._post([{"path": "/gateway/analytics/x"}] * (BATCH_MAX_REQUESTS + 1))
+        assert response.status_code == 413
+        
+        response, _, _ = self._post([{"path": "/batch"}])
+        assert response.json()["responses"][0]["status"] == 400
+    
+    def test_concurrency_is_capped(self):
+        """Test that no more than max_concurrency sub-requests run at once"""
+        from fastapi import Response
+        from app.batch import BatchExecutor, BatchRequest
+        
+        running = {"now": 0, "peak": 0}
+        
+        async def forward(request, service_key, config, context):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            return Response(content=b"ok", status_code=200)
+        
+        parent = make_request("POST", "/batch")
+        parent.state.user_id = "user123"
+        parent.state.tenant_id = "tenant456"
+        parent.state.role = "Admin"
+        parent.state.observability_context = ObservabilityManager().create_request_context("POST", "/batch")
+        batch = BatchRequest(requests=[{"path": f"/gateway/auth/items/{i}"} for i in range(8)])
+        
+        with patch('app.rbac.RBACValidator.is_allowed', return_value=True):
+            results = asyncio.run(BatchExecutor(max_concurrency=3).run(parent, batch, forward))
+        
+        assert [result["status"] for result in results] == [200] * 8
+        assert running["peak"] == 3
+
+class TestVerifiedTokenCache:
+    """Test the verified-JWT cache"""
+    
+    def test_hit_and_miss_counters(self):
+        """Test that cached claims are returned and counted"""
+        cache = VerifiedTokenCache(max_size=10)
+        payload = {"user_id": "u1", "tenant_id": "t1", "exp": time.time() + 3600}
+        
+        assert cache.get("token-a") is None
+        cache.put("token-a", payload)
+        assert cache.get("token-a") == payload
+        
+        metrics = cache.get_metrics()
+        assert metrics["gateway_jwt_cache_hits_total"] == 1
+        assert metrics["gateway_jwt_cache_misses_total"] == 1
+    
+    def test_entries_expire_at_token_exp(self):
+        """Test that a cached token is not served past its exp claim"""
+        cache = VerifiedTokenCache(max_size=10)
+        cache.put("token-a", {"user_id": "u1", "tenant_id": "t1", "exp": time.time() + 60})
+        
+        with patch('app.token_cache.time.time', return_value=time.time() + 120):
+            assert cache.get("token-a") is None
+    
+    def test_lru_bound(self):
+        """Test that the least recently used entry is evicted at capacity"""
+        cache = VerifiedTokenCache(max_size=2)
+        for token in ("token-a", "token-b"):
+            cache.put(token, {"user_id": token, "tenant_id": "t1", "exp": time.time() + 3600})
+        cache.get("token-a")
+        cache.put("token-c", {"user_id": "c", "tenant_id": "t1", "exp": time.time() + 3600})
+        
+        assert cache.get("token-b") is None
+        assert cache.get("token-a") is not None
+        assert cache.get_metrics()["gateway_jwt_cache_evictions_total"] == 1
+    
+    def test_revocation(self):
+        """Test that revoked tokens are evicted and never re-cached"""
+        cache = VerifiedTokenCache(max_size=10)
+        payload = {"user_id": "u1", "tenant_id": "t1", "exp": time.time() + 3600}
+        cache.put("token-a", payload)
+        
+        cache.revoke("token-a")
+        assert cache.is_revoked("token-a")
+        assert cache.get("token-a") is None
+        cache.put("token-a", payload)
+        assert cache.get("token-a") is None
+    
+    def test_pipeline_decodes_token_once(self):
+        """Test that repeated requests with one token skip jwt.decode"""
+        from app.middleware import SECRET_KEY, ALGORITHM
+        from app.token_cache import token_cache
+        
+        token_cache.clear()
+        payload = {"user_id": "cache-user", "tenant_id": "tenant456", "role": "Admin", "exp": time.time() + 3600}
+        headers = {"Authorization": f"Bearer {jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)}"}
+        
+        with patch('app.middleware.jwt.decode', wraps=jwt.decode) as mock_decode:
+            client.get("/unknown-service/endpoint", headers=headers)
+            client.get("/unknown-service/endpoint", headers=headers)
+        
+        assert mock_decode.call_count == 1
+        assert "gateway_jwt_cache_hits_total" in ObservabilityManager().get_metrics()
+    
+    def test_revoked_token_rejected(self):
+        """Test that the pipeline rejects revoked tokens"""
+        from app.middleware import SECRET_KEY, ALGORITHM
+        from app.token_cache import token_cache
+        
+        payload = {"user_id": "revoked-user", "tenant_id": "tenant456", "role": "Admin", "exp": time.time() + 3600}
+        token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+        token_cache.revoke(token)
+        
+        response = client.get("/unknown-service/endpoint", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Token has been revoked"
+
 class TestRateLimiting:
     """Test rate limiting functionality"""
     
@@ -339,13 +2326,64 @@ class TestRateLimiting:
         token = jwt.encode(payload, "REPLACE_WITH_REAL_SECRET", algorithm="HS256")
         headers = {"Authorization": f"Bearer {token}"}
         
-        # Mock rate limit store to simulate exceeded limit
-        with patch('app.middleware.rate_limit_store') as mock_store:
-            mock_store.__getitem__.return_value = [time.time()] * 150  # Exceed limit
+        # Mock the rate limiter to simulate exceeded limit
+        with patch('app.rate_limiter.RateLimiter.check', new_callable=AsyncMock) as mock_check:
+            mock_check.return_value = RateLimitDecision(allowed=False, retry_after_seconds=1.5)
             
             response = client.get("/assessment/assessments", headers=headers)
             assert response.status_code == 429
             assert "Rate limit exceeded" in response.json()["detail"]
+    
+    def test_token_bucket_allows_burst_then_rejects(self):
+        """Test GCRA admits the configured burst and then reports a wait time"""
+        limiter = RateLimiter(InMemoryRateLimitBackend())
+        limits = {"requests_per_minute": 60, "burst": 3}
+        
+        async def run():
+            return [await limiter.check("assessment", "user123", limits) for _ in range(4)]
+        
+        decisions = asyncio.run(run())
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert 0 < decisions[-1].retry_after_seconds <= 1.0
+        assert limiter.retry_after_header(decisions[-1]) == "1"
+    
+    def test_limits_are_per_service_and_user(self):
+        """Test that keys are isolated by service and user"""
+        limiter = RateLimiter(InMemoryRateLimitBackend())
+        limits = {"requests_per_minute": 1}
+        
+        async def run():
+            return [
+                (await limiter.check("assessment", "user1", limits)).allowed,
+                (await limiter.check("assessment", "user1", limits)).allowed,
+                (await limiter.check("assessment", "user2", limits)).allowed,
+                (await limiter.check("goal", "user1", limits)).allowed,
+            ]
+        
+        assert asyncio.run(run()) == [True, False, True, True]
+    
+    def test_constant_state_and_stale_eviction(self):
+        """Test that each key holds one value and refilled keys are swept"""
+        backend = InMemoryRateLimitBackend(sweep_interval_seconds=0)
+        limiter = RateLimiter(backend)
+        
+        async def run():
+            for _ in range(50):
+                await limiter.check("assessment", "user1", {"requests_per_minute": 1000})
+        
+        asyncio.run(run())
+        assert backend.get_metrics()["tracked_keys"] == 1
+        
+        with patch('app.rate_limiter.time.monotonic', return_value=time.monotonic() + 120):
+            asyncio.run(limiter.check("assessment", "user2", {"requests_per_minute": 1000}))
+        assert backend.get_metrics()["tracked_keys"] == 1
+    
+    def test_redis_backend_falls_back_when_unreachable(self):
+        """Test that an unreachable Redis degrades to in-process limiting"""
+        backend = RedisRateLimitBackend("redis://127.0.0.1:1/0")
+        decision = asyncio.run(backend.acquire("assessment:user1", 60, 1))
+        assert decision.allowed
+        assert backend.get_metrics()["fallback_total"] == 1
 
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
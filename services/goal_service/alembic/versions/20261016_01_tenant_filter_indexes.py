@@ -0,0 +1,42 @@
+"""
+Tenant-scoped composite indexes for the list and get_*_by_* filters
+
+Revision ID: 20261016_01_tenant_filter_indexes
+Revises: 
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261016_01_tenant_filter_indexes'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index, table, columns), matching __table_args__ in app/models.py
+INDEXES = [
+    ("ix_goal_tenant_created_at_id", "goal", ["tenant_id", "created_at", "id"]),
+    ("ix_goal_tenant_goal_type", "goal", ["tenant_id", "goal_type"]),
+    ("ix_goal_tenant_priority", "goal", ["tenant_id", "priority"]),
+    ("ix_goal_tenant_status", "goal", ["tenant_id", "status"]),
+    ("ix_goal_tenant_stakeholder_id", "goal", ["tenant_id", "stakeholder_id"]),
+    ("ix_goal_tenant_business_actor_id", "goal", ["tenant_id", "business_actor_id"]),
+    ("ix_goal_tenant_origin_driver_id", "goal", ["tenant_id", "origin_driver_id"]),
+    ("ix_goal_tenant_target_date", "goal", ["tenant_id", "target_date"]),
+    ("ix_goal_tenant_progress_percentage", "goal", ["tenant_id", "progress_percentage"]),
+    ("ix_goal_link_linked_element", "goal_link", ["linked_element_type", "linked_element_id"]),
+]
+
+def upgrade():
+    # Tables are created by the service at startup and may already hold data, so
+    # build concurrently without blocking writes; CONCURRENTLY cannot run in a
+    # transaction. Databases created after this revision already have the
+    # indexes from the models, hence IF NOT EXISTS.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -9,6 +9,18 @@ Base = declarative_base()
 
 class Goal(Base):
     __tablename__ = "goal"
+    __table_args__ = (
+        # Tenant-scoped filters used by the list and get_*_by_* queries
+        Index("ix_goal_tenant_created_at_id", "tenant_id", "created_at", "id"),
+        Index("ix_goal_tenant_goal_type", "tenant_id", "goal_type"),
+        Index("ix_goal_tenant_priority", "tenant_id", "priority"),
+        Index("ix_goal_tenant_status", "tenant_id", "status"),
+        Index("ix_goal_tenant_stakeholder_id", "tenant_id", "stakeholder_id"),
+        Index("ix_goal_tenant_business_actor_id", "tenant_id", "business_actor_id"),
+        Index("ix_goal_tenant_origin_driver_id", "tenant_id", "origin_driver_id"),
+        Index("ix_goal_tenant_target_date", "tenant_id", "target_date"),
+        Index("ix_goal_tenant_progress_percentage", "tenant_id", "progress_percentage"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False)
@@ -64,6 +76,10 @@ class Goal(Base):
 
 class GoalLink(Base):
     __tablename__ = "goal_link"
+    __table_args__ = (
+        # Link lookups by element, used by get_*_by_element
+        Index("ix_goal_link_linked_element", "linked_element_type", "linked_element_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     goal_id = Column(UUID(as_uuid=True), ForeignKey("goal.id"), nullable=False)
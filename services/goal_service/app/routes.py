@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 from . import schemas, services, deps
+from .pagination import use_offset, set_next_cursor
 from .models import Goal, GoalLink
 
 router = APIRouter(prefix="/goals", tags=["Goals"])
@@ -21,8 +22,10 @@ def create_goal(
 
 @router.get("/", response_model=List[schemas.Goal])
 def list_goals(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
     goal_type: Optional[str] = Query(None),
     priority: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
@@ -34,11 +37,18 @@ def list_goals(
     tenant_id: UUID = Depends(deps.get_current_tenant),
     rbac=Depends(deps.rbac_check("goal:read"))
 ):
-    """List goals with filtering and pagination"""
-    return services.get_goals(
-        db, tenant_id, skip, limit, goal_type, priority, status, 
+    """List goals with filtering and pagination, newest first; the X-Next-Cursor header holds the next page's cursor"""
+    if use_offset(skip, cursor):
+        return services.get_goals(
+            db, tenant_id, skip, limit, goal_type, priority, status, 
+            stakeholder_id, business_actor_id, origin_driver_id, parent_goal_id
+        )
+    goals, next_cursor = services.get_goals_page(
+        db, tenant_id, cursor, limit, goal_type, priority, status, 
         stakeholder_id, business_actor_id, origin_driver_id, parent_goal_id
     )
+    set_next_cursor(response, next_cursor)
+    return goals
 
 @router.get("/{goal_id}", response_model=schemas.Goal)
 def get_goal(
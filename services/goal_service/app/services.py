@@ -2,9 +2,10 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 from .models import Goal, GoalLink
 from .schemas import GoalCreate, GoalUpdate, GoalLinkCreate, GoalLinkUpdate
+from .pagination import keyset_page, split_page
 from fastapi import HTTPException
 from uuid import UUID
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
 import redis
 import json
@@ -68,11 +69,9 @@ def get_goal(db: Session, goal_id: UUID, tenant_id: UUID) -> Goal:
     
     return goal
 
-def get_goals(
+def goals_query(
     db: Session, 
     tenant_id: UUID, 
-    skip: int = 0, 
-    limit: int = 100,
     goal_type: Optional[str] = None,
     priority: Optional[str] = None,
     status: Optional[str] = None,
@@ -80,8 +79,8 @@ def get_goals(
     business_actor_id: Optional[UUID] = None,
     origin_driver_id: Optional[UUID] = None,
     parent_goal_id: Optional[UUID] = None
-) -> List[Goal]:
-    """Get goals with filtering and pagination"""
+):
+    """Tenant goals query with the list filters applied, shared by offset and keyset paging"""
     query = db.query(Goal).filter(Goal.tenant_id == tenant_id)
     
     if goal_type:
@@ -99,7 +98,49 @@ def get_goals(
     if parent_goal_id:
         query = query.filter(Goal.parent_goal_id == parent_goal_id)
     
-    return query.offset(skip).limit(limit).all()
+    return query
+
+def get_goals(
+    db: Session, 
+    tenant_id: UUID, 
+    skip: int = 0, 
+    limit: int = 100,
+    goal_type: Optional[str] = None,
+    priority: Optional[str] = None,
+    status: Optional[str] = None,
+    stakeholder_id: Optional[UUID] = None,
+    business_actor_id: Optional[UUID] = None,
+    origin_driver_id: Optional[UUID] = None,
+    parent_goal_id: Optional[UUID] = None
+) -> List[Goal]:
+    """Get goals with filtering and pagination"""
+    query = goals_query(
+        db, tenant_id, goal_type, priority, status,
+        stakeholder_id, business_actor_id, origin_driver_id, parent_goal_id
+    )
+    
+    return query.order_by(Goal.created_at.desc(), Goal.id.desc()).offset(skip).limit(limit).all()
+
+def get_goals_page(
+    db: Session, 
+    tenant_id: UUID, 
+    cursor: Optional[str] = None, 
+    limit: int = 100,
+    goal_type: Optional[str] = None,
+    priority: Optional[str] = None,
+    status: Optional[str] = None,
+    stakeholder_id: Optional[UUID] = None,
+    business_actor_id: Optional[UUID] = None,
+    origin_driver_id: Optional[UUID] = None,
+    parent_goal_id: Optional[UUID] = None
+) -> Tuple[List[Goal], Optional[str]]:
+    """Get one keyset page of goals with filtering, and the cursor for the next page"""
+    query = goals_query(
+        db, tenant_id, goal_type, priority, status,
+        stakeholder_id, business_actor_id, origin_driver_id, parent_goal_id
+    )
+    
+    return split_page(keyset_page(query, Goal, cursor, limit).all(), limit)
 
 def update_goal(
     db: Session, 
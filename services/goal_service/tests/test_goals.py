@@ -6,6 +6,8 @@ from sqlalchemy.pool import StaticPool
 from uuid import uuid4
 import jwt
 import os
+import base64
+import json
 from datetime import datetime, timedelta
 
 from app.main import app
@@ -166,6 +168,40 @@ class TestGoalCRUD:
         assert isinstance(data, list)
         assert len(data) > 0
     
+    def test_get_goals_cursor_pagination(self, auth_headers, test_goal_data):
+        """Test following X-Next-Cursor through every page of goals"""
+        created_ids = set()
+        for i in range(5):
+            goal_data = {**test_goal_data, "name": f"Paged Goal {i}"}
+            created_ids.add(client.post("/goals/", json=goal_data, headers=auth_headers).json()["id"])
+        
+        seen_ids = []
+        response = client.get("/goals/?limit=2", headers=auth_headers)
+        while True:
+            assert response.status_code == 200
+            assert len(response.json()) <= 2
+            seen_ids.extend(goal["id"] for goal in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            response = client.get(f"/goals/?limit=2&cursor={cursor}", headers=auth_headers)
+        
+        assert len(seen_ids) == len(set(seen_ids))
+        assert created_ids <= set(seen_ids)
+    
+    def test_get_goals_invalid_cursor(self, auth_headers):
+        """Test that malformed cursors and skip with cursor are rejected"""
+        response = client.get("/goals/?cursor=not-a-cursor", headers=auth_headers)
+        assert response.status_code == 400
+        
+        response = client.get("/goals/?skip=10&cursor=not-a-cursor", headers=auth_headers)
+        assert response.status_code == 400
+        
+        # Well-formed JSON with the wrong field types
+        cursor = base64.urlsafe_b64encode(json.dumps(["2024-01-01T00:00:00", 5]).encode()).decode()
+        response = client.get(f"/goals/?cursor={cursor}", headers=auth_headers)
+        assert response.status_code == 400
+    
     def test_get_goal(self, auth_headers, test_goal_data):
         """Test getting a specific goal"""
         # Create a goal first
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, JSON
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -9,6 +9,14 @@ Base = declarative_base()
 
 class Node(Base):
     __tablename__ = "node"
+    __table_args__ = (
+        # Tenant-scoped filters used by the list and get_*_by_* queries
+        Index("ix_node_tenant_node_type", "tenant_id", "node_type"),
+        Index("ix_node_tenant_environment", "tenant_id", "environment"),
+        Index("ix_node_tenant_region", "tenant_id", "region"),
+        Index("ix_node_tenant_lifecycle_state", "tenant_id", "lifecycle_state"),
+        Index("ix_node_tenant_security_level", "tenant_id", "security_level"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False)
@@ -0,0 +1,248 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+from . import models, schemas, async_services, deps
+from .pagination import use_offset, set_next_cursor
+
+# Resource endpoints served from the async engine (RESOURCE_DB_MODE=async).
+# Enumeration endpoints need no database and stay in app.routes.
+router = APIRouter()
+
+# Resource CRUD endpoints
+@router.post("/resources", response_model=schemas.Resource, status_code=status.HTTP_201_CREATED)
+async def create_resource(
+    resource_in: schemas.ResourceCreate,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    user_id: UUID = Depends(deps.get_current_user),
+    role: str = Depends(deps.rbac_check("resource:create"))
+):
+    """Create a new resource"""
+    return await async_services.create_resource(db, resource_in, tenant_id, user_id)
+
+@router.get("/resources", response_model=List[schemas.Resource])
+async def list_resources(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    resource_type: Optional[str] = None,
+    deployment_status: Optional[str] = None,
+    criticality: Optional[str] = None,
+    strategic_importance: Optional[str] = None,
+    associated_capability_id: Optional[UUID] = None,
+    availability_threshold: Optional[float] = None,
+    utilization_threshold: Optional[float] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource:read"))
+):
+    """List resources with filtering, newest first; the X-Next-Cursor header holds the next page's cursor"""
+    if use_offset(skip, cursor):
+        return await async_services.get_resources(
+            db, tenant_id, skip, limit, resource_type, deployment_status,
+            criticality, strategic_importance, associated_capability_id,
+            availability_threshold, utilization_threshold
+        )
+    resources, next_cursor = await async_services.get_resources_page(
+        db, tenant_id, cursor, limit, resource_type, deployment_status,
+        criticality, strategic_importance, associated_capability_id,
+        availability_threshold, utilization_threshold
+    )
+    set_next_cursor(response, next_cursor)
+    return resources
+
+@router.get("/resources/{resource_id}", response_model=schemas.Resource)
+async def get_resource(
+    resource_id: UUID,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource:read"))
+):
+    """Get resource by ID"""
+    return await async_services.get_resource(db, resource_id, tenant_id)
+
+@router.put("/resources/{resource_id}", response_model=schemas.Resource)
+async def update_resource(
+    resource_id: UUID,
+    resource_in: schemas.ResourceUpdate,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource:update"))
+):
+    """Update resource"""
+    resource = await async_services.get_resource(db, resource_id, tenant_id)
+    return await async_services.update_resource(db, resource, resource_in)
+
+@router.delete("/resources/{resource_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_resource(
+    resource_id: UUID,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource:delete"))
+):
+    """Delete resource"""
+    resource = await async_services.get_resource(db, resource_id, tenant_id)
+    await async_services.delete_resource(db, resource)
+
+# Resource Link endpoints
+@router.post("/resources/{resource_id}/links", response_model=schemas.ResourceLink, status_code=status.HTTP_201_CREATED)
+async def create_resource_link(
+    resource_id: UUID,
+    link_in: schemas.ResourceLinkCreate,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    user_id: UUID = Depends(deps.get_current_user),
+    role: str = Depends(deps.rbac_check("resource_link:create"))
+):
+    """Create a resource link"""
+    # Verify resource exists and belongs to tenant
+    await async_services.get_resource(db, resource_id, tenant_id)
+    return await async_services.create_resource_link(db, link_in, resource_id, user_id)
+
+@router.get("/resources/{resource_id}/links", response_model=List[schemas.ResourceLink])
+async def list_resource_links(
+    resource_id: UUID,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource_link:read"))
+):
+    """List resource links"""
+    # Verify resource exists and belongs to tenant
+    await async_services.get_resource(db, resource_id, tenant_id)
+    return await async_services.get_resource_links(db, resource_id, tenant_id)
+
+@router.get("/resources/links/{link_id}", response_model=schemas.ResourceLink)
+async def get_resource_link(
+    link_id: UUID,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource_link:read"))
+):
+    """Get resource link by ID"""
+    return await async_services.get_resource_link(db, link_id, tenant_id)
+
+@router.put("/resources/links/{link_id}", response_model=schemas.ResourceLink)
+async def update_resource_link(
+    link_id: UUID,
+    link_in: schemas.ResourceLinkUpdate,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource_link:update"))
+):
+    """Update resource link"""
+    link = await async_services.get_resource_link(db, link_id, tenant_id)
+    return await async_services.update_resource_link(db, link, link_in)
+
+@router.delete("/resources/links/{link_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_resource_link(
+    link_id: UUID,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource_link:delete"))
+):
+    """Delete resource link"""
+    link = await async_services.get_resource_link(db, link_id, tenant_id)
+    await async_services.delete_resource_link(db, link)
+
+# Analysis and impact endpoints
+@router.get("/resources/{resource_id}/impact-score", response_model=schemas.ImpactScore)
+async def get_impact_score(
+    resource_id: UUID,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("impact:read"))
+):
+    """Get impact score for resource"""
+    return await async_services.get_impact_score(db, resource_id, tenant_id)
+
+@router.get("/resources/{resource_id}/allocation-map", response_model=schemas.AllocationMap)
+async def get_allocation_map(
+    resource_id: UUID,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("allocation:read"))
+):
+    """Get allocation map for resource"""
+    return await async_services.get_allocation_map(db, resource_id, tenant_id)
+
+@router.get("/resources/{resource_id}/analysis", response_model=schemas.ResourceAnalysis)
+async def analyze_resource(
+    resource_id: UUID,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("analysis:read"))
+):
+    """Analyze resource for operational insights"""
+    return await async_services.analyze_resource(db, resource_id, tenant_id)
+
+# Domain-specific query endpoints
+@router.get("/resources/by-type/{resource_type}", response_model=List[schemas.Resource])
+async def get_resources_by_type(
+    resource_type: str,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource:read"))
+):
+    """Get resources by type"""
+    return await async_services.get_resources_by_type(db, tenant_id, resource_type)
+
+@router.get("/resources/by-status/{deployment_status}", response_model=List[schemas.Resource])
+async def get_resources_by_status(
+    deployment_status: str,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource:read"))
+):
+    """Get resources by status"""
+    return await async_services.get_resources_by_status(db, tenant_id, deployment_status)
+
+@router.get("/resources/by-capability/{capability_id}", response_model=List[schemas.Resource])
+async def get_resources_by_capability(
+    capability_id: UUID,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource:read"))
+):
+    """Get resources by capability"""
+    return await async_services.get_resources_by_capability(db, tenant_id, capability_id)
+
+@router.get("/resources/by-performance/{performance_threshold}", response_model=List[schemas.Resource])
+async def get_resources_by_performance(
+    performance_threshold: float,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource:read"))
+):
+    """Get resources by performance threshold"""
+    return await async_services.get_resources_by_performance(db, tenant_id, performance_threshold)
+
+@router.get("/resources/by-element/{element_type}/{element_id}", response_model=List[schemas.Resource])
+async def get_resources_by_element(
+    element_type: str,
+    element_id: UUID,
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource:read"))
+):
+    """Get resources by linked element"""
+    return await async_services.get_resources_by_element(db, tenant_id, element_type, element_id)
+
+@router.get("/resources/active", response_model=List[schemas.Resource])
+async def get_active_resources(
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource:read"))
+):
+    """Get active resources"""
+    return await async_services.get_active_resources(db, tenant_id)
+
+@router.get("/resources/critical", response_model=List[schemas.Resource])
+async def get_critical_resources(
+    db: AsyncSession = Depends(deps.get_async_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    role: str = Depends(deps.rbac_check("resource:read"))
+):
+    """Get critical resources"""
+    return await async_services.get_critical_resources(db, tenant_id)
@@ -0,0 +1,323 @@
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Dict, Any, Tuple
+from uuid import UUID
+from . import models, schemas
+from .pagination import keyset_page, split_page
+from .services import resource_filters, build_impact_score, build_allocation_map, build_resource_analysis
+from fastapi import HTTPException, status
+from redis import asyncio as aioredis
+import json
+import os
+from datetime import datetime
+
+# Async counterparts of app.services for routes served from the async engine.
+# Scoring and analysis helpers are shared; only database and Redis I/O differ.
+
+# Redis connection for event emission
+redis_client = aioredis.Redis(
+    host=os.getenv("REDIS_HOST", "localhost"),
+    port=int(os.getenv("REDIS_PORT", 6379)),
+    db=int(os.getenv("REDIS_DB", 0)),
+    decode_responses=True
+)
+
+async def emit_event(event_type: str, data: Dict[str, Any]):
+    """Emit event to Redis for event-driven architecture"""
+    try:
+        event = {
+            "event_type": event_type,
+            "timestamp": datetime.utcnow().isoformat(),
+            "data": data
+        }
+        await redis_client.publish("resource_events", json.dumps(event))
+    except Exception as e:
+        # Log error but don't fail the operation
+        print(f"Failed to emit event: {e}")
+
+# Resource CRUD operations
+async def create_resource(
+    db: AsyncSession,
+    resource_in: schemas.ResourceCreate,
+    tenant_id: UUID,
+    user_id: UUID
+) -> models.Resource:
+    """Create a new resource"""
+    db_resource = models.Resource(
+        **resource_in.dict(),
+        tenant_id=tenant_id,
+        user_id=user_id,
+        available_quantity=resource_in.quantity
+    )
+    db.add(db_resource)
+    await db.commit()
+    await db.refresh(db_resource)
+    
+    # Emit event
+    await emit_event("resource.created", {
+        "resource_id": str(db_resource.id),
+        "tenant_id": str(tenant_id),
+        "user_id": str(user_id)
+    })
+    
+    return db_resource
+
+async def get_resource(db: AsyncSession, resource_id: UUID, tenant_id: UUID) -> models.Resource:
+    """Get resource by ID"""
+    result = await db.execute(
+        select(models.Resource).where(
+            and_(
+                models.Resource.id == resource_id,
+                models.Resource.tenant_id == tenant_id
+            )
+        )
+    )
+    resource = result.scalars().first()
+    
+    if not resource:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resource not found"
+        )
+    
+    return resource
+
+async def get_resources(
+    db: AsyncSession,
+    tenant_id: UUID,
+    skip: int = 0,
+    limit: int = 100,
+    resource_type: Optional[str] = None,
+    deployment_status: Optional[str] = None,
+    criticality: Optional[str] = None,
+    strategic_importance: Optional[str] = None,
+    associated_capability_id: Optional[UUID] = None,
+    availability_threshold: Optional[float] = None,
+    utilization_threshold: Optional[float] = None
+) -> List[models.Resource]:
+    """Get resources with filtering"""
+    query = select(models.Resource).where(
+        *resource_filters(
+            tenant_id, resource_type, deployment_status, criticality, strategic_importance,
+            associated_capability_id, availability_threshold, utilization_threshold
+        )
+    )
+    
+    result = await db.execute(
+        query.order_by(models.Resource.created_at.desc(), models.Resource.id.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+async def get_resources_page(
+    db: AsyncSession,
+    tenant_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    resource_type: Optional[str] = None,
+    deployment_status: Optional[str] = None,
+    criticality: Optional[str] = None,
+    strategic_importance: Optional[str] = None,
+    associated_capability_id: Optional[UUID] = None,
+    availability_threshold: Optional[float] = None,
+    utilization_threshold: Optional[float] = None
+) -> Tuple[List[models.Resource], Optional[str]]:
+    """Get one keyset page of resources with filtering, and the cursor for the next page"""
+    query = select(models.Resource).where(
+        *resource_filters(
+            tenant_id, resource_type, deployment_status, criticality, strategic_importance,
+            associated_capability_id, availability_threshold, utilization_threshold
+        )
+    )
+    
+    result = await db.execute(keyset_page(query, models.Resource, cursor, limit))
+    return split_page(result.scalars().all(), limit)
+
+async def update_resource(
+    db: AsyncSession,
+    resource: models.Resource,
+    resource_in: schemas.ResourceUpdate
+) -> models.Resource:
+    """Update resource"""
+    update_data = resource_in.dict(exclude_unset=True)
+    
+    for field, value in update_data.items():
+        setattr(resource, field, value)
+    
+    # Update available quantity if quantity changed
+    if 'quantity' in update_data:
+        resource.available_quantity = resource.quantity - resource.allocated_quantity
+    
+    resource.updated_at = datetime.utcnow()
+    await db.commit()
+    await db.refresh(resource)
+    
+    # Emit event
+    await emit_event("resource.updated", {
+        "resource_id": str(resource.id),
+        "tenant_id": str(resource.tenant_id)
+    })
+    
+    return resource
+
+async def delete_resource(db: AsyncSession, resource: models.Resource):
+    """Delete resource"""
+    # Emit event before deletion
+    await emit_event("resource.deleted", {
+        "resource_id": str(resource.id),
+        "tenant_id": str(resource.tenant_id)
+    })
+    
+    await db.delete(resource)
+    await db.commit()
+
+# Resource Link operations
+async def create_resource_link(
+    db: AsyncSession,
+    link_in: schemas.ResourceLinkCreate,
+    resource_id: UUID,
+    user_id: UUID
+) -> models.ResourceLink:
+    """Create a resource link"""
+    db_link = models.ResourceLink(
+        **link_in.dict(),
+        resource_id=resource_id,
+        created_by=user_id
+    )
+    db.add(db_link)
+    await db.commit()
+    await db.refresh(db_link)
+    
+    # Emit event
+    await emit_event("resource_link.created", {
+        "link_id": str(db_link.id),
+        "resource_id": str(resource_id),
+        "user_id": str(user_id)
+    })
+    
+    return db_link
+
+async def get_resource_link(db: AsyncSession, link_id: UUID, tenant_id: UUID) -> models.ResourceLink:
+    """Get resource link by ID"""
+    result = await db.execute(
+        select(models.ResourceLink).join(models.Resource).where(
+            and_(
+                models.ResourceLink.id == link_id,
+                models.Resource.tenant_id == tenant_id
+            )
+        )
+    )
+    link = result.scalars().first()
+    
+    if not link:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resource link not found"
+        )
+    
+    return link
+
+async def get_resource_links(db: AsyncSession, resource_id: UUID, tenant_id: UUID) -> List[models.ResourceLink]:
+    """Get all links for a resource"""
+    result = await db.execute(
+        select(models.ResourceLink).join(models.Resource).where(
+            and_(
+                models.ResourceLink.resource_id == resource_id,
+                models.Resource.tenant_id == tenant_id
+            )
+        )
+    )
+    return result.scalars().all()
+
+async def update_resource_link(
+    db: AsyncSession,
+    link: models.ResourceLink,
+    link_in: schemas.ResourceLinkUpdate
+) -> models.ResourceLink:
+    """Update resource link"""
+    update_data = link_in.dict(exclude_unset=True)
+    
+    for field, value in update_data.items():
+        setattr(link, field, value)
+    
+    await db.commit()
+    await db.refresh(link)
+    
+    # Emit event
+    await emit_event("resource_link.updated", {
+        "link_id": str(link.id),
+        "resource_id": str(link.resource_id)
+    })
+    
+    return link
+
+async def delete_resource_link(db: AsyncSession, link: models.ResourceLink):
+    """Delete resource link"""
+    # Emit event before deletion
+    await emit_event("resource_link.deleted", {
+        "link_id": str(link.id),
+        "resource_id": str(link.resource_id)
+    })
+    
+    await db.delete(link)
+    await db.commit()
+
+# Analysis and impact operations
+async def get_impact_score(db: AsyncSession, resource_id: UUID, tenant_id: UUID) -> schemas.ImpactScore:
+    """Get impact score for resource"""
+    resource = await get_resource(db, resource_id, tenant_id)
+    return build_impact_score(resource)
+
+async def get_allocation_map(db: AsyncSession, resource_id: UUID, tenant_id: UUID) -> schemas.AllocationMap:
+    """Get allocation map for resource"""
+    resource = await get_resource(db, resource_id, tenant_id)
+    links = await get_resource_links(db, resource_id, tenant_id)
+    return build_allocation_map(resource, links)
+
+async def analyze_resource(db: AsyncSession, resource_id: UUID, tenant_id: UUID) -> schemas.ResourceAnalysis:
+    """Analyze resource for operational insights"""
+    resource = await get_resource(db, resource_id, tenant_id)
+    return build_resource_analysis(resource)
+
+# Domain-specific query operations
+async def get_resources_by_type(db: AsyncSession, tenant_id: UUID, resource_type: str) -> List[models.Resource]:
+    """Get resources by type"""
+    return await get_resources(db, tenant_id, resource_type=resource_type)
+
+async def get_resources_by_status(db: AsyncSession, tenant_id: UUID, deployment_status: str) -> List[models.Resource]:
+    """Get resources by status"""
+    return await get_resources(db, tenant_id, deployment_status=deployment_status)
+
+async def get_resources_by_capability(db: AsyncSession, tenant_id: UUID, capability_id: UUID) -> List[models.Resource]:
+    """Get resources by capability"""
+    return await get_resources(db, tenant_id, associated_capability_id=capability_id)
+
+async def get_resources_by_performance(db: AsyncSession, tenant_id: UUID, performance_threshold: float) -> List[models.Resource]:
+    """Get resources by performance threshold"""
+    return await get_resources(db, tenant_id, utilization_threshold=performance_threshold)
+
+async def get_resources_by_element(db: AsyncSession, tenant_id: UUID, element_type: str, element_id: UUID) -> List[models.Resource]:
+    """Get resources by linked element"""
+    # One round trip, with the matching links as a subquery
+    linked_resource_ids = select(models.ResourceLink.resource_id).where(
+        and_(
+            models.ResourceLink.linked_element_type == element_type,
+            models.ResourceLink.linked_element_id == element_id
+        )
+    )
+    result = await db.execute(
+        select(models.Resource).where(
+            and_(
+                models.Resource.id.in_(linked_resource_ids),
+                models.Resource.tenant_id == tenant_id
+            )
+        )
+    )
+    return result.scalars().all()
+
+async def get_active_resources(db: AsyncSession, tenant_id: UUID) -> List[models.Resource]:
+    """Get active resources"""
+    return await get_resources(db, tenant_id, deployment_status="active")
+
+async def get_critical_resources(db: AsyncSession, tenant_id: UUID) -> List[models.Resource]:
+    """Get critical resources"""
+    return await get_resources(db, tenant_id, criticality="critical")
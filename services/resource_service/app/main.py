@@ -14,11 +14,14 @@ from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
 from dotenv import load_dotenv
 
-from . import routes
-from .database import engine, Base
+from . import routes, async_routes
+from .database import engine, dispose_async_engine, Base
 
 load_dotenv()
 
+# "sync" serves resource routes from threadpool sessions, "async" from the asyncpg engine
+RESOURCE_DB_MODE = os.getenv("RESOURCE_DB_MODE", "sync").lower()
+
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
@@ -68,6 +71,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.add_middleware(
@@ -122,7 +126,9 @@ async def metrics():
     """Prometheus metrics endpoint"""
     return generate_latest()
 
-# Include routers
+# Include routers; async routes are registered first so they take over the database endpoints
+if RESOURCE_DB_MODE == "async":
+    app.include_router(async_routes.router, prefix="/api/v1", tags=["resources"])
 app.include_router(routes.router, prefix="/api/v1", tags=["resources"])
 
 # Root endpoint
@@ -142,7 +148,7 @@ async def root():
 @app.on_event("startup")
 async def startup_event():
     """Startup event handler"""
-    logger.info("Resource Service starting up...")
+    logger.info(f"Resource Service starting up ({RESOURCE_DB_MODE} database mode)...")
     
     # Initialize OpenTelemetry instrumentation
     if os.getenv("OTEL_ENABLED", "false").lower() == "true":
@@ -158,6 +164,7 @@ async def startup_event():
 async def shutdown_event():
     """Shutdown event handler"""
     logger.info("Resource Service shutting down...")
+    await dispose_async_engine()
 
 if __name__ == "__main__":
     import uvicorn
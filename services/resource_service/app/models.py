@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, JSON
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Boolean, Integer, Float, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -9,6 +9,15 @@ Base = declarative_base()
 
 class Resource(Base):
     __tablename__ = "resource"
+    __table_args__ = (
+        # Tenant-scoped filters used by the list and get_*_by_* queries
+        Index("ix_resource_tenant_created_at_id", "tenant_id", "created_at", "id"),
+        Index("ix_resource_tenant_resource_type", "tenant_id", "resource_type"),
+        Index("ix_resource_tenant_deployment_status", "tenant_id", "deployment_status"),
+        Index("ix_resource_tenant_criticality", "tenant_id", "criticality"),
+        Index("ix_resource_tenant_associated_capability_id", "tenant_id", "associated_capability_id"),
+        Index("ix_resource_tenant_utilization_rate", "tenant_id", "utilization_rate"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False)
@@ -87,6 +96,10 @@ class Resource(Base):
 
 class ResourceLink(Base):
     __tablename__ = "resource_link"
+    __table_args__ = (
+        # Link lookups by element, used by get_*_by_element
+        Index("ix_resource_link_linked_element", "linked_element_type", "linked_element_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     resource_id = Column(UUID(as_uuid=True), ForeignKey("resource.id"), nullable=False)
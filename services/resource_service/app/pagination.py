@@ -0,0 +1,66 @@
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+from datetime import datetime
+import base64
+import json
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Opaque cursor pointing just past a row in (created_at, id) order"""
+    raw = json.dumps([created_at.isoformat(), str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor from encode_cursor; raises 400 for anything else"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        if not isinstance(created_at, str) or not isinstance(row_id, str):
+            raise ValueError("cursor fields must be strings")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def keyset_page(query: Any, model: Any, cursor: Optional[str], limit: int) -> Any:
+    """
+    Restrict a tenant-filtered query to one page, newest first.
+
+    Rows are ordered by (created_at, id) descending and the page starts after
+    the cursor's row with a row-value comparison, so earlier pages are never
+    read and discarded as they are with OFFSET. One extra row is fetched to
+    tell whether another page follows. Works for both ORM queries and select()
+    statements.
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    return query.limit(limit + 1)
+
+def split_page(rows: List[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Split rows fetched by keyset_page into the page and the next cursor"""
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(last.created_at, last.id)
+
+def use_offset(skip: int, cursor: Optional[str]) -> bool:
+    """Whether a list request asked for legacy offset paging; skip and cursor cannot be combined"""
+    if skip and cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either skip or cursor, not both"
+        )
+    return skip > 0
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    """Expose the next page's cursor; no header means this was the last page"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 from . import models, schemas, services, deps
+from .pagination import use_offset, set_next_cursor
 
 router = APIRouter()
 
@@ -20,8 +21,10 @@ def create_resource(
 
 @router.get("/resources", response_model=List[schemas.Resource])
 def list_resources(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     resource_type: Optional[str] = None,
     deployment_status: Optional[str] = None,
     criticality: Optional[str] = None,
@@ -33,12 +36,20 @@ def list_resources(
     tenant_id: UUID = Depends(deps.get_current_tenant),
     role: str = Depends(deps.rbac_check("resource:read"))
 ):
-    """List resources with filtering"""
-    return services.get_resources(
-        db, tenant_id, skip, limit, resource_type, deployment_status,
+    """List resources with filtering, newest first; the X-Next-Cursor header holds the next page's cursor"""
+    if use_offset(skip, cursor):
+        return services.get_resources(
+            db, tenant_id, skip, limit, resource_type, deployment_status,
+            criticality, strategic_importance, associated_capability_id,
+            availability_threshold, utilization_threshold
+        )
+    resources, next_cursor = services.get_resources_page(
+        db, tenant_id, cursor, limit, resource_type, deployment_status,
         criticality, strategic_importance, associated_capability_id,
         availability_threshold, utilization_threshold
     )
+    set_next_cursor(response, next_cursor)
+    return resources
 
 @router.get("/resources/{resource_id}", response_model=schemas.Resource)
 def get_resource(
@@ -1,8 +1,9 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from . import models, schemas
+from .pagination import keyset_page, split_page
 from fastapi import HTTPException, status
 import json
 import redis
@@ -89,25 +90,66 @@ def get_resources(
 ) -> List[models.Resource]:
     """Get resources with filtering"""
     query = db.query(models.Resource).filter(
-        models.Resource.tenant_id == tenant_id
+        *resource_filters(
+            tenant_id, resource_type, deployment_status, criticality, strategic_importance,
+            associated_capability_id, availability_threshold, utilization_threshold
+        )
     )
     
+    return query.order_by(models.Resource.created_at.desc(), models.Resource.id.desc()).offset(skip).limit(limit).all()
+
+def get_resources_page(
+    db: Session,
+    tenant_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    resource_type: Optional[str] = None,
+    deployment_status: Optional[str] = None,
+    criticality: Optional[str] = None,
+    strategic_importance: Optional[str] = None,
+    associated_capability_id: Optional[UUID] = None,
+    availability_threshold: Optional[float] = None,
+    utilization_threshold: Optional[float] = None
+) -> Tuple[List[models.Resource], Optional[str]]:
+    """Get one keyset page of resources with filtering, and the cursor for the next page"""
+    query = db.query(models.Resource).filter(
+        *resource_filters(
+            tenant_id, resource_type, deployment_status, criticality, strategic_importance,
+            associated_capability_id, availability_threshold, utilization_threshold
+        )
+    )
+    
+    return split_page(keyset_page(query, models.Resource, cursor, limit).all(), limit)
+
+def resource_filters(
+    tenant_id: UUID,
+    resource_type: Optional[str] = None,
+    deployment_status: Optional[str] = None,
+    criticality: Optional[str] = None,
+    strategic_importance: Optional[str] = None,
+    associated_capability_id: Optional[UUID] = None,
+    availability_threshold: Optional[float] = None,
+    utilization_threshold: Optional[float] = None
+) -> List[Any]:
+    """Filter conditions for resource list queries, shared by the sync and async paths"""
+    conditions = [models.Resource.tenant_id == tenant_id]
+    
     if resource_type:
-        query = query.filter(models.Resource.resource_type == resource_type)
+        conditions.append(models.Resource.resource_type == resource_type)
     if deployment_status:
-        query = query.filter(models.Resource.deployment_status == deployment_status)
+        conditions.append(models.Resource.deployment_status == deployment_status)
     if criticality:
-        query = query.filter(models.Resource.criticality == criticality)
+        conditions.append(models.Resource.criticality == criticality)
     if strategic_importance:
-        query = query.filter(models.Resource.strategic_importance == strategic_importance)
+        conditions.append(models.Resource.strategic_importance == strategic_importance)
     if associated_capability_id:
-        query = query.filter(models.Resource.associated_capability_id == associated_capability_id)
+        conditions.append(models.Resource.associated_capability_id == associated_capability_id)
     if availability_threshold:
-        query = query.filter(models.Resource.availability >= availability_threshold)
+        conditions.append(models.Resource.availability >= availability_threshold)
     if utilization_threshold:
-        query = query.filter(models.Resource.utilization_rate >= utilization_threshold)
+        conditions.append(models.Resource.utilization_rate >= utilization_threshold)
     
-    return query.offset(skip).limit(limit).all()
+    return conditions
 
 def update_resource(
     db: Session, 
@@ -236,7 +278,10 @@ def delete_resource_link(db: Session, link: models.ResourceLink):
 def get_impact_score(db: Session, resource_id: UUID, tenant_id: UUID) -> schemas.ImpactScore:
     """Get impact score for resource"""
     resource = get_resource(db, resource_id, tenant_id)
-    
+    return build_impact_score(resource)
+
+def build_impact_score(resource: models.Resource) -> schemas.ImpactScore:
+    """Score a loaded resource's impact"""
     # Calculate impact scores
     strategic_impact_score = calculate_strategic_impact(resource)
     operational_impact_score = calculate_operational_impact(resource)
@@ -258,7 +303,7 @@ def get_impact_score(db: Session, resource_id: UUID, tenant_id: UUID) -> schemas
     recommendations = generate_impact_recommendations(resource, strategic_impact_score, operational_impact_score, financial_impact_score, risk_impact_score)
     
     return schemas.ImpactScore(
-        resource_id=resource_id,
+        resource_id=resource.id,
         strategic_impact_score=strategic_impact_score,
         operational_impact_score=operational_impact_score,
         financial_impact_score=financial_impact_score,
@@ -271,9 +316,12 @@ def get_impact_score(db: Session, resource_id: UUID, tenant_id: UUID) -> schemas
 def get_allocation_map(db: Session, resource_id: UUID, tenant_id: UUID) -> schemas.AllocationMap:
     """Get allocation map for resource"""
     resource = get_resource(db, resource_id, tenant_id)
-    
-    # Get allocation breakdown
     links = get_resource_links(db, resource_id, tenant_id)
+    return build_allocation_map(resource, links)
+
+def build_allocation_map(resource: models.Resource, links: List[models.ResourceLink]) -> schemas.AllocationMap:
+    """Build the allocation map for a loaded resource and its links"""
+    # Get allocation breakdown
     allocation_breakdown = []
     total_allocated = 0.0
     
@@ -302,7 +350,7 @@ def get_allocation_map(db: Session, resource_id: UUID, tenant_id: UUID) -> schem
     allocation_metrics = calculate_allocation_metrics(resource, links)
     
     return schemas.AllocationMap(
-        resource_id=resource_id,
+        resource_id=resource.id,
         total_allocated=total_allocated,
         allocation_breakdown=allocation_breakdown,
         utilization_analysis=utilization_analysis,
@@ -314,7 +362,10 @@ def get_allocation_map(db: Session, resource_id: UUID, tenant_id: UUID) -> schem
 def analyze_resource(db: Session, resource_id: UUID, tenant_id: UUID) -> schemas.ResourceAnalysis:
     """Analyze resource for operational insights"""
     resource = get_resource(db, resource_id, tenant_id)
-    
+    return build_resource_analysis(resource)
+
+def build_resource_analysis(resource: models.Resource) -> schemas.ResourceAnalysis:
+    """Analyze a loaded resource"""
     # Performance analysis
     performance_analysis = analyze_performance(resource)
     
@@ -334,7 +385,7 @@ def analyze_resource(db: Session, resource_id: UUID, tenant_id: UUID) -> schemas
     strategic_alignment = assess_strategic_alignment(resource)
     
     return schemas.ResourceAnalysis(
-        resource_id=resource_id,
+        resource_id=resource.id,
         performance_analysis=performance_analysis,
         cost_analysis=cost_analysis,
         utilization_analysis=utilization_analysis,
@@ -6,10 +6,13 @@ from sqlalchemy.pool import StaticPool
 from uuid import uuid4
 import jwt
 import os
+import base64
+import json
 from datetime import datetime, timedelta
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base
+from app.deps import get_db
 from app.models import Resource, ResourceLink
 from app.schemas import ResourceType, Criticality, StrategicImportance, BusinessValue
 
@@ -200,6 +203,45 @@ class TestResourceCRUD:
         data = response.json()
         assert all(r["resource_type"] == "human" for r in data)
 
+    def test_list_resources_cursor_pagination(self, sample_resource_data):
+        """Test following X-Next-Cursor through every page of resources"""
+        headers = get_auth_headers()
+        
+        created_ids = set()
+        for i in range(5):
+            resource_data = sample_resource_data.copy()
+            resource_data["name"] = f"Paged Resource {i}"
+            created_ids.add(client.post("/api/v1/resources", json=resource_data, headers=headers).json()["id"])
+        
+        seen_ids = []
+        response = client.get("/api/v1/resources?limit=2", headers=headers)
+        while True:
+            assert response.status_code == 200
+            assert len(response.json()) <= 2
+            seen_ids.extend(r["id"] for r in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            response = client.get(f"/api/v1/resources?limit=2&cursor={cursor}", headers=headers)
+        
+        assert len(seen_ids) == len(set(seen_ids))
+        assert created_ids <= set(seen_ids)
+
+    def test_list_resources_rejects_bad_cursor(self):
+        """Test that malformed cursors and skip with cursor are rejected"""
+        headers = get_auth_headers()
+        
+        response = client.get("/api/v1/resources?cursor=not-a-cursor", headers=headers)
+        assert response.status_code == 400
+        
+        response = client.get("/api/v1/resources?skip=10&cursor=not-a-cursor", headers=headers)
+        assert response.status_code == 400
+        
+        # Well-formed JSON with the wrong field types
+        cursor = base64.urlsafe_b64encode(json.dumps(["2024-01-01T00:00:00", 5]).encode()).decode()
+        response = client.get(f"/api/v1/resources?cursor={cursor}", headers=headers)
+        assert response.status_code == 400
+
     def test_update_resource(self, sample_resource_data):
         """Test updating a resource"""
         headers = get_auth_headers()
@@ -599,6 +641,51 @@ class TestAuthentication:
         response = client.post("/api/v1/resources", json=sample_resource_data, headers=headers)
         assert response.status_code == 401
 
+    def test_token_claims_decoded_once(self, monkeypatch):
+        """Test that get_token_claims verifies a token once and keeps its claims on request.state"""
+        from starlette.requests import Request
+        from app import deps
+
+        decoded = []
+        real_decode = jwt.decode
+        def counting_decode(*args, **kwargs):
+            decoded.append(args[0])
+            return real_decode(*args, **kwargs)
+        monkeypatch.setattr(deps.jwt, "decode", counting_decode)
+        deps._claims_cache.clear()
+
+        payload = {"user_id": "user-1", "tenant_id": "tenant-1", "role": "Viewer", "exp": int(deps.time.time()) + 60}
+        token = jwt.encode(payload, deps.SECRET_KEY, algorithm="HS256")
+        def bearer_request():
+            return Request({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+        request = bearer_request()
+        claims = deps.get_token_claims(request)
+        assert claims["user_id"] == "user-1"
+        assert request.state.token_claims is claims
+        assert deps.get_token_claims(request) is claims
+        # A later request with the same token is served from the claims cache
+        assert deps.get_token_claims(bearer_request()) == claims
+        assert decoded == [token]
+
+    def test_expired_token_rejected_from_claims_cache(self, monkeypatch):
+        """Test that cached claims are keyed by token digest and refused once the token expires"""
+        from fastapi import HTTPException
+        from app import deps
+
+        deps._claims_cache.clear()
+        payload = {"user_id": "user-1", "tenant_id": "tenant-1", "role": "Viewer", "exp": int(deps.time.time()) + 60}
+        token = jwt.encode(payload, deps.SECRET_KEY, algorithm="HS256")
+        claims = deps.decode_token(token)
+        assert list(deps._claims_cache) == [deps.token_digest(token)]
+
+        # Served from the cache, so only the cached exp check can reject it
+        monkeypatch.setattr(deps.time, "time", lambda: claims["exp"] + 1)
+        with pytest.raises(HTTPException) as exc_info:
+            deps.decode_token(token)
+        assert exc_info.value.status_code == 401
+        assert not deps._claims_cache
+
 class TestValidation:
     """Test input validation"""
 
@@ -659,4 +746,155 @@ class TestHealthAndMetrics:
         assert response.status_code == 200
         data = response.json()
         assert data["service"] == "Resource Service"
-        assert data["version"] == "1.0.0" 
\ No newline at end of file
+        assert data["version"] == "1.0.0" 
+
+class TestAsyncDatabasePath:
+    """Test the async routes (RESOURCE_DB_MODE=async) against a database"""
+
+    # Tables owned by other services that resource rows reference
+    REFERENCED_TABLES = ("tenant", "user", "capability", "business_function", "application_component", "node")
+
+    def _run(self, scenario, monkeypatch):
+        """Run scenario(client) against the async routes, backed by an in-memory aiosqlite database"""
+        import asyncio
+        import httpx
+        from fastapi import FastAPI
+        from sqlalchemy import Column, Table, Uuid
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+        from app import async_routes, deps
+
+        monkeypatch.setattr(deps, "SECRET_KEY", TEST_SECRET_KEY)
+        deps._claims_cache.clear()
+
+        metadata = Resource.metadata
+        for name in self.REFERENCED_TABLES:
+            if name not in metadata.tables:
+                Table(name, metadata, Column("id", Uuid, primary_key=True))
+
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+            async with engine.begin() as conn:
+                await conn.run_sync(metadata.create_all)
+            sessions = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+            async def override_get_async_db():
+                async with sessions() as db:
+                    yield db
+
+            async_app = FastAPI()
+            async_app.include_router(async_routes.router, prefix="/api/v1")
+            async_app.dependency_overrides[deps.get_async_db] = override_get_async_db
+            try:
+                transport = httpx.ASGITransport(app=async_app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://resource") as async_client:
+                    await scenario(async_client)
+            finally:
+                await engine.dispose()
+
+        asyncio.run(run())
+
+    def test_async_crud(self, sample_resource_data, monkeypatch):
+        """Test create, get, update and delete through the async routes"""
+        headers = get_auth_headers()
+
+        async def scenario(async_client):
+            response = await async_client.post("/api/v1/resources", json=sample_resource_data, headers=headers)
+            assert response.status_code == 201
+            created = response.json()
+            assert created["tenant_id"] == TEST_TENANT_ID
+            assert created["user_id"] == TEST_USER_ID
+            resource_url = f"/api/v1/resources/{created['id']}"
+
+            response = await async_client.get(resource_url, headers=headers)
+            assert response.status_code == 200
+            assert response.json()["name"] == sample_resource_data["name"]
+
+            response = await async_client.put(resource_url, json={"name": "Renamed", "quantity": 3.0}, headers=headers)
+            assert response.status_code == 200
+            assert response.json()["name"] == "Renamed"
+            assert response.json()["available_quantity"] == 3.0
+
+            response = await async_client.delete(resource_url, headers=headers)
+            assert response.status_code == 204
+            response = await async_client.get(resource_url, headers=headers)
+            assert response.status_code == 404
+
+        self._run(scenario, monkeypatch)
+
+    def test_async_list_filters_and_cursor(self, sample_resource_data, monkeypatch):
+        """Test filtered listing and keyset pages through the async routes"""
+        headers = get_auth_headers()
+
+        async def scenario(async_client):
+            for i, resource_type in enumerate(("human", "system", "system")):
+                resource_data = {**sample_resource_data, "name": f"Async Resource {i}", "resource_type": resource_type}
+                response = await async_client.post("/api/v1/resources", json=resource_data, headers=headers)
+                assert response.status_code == 201
+
+            response = await async_client.get("/api/v1/resources?resource_type=system", headers=headers)
+            assert response.status_code == 200
+            assert {item["name"] for item in response.json()} == {"Async Resource 1", "Async Resource 2"}
+
+            first = await async_client.get("/api/v1/resources?limit=2", headers=headers)
+            assert first.status_code == 200
+            cursor = first.headers["X-Next-Cursor"]
+            second = await async_client.get(f"/api/v1/resources?limit=2&cursor={cursor}", headers=headers)
+            assert second.status_code == 200
+            assert "X-Next-Cursor" not in second.headers
+            names = [item["name"] for item in first.json() + second.json()]
+            assert sorted(names) == ["Async Resource 0", "Async Resource 1", "Async Resource 2"]
+
+        self._run(scenario, monkeypatch)
+
+    def test_async_links_and_analysis(self, sample_resource_data, sample_resource_link_data, monkeypatch):
+        """Test links, impact score, allocation map and analysis through the async routes"""
+        headers = get_auth_headers()
+
+        async def scenario(async_client):
+            response = await async_client.post("/api/v1/resources", json=sample_resource_data, headers=headers)
+            resource_id = response.json()["id"]
+
+            response = await async_client.post(
+                f"/api/v1/resources/{resource_id}/links", json=sample_resource_link_data, headers=headers
+            )
+            assert response.status_code == 201
+
+            response = await async_client.get(f"/api/v1/resources/{resource_id}/impact-score", headers=headers)
+            assert response.status_code == 200
+            assert response.json()["resource_id"] == resource_id
+
+            response = await async_client.get(f"/api/v1/resources/{resource_id}/allocation-map", headers=headers)
+            assert response.status_code == 200
+            assert response.json()["total_allocated"] == sample_resource_link_data["allocation_percentage"]
+
+            response = await async_client.get(f"/api/v1/resources/{resource_id}/analysis", headers=headers)
+            assert response.status_code == 200
+            assert response.json()["resource_id"] == resource_id
+
+            element_url = f"/api/v1/resources/by-element/business_function/{sample_resource_link_data['linked_element_id']}"
+            response = await async_client.get(element_url, headers=headers)
+            assert response.status_code == 200
+            assert [item["id"] for item in response.json()] == [resource_id]
+
+        self._run(scenario, monkeypatch)
+
+    def test_async_routes_cover_database_endpoints(self):
+        """Test that every database-backed sync route has an async counterpart"""
+        from app import routes, async_routes
+
+        def route_keys(router):
+            return {(route.path, method) for route in router.routes for method in route.methods}
+
+        sync_routes = {
+            (route.path, method) for route in routes.router.routes for method in route.methods
+            if "db" in route.dependant.call.__code__.co_varnames
+        }
+        assert sync_routes == route_keys(async_routes.router)
+
+    def test_filters_are_shared(self):
+        """Test that both paths build resource list filters from the same helper"""
+        from app.services import resource_filters
+
+        conditions = resource_filters(uuid4(), resource_type="system", criticality="high")
+        assert len(conditions) == 3
+        assert len(resource_filters(uuid4())) == 1
@@ -0,0 +1,40 @@
+"""
+Tenant-scoped composite indexes for the list and get_*_by_* filters
+
+Revision ID: 20261016_01_tenant_filter_indexes
+Revises: 
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261016_01_tenant_filter_indexes'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index, table, columns), matching __table_args__ in app/models.py
+INDEXES = [
+    ("ix_work_packages_tenant_created_at_id", "work_packages", ["tenant_id", "created_at", "id"]),
+    ("ix_work_packages_tenant_package_type", "work_packages", ["tenant_id", "package_type"]),
+    ("ix_work_packages_tenant_current_status", "work_packages", ["tenant_id", "current_status"]),
+    ("ix_work_packages_tenant_delivery_risk", "work_packages", ["tenant_id", "delivery_risk"]),
+    ("ix_work_packages_tenant_related_goal_id", "work_packages", ["tenant_id", "related_goal_id"]),
+    ("ix_work_packages_tenant_target_plateau_id", "work_packages", ["tenant_id", "target_plateau_id"]),
+    ("ix_work_packages_tenant_change_owner_id", "work_packages", ["tenant_id", "change_owner_id"]),
+    ("ix_work_packages_tenant_progress_percent", "work_packages", ["tenant_id", "progress_percent"]),
+]
+
+def upgrade():
+    # Tables are created by the service at startup and may already hold data, so
+    # build concurrently without blocking writes; CONCURRENTLY cannot run in a
+    # transaction. Databases created after this revision already have the
+    # indexes from the models, hence IF NOT EXISTS.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Float, Integer, Text, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, String, DateTime, Float, Integer, Text, ForeignKey, Enum, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -61,6 +61,17 @@ class DependencyLevel(str, enum.Enum):
 class WorkPackage(Base):
     """ArchiMate 3.2 Work Package element - units of work that realize transformation efforts"""
     __tablename__ = "work_packages"
+    __table_args__ = (
+        # Tenant-scoped filters used by the list and get_*_by_* queries
+        Index("ix_work_packages_tenant_created_at_id", "tenant_id", "created_at", "id"),
+        Index("ix_work_packages_tenant_package_type", "tenant_id", "package_type"),
+        Index("ix_work_packages_tenant_current_status", "tenant_id", "current_status"),
+        Index("ix_work_packages_tenant_delivery_risk", "tenant_id", "delivery_risk"),
+        Index("ix_work_packages_tenant_related_goal_id", "tenant_id", "related_goal_id"),
+        Index("ix_work_packages_tenant_target_plateau_id", "tenant_id", "target_plateau_id"),
+        Index("ix_work_packages_tenant_change_owner_id", "tenant_id", "change_owner_id"),
+        Index("ix_work_packages_tenant_progress_percent", "tenant_id", "progress_percent"),
+    )
 
     # Primary key and tenant isolation
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
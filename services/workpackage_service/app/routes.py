@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import uuid
@@ -12,6 +12,7 @@ from .schemas import (
 )
 from .services import WorkPackageService, PackageLinkService
 from .deps import get_current_user, get_current_tenant, require_permission
+from .pagination import use_offset, set_next_cursor
 
 router = APIRouter(prefix="/work-packages", tags=["Work Packages"])
 
@@ -33,8 +34,10 @@ async def create_work_package(
 
 @router.get("/", response_model=List[WorkPackageList])
 async def list_work_packages(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
     package_type: Optional[PackageType] = Query(None, description="Filter by package type"),
     status: Optional[PackageStatus] = Query(None, description="Filter by status"),
     delivery_risk: Optional[DeliveryRisk] = Query(None, description="Filter by delivery risk"),
@@ -45,11 +48,17 @@ async def list_work_packages(
     db: Session = Depends(get_db),
     current_tenant: dict = Depends(get_current_tenant)
 ):
-    """List work packages with filtering and pagination"""
-    work_packages = WorkPackageService.list_work_packages(
-        db, current_tenant["id"], skip, limit, package_type, status, delivery_risk,
+    """List work packages with filtering and pagination, newest first"""
+    if use_offset(skip, cursor):
+        return WorkPackageService.list_work_packages(
+            db, current_tenant["id"], skip, limit, package_type, status, delivery_risk,
+            change_owner_id, related_goal_id, target_plateau_id, progress_threshold
+        )
+    work_packages, next_cursor = WorkPackageService.list_work_packages_page(
+        db, current_tenant["id"], cursor, limit, package_type, status, delivery_risk,
         change_owner_id, related_goal_id, target_plateau_id, progress_threshold
     )
+    set_next_cursor(response, next_cursor)
     return work_packages
 
 @router.get("/{work_package_id}", response_model=WorkPackageResponse)
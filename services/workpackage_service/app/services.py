@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func, desc, asc
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import uuid
 import json
 import redis
@@ -9,6 +9,7 @@ import logging
 from .models import WorkPackage, PackageLink, PackageType, PackageStatus, DeliveryRisk, LinkType
 from .schemas import WorkPackageCreate, WorkPackageUpdate, PackageLinkCreate, PackageLinkUpdate
 from .database import get_db
+from .pagination import keyset_page, split_page
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -58,11 +59,9 @@ class WorkPackageService:
         ).first()
     
     @staticmethod
-    def list_work_packages(
+    def filtered_work_packages(
         db: Session, 
         tenant_id: uuid.UUID,
-        skip: int = 0,
-        limit: int = 100,
         package_type: Optional[PackageType] = None,
         status: Optional[PackageStatus] = None,
         delivery_risk: Optional[DeliveryRisk] = None,
@@ -70,8 +69,8 @@ class WorkPackageService:
         related_goal_id: Optional[uuid.UUID] = None,
         target_plateau_id: Optional[uuid.UUID] = None,
         progress_threshold: Optional[float] = None
-    ) -> List[WorkPackage]:
-        """List work packages with filtering"""
+    ):
+        """Tenant work package query with the list filters applied"""
         query = db.query(WorkPackage).filter(WorkPackage.tenant_id == tenant_id)
         
         if package_type:
@@ -89,7 +88,51 @@ class WorkPackageService:
         if progress_threshold is not None:
             query = query.filter(WorkPackage.progress_percent >= progress_threshold)
         
-        return query.order_by(desc(WorkPackage.created_at)).offset(skip).limit(limit).all()
+        return query
+    
+    @staticmethod
+    def list_work_packages(
+        db: Session, 
+        tenant_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 100,
+        package_type: Optional[PackageType] = None,
+        status: Optional[PackageStatus] = None,
+        delivery_risk: Optional[DeliveryRisk] = None,
+        change_owner_id: Optional[uuid.UUID] = None,
+        related_goal_id: Optional[uuid.UUID] = None,
+        target_plateau_id: Optional[uuid.UUID] = None,
+        progress_threshold: Optional[float] = None
+    ) -> List[WorkPackage]:
+        """List work packages with filtering"""
+        query = WorkPackageService.filtered_work_packages(
+            db, tenant_id, package_type, status, delivery_risk,
+            change_owner_id, related_goal_id, target_plateau_id, progress_threshold
+        )
+        
+        return query.order_by(desc(WorkPackage.created_at), desc(WorkPackage.id)).offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def list_work_packages_page(
+        db: Session, 
+        tenant_id: uuid.UUID,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        package_type: Optional[PackageType] = None,
+        status: Optional[PackageStatus] = None,
+        delivery_risk: Optional[DeliveryRisk] = None,
+        change_owner_id: Optional[uuid.UUID] = None,
+        related_goal_id: Optional[uuid.UUID] = None,
+        target_plateau_id: Optional[uuid.UUID] = None,
+        progress_threshold: Optional[float] = None
+    ) -> Tuple[List[WorkPackage], Optional[str]]:
+        """List one keyset page of work packages with filtering, and the cursor for the next page"""
+        query = WorkPackageService.filtered_work_packages(
+            db, tenant_id, package_type, status, delivery_risk,
+            change_owner_id, related_goal_id, target_plateau_id, progress_threshold
+        )
+        
+        return split_page(keyset_page(query, WorkPackage, cursor, limit).all(), limit)
     
     @staticmethod
     def update_work_package(
@@ -0,0 +1,122 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from uuid import uuid4
+from datetime import datetime, timedelta
+import base64
+import json
+
+from app.database import Base
+from app.models import WorkPackage, PackageType, PackageStatus
+from app.pagination import decode_cursor, encode_cursor
+from app.services import WorkPackageService
+
+@compiles(UUID, "sqlite")
+def compile_uuid_sqlite(type_, compiler, **kw):
+    """SQLite has no UUID type; the models' UUID columns are stored as hex strings"""
+    return "CHAR(32)"
+
+# Test database setup
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine)
+
+# Test data
+TEST_TENANT_ID = uuid4()
+OTHER_TENANT_ID = uuid4()
+TEST_USER_ID = uuid4()
+
+def raw_cursor(value) -> str:
+    """Encode an arbitrary JSON value the way encode_cursor does"""
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+@pytest.fixture
+def db():
+    """Session over a fresh work_packages table"""
+    session = TestingSessionLocal()
+    session.query(WorkPackage).delete()
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+def add_work_packages(db, tenant_id, created_at_values):
+    """Insert one work package per created_at value and return their ids"""
+    ids = []
+    for i, created_at in enumerate(created_at_values):
+        work_package = WorkPackage(
+            id=uuid4(),
+            tenant_id=tenant_id,
+            user_id=TEST_USER_ID,
+            name=f"Paged Package {i}",
+            package_type=PackageType.PROJECT,
+            current_status=PackageStatus.PLANNED,
+            created_at=created_at
+        )
+        db.add(work_package)
+        ids.append(work_package.id)
+    db.commit()
+    return ids
+
+class TestWorkPackagePagination:
+    """Test keyset pagination of work package lists"""
+
+    def test_cursor_pages_cover_tenant_newest_first(self, db):
+        """Test following the next cursor through every page, including created_at ties"""
+        start = datetime(2024, 1, 1)
+        created_at_values = [start + timedelta(minutes=i // 2) for i in range(7)]
+        created_ids = add_work_packages(db, TEST_TENANT_ID, created_at_values)
+        add_work_packages(db, OTHER_TENANT_ID, [start])
+
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = WorkPackageService.list_work_packages_page(db, TEST_TENANT_ID, cursor, limit=3)
+            assert len(page) <= 3
+            seen.extend(page)
+            if not cursor:
+                break
+
+        assert sorted(work_package.id for work_package in seen) == sorted(created_ids)
+        keys = [(work_package.created_at, str(work_package.id)) for work_package in seen]
+        assert keys == sorted(keys, reverse=True)
+
+    def test_filters_apply_to_keyset_pages(self, db):
+        """Test that list filters narrow the keyset path like the offset path"""
+        add_work_packages(db, TEST_TENANT_ID, [datetime(2024, 1, 1), datetime(2024, 1, 2)])
+
+        page, cursor = WorkPackageService.list_work_packages_page(
+            db, TEST_TENANT_ID, None, limit=10, package_type=PackageType.EPIC
+        )
+        assert page == []
+        assert cursor is None
+
+    def test_cursor_round_trip(self):
+        """Test that decode_cursor reverses encode_cursor"""
+        created_at, row_id = datetime(2024, 1, 1, 12, 30), uuid4()
+        assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+    @pytest.mark.parametrize("cursor", [
+        "not-a-cursor",
+        raw_cursor(["2024-01-01T00:00:00", 5]),
+        raw_cursor([20240101, str(uuid4())]),
+        raw_cursor({"created_at": "2024-01-01T00:00:00"}),
+        raw_cursor(["2024-01-01T00:00:00", "not-a-uuid"]),
+    ])
+    def test_malformed_cursor_is_bad_request(self, cursor):
+        """Test that malformed cursors are a 400, never a server error"""
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor)
+        assert exc_info.value.status_code == 400